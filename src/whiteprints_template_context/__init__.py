@@ -4,10 +4,44 @@
 
 """Top-level module."""
 
-from typing import Final
+from __future__ import annotations
 
-from whiteprints_template_context.package_metadata import __version__
+from typing import TYPE_CHECKING, Final
 
 
-__all__: Final = ["__version__"]
+if TYPE_CHECKING:
+    from whiteprints_template_context.package_metadata import __version__
+    from whiteprints_template_context.preload import warmup
+
+
+__all__: Final = ["__version__", "warmup"]
 """Public module attributes."""
+
+
+def __getattr__(name: str) -> object:
+    """Read the package version, or import `warmup`, on first access.
+
+    Returns:
+        The requested module attribute.
+
+    Raises:
+        AttributeError: If the module has no such attribute.
+    """
+    if name == "__version__":
+        # pylint: disable-next=import-outside-toplevel
+        from whiteprints_template_context import (  # noqa: PLC0415
+            package_metadata,
+        )
+
+        return package_metadata.__version__
+
+    if name == "warmup":
+        # pylint: disable-next=import-outside-toplevel
+        from whiteprints_template_context.preload import (  # noqa: PLC0415
+            warmup,
+        )
+
+        return warmup
+
+    message = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(message)
@@ -0,0 +1,142 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints template context" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: MIT
+
+"""Update Copier contexts from an asyncio event loop.
+
+The license stages parse SPDX expressions and, on first use, build the
+licensing table; both can block for a long time. `AsyncContextUpdater` runs
+them in an executor, so that the event loop keeps serving other renders.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from functools import partial
+from itertools import starmap
+from typing import TYPE_CHECKING, Any, Final
+
+from whiteprints_template_context.context import (
+    DerivedContext,
+    derive_stage,
+    option_defaults,
+    read_stage_inputs,
+)
+from whiteprints_template_context.preload import warmup
+
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+    from whiteprints_template_context.context import Stage
+    from whiteprints_template_context.preload import Warmup
+
+
+__all__: Final = [
+    "OFFLOADED_STAGES",
+    "AsyncContextUpdater",
+]
+"""Public module attributes."""
+
+
+OFFLOADED_STAGES: Final = frozenset({"code_license", "resources_license"})
+"""Names of the stages run in the executor."""
+
+
+class AsyncContextUpdater:
+    """Modify Copier contexts with derived values, without blocking.
+
+    This is the asynchronous counterpart of `ContextUpdater.hook`, for
+    services rendering many templates concurrently. The license stages run
+    in an executor, and concurrent requests for the same license expression
+    share a single computation. An instance is bound to the event loop it is
+    first used in. As with `ContextUpdater`, the defaults of the optional
+    input values are resolved on instantiation.
+
+    Arguments:
+        executor: The executor running the license stages. Defaults to the
+            default executor of the event loop.
+    """
+
+    def __init__(self, executor: Executor | None = None) -> None:
+        """Instantiate an AsyncContextUpdater."""
+        self.executor = executor
+        self.defaults = option_defaults()
+        self._in_flight: dict[
+            tuple[str, tuple[Any, ...]], asyncio.Future[tuple[Any, ...]]
+        ] = {}
+        self._warm_up: asyncio.Future[Warmup] | None = None
+
+    def warm_up(self) -> asyncio.Future[Warmup]:
+        """Warm up the selected licensing backend in the background.
+
+        Call it at service startup: the first license stages then wait for
+        this warm-up instead of starting their own. The full licensing
+        table is not built when the compact backend is selected (see
+        `whiteprints_template_context.preload.warmup`).
+
+        Returns:
+            A future of the summary of the warm-up.
+        """
+        if self._warm_up is None:
+            self._warm_up = asyncio.get_running_loop().run_in_executor(
+                self.executor, partial(warmup, freeze=False)
+            )
+
+        return self._warm_up
+
+    def _offload(
+        self,
+        stage: Stage,
+        inputs: tuple[Any, ...],
+    ) -> asyncio.Future[tuple[Any, ...]]:
+        key = (stage.name, inputs)
+        future = self._in_flight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._run(stage, inputs))
+            self._in_flight[key] = future
+            future.add_done_callback(lambda _: self._in_flight.pop(key))
+
+        return future
+
+    async def _run(
+        self,
+        stage: Stage,
+        inputs: tuple[Any, ...],
+    ) -> tuple[Any, ...]:
+        await self.warm_up()
+        return await asyncio.get_running_loop().run_in_executor(
+            self.executor, derive_stage, stage, inputs
+        )
+
+    async def _derive_stage(
+        self,
+        stage: Stage,
+        inputs: tuple[Any, ...],
+    ) -> tuple[Any, ...]:
+        if stage.name not in OFFLOADED_STAGES:
+            return derive_stage(stage, inputs)
+
+        # A cancelled request must not cancel the requests it is shared with.
+        return await asyncio.shield(self._offload(stage, inputs))
+
+    async def hook(self, context: dict[str, Any]) -> dict[str, Any]:
+        """Add the derived values to a Copier context.
+
+        Arguments:
+            context: The Copier context to update in place.
+
+        Returns:
+            The updated context. The values whose inputs are missing from the
+            context are not derived.
+        """
+        stage_inputs = read_stage_inputs(
+            context, partial=True, defaults=self.defaults
+        )
+        outputs = await asyncio.gather(
+            *starmap(self._derive_stage, stage_inputs)
+        )
+        return DerivedContext.from_stages(
+            (stage, stage_outputs)
+            for (stage, _), stage_outputs in zip(stage_inputs, outputs)
+        ).merge_into(context)
@@ -0,0 +1,298 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints template context" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: MIT
+
+"""Bounded and observable memoization.
+
+The caches are fork-safe: their locks are renewed in forked children, so a
+child forked while another thread held a lock does not deadlock, and the
+entries computed before forking are shared with the children.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Mapping
+from functools import update_wrapper
+from typing import Any, Final, Generic, NamedTuple, TypeVar
+
+
+if sys.version_info >= (3, 10):
+    from typing import ParamSpec
+else:
+    from typing_extensions import ParamSpec
+
+
+__all__: Final = ["CacheInfo", "MemoizedFunction", "memoize"]
+"""Public module attributes."""
+
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+ExceptionTypes = tuple[type[BaseException], ...]
+"""Exception types, as accepted by an `except` clause."""
+
+
+class CacheInfo(NamedTuple):
+    """Statistics of a memoized function."""
+
+    hits: int
+    """Number of calls answered from the cache, including negative hits."""
+
+    misses: int
+    """Number of calls computing their result."""
+
+    evictions: int
+    """Number of entries dropped because of the size bound or their age."""
+
+    negative_hits: int
+    """Number of calls answered by re-raising a cached exception."""
+
+    maxsize: int | None
+    """Maximum number of entries, unbounded if None."""
+
+    ttl: float | None
+    """Maximum age of an entry in seconds, unbounded if None."""
+
+    currsize: int
+    """Current number of entries."""
+
+
+class _Entry(NamedTuple):
+    value: object
+    error: BaseException | None
+    expires: float | None
+
+
+def _make_key(
+    args: tuple[Hashable, ...],
+    kwargs: Mapping[str, Hashable],
+) -> Hashable:
+    if kwargs:
+        return (args, tuple(sorted(kwargs.items())))
+
+    if len(args) == 1 and isinstance(args[0], str):
+        return args[0]
+
+    return args
+
+
+_MEMOIZED: Final[weakref.WeakSet[MemoizedFunction[..., Any]]] = (
+    weakref.WeakSet()
+)
+"""Every memoized function, to renew their locks after forking."""
+
+
+def _renew_locks() -> None:
+    for memoized in _MEMOIZED:
+        memoized.reset_lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_renew_locks)
+
+
+class MemoizedFunction(Generic[P, R]):  # pylint: disable=too-many-instance-attributes
+    # The statistics are kept as plain counters updated under the cache
+    # lock, as functools.lru_cache does, rather than in a separate object.
+    """A function memoized in a bounded LRU cache with an optional TTL.
+
+    Exceptions whose type is listed in `negative` are cached as well and
+    re-raised on subsequent calls with the same arguments. `negative` may be
+    a callable returning the exception types, called on the first exception,
+    so that they are only imported when needed.
+
+    If `key` is given, calls whose arguments have the same key share a
+    single entry, computed from the arguments of the first of them.
+
+    Args:
+        function: The function to memoize.
+        maxsize: Maximum number of entries, unbounded if None.
+        ttl: Maximum age of an entry in seconds, unbounded if None.
+        negative: Exception types to cache, or a callable returning them.
+        key: Compute the cache key of the arguments, instead of the
+            arguments themselves.
+    """
+
+    def __init__(
+        self,
+        function: Callable[P, R],
+        *,
+        maxsize: int | None,
+        ttl: float | None,
+        negative: ExceptionTypes | Callable[[], ExceptionTypes],
+        key: Callable[P, Hashable] | None = None,
+    ) -> None:
+        """Instantiate a MemoizedFunction."""
+        update_wrapper(self, function)
+        self._function = function
+        self._key = key
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._negative = negative
+        self._entries: OrderedDict[Hashable, _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = self._misses = self._evictions = 0
+        self._negative_hits = 0
+        _MEMOIZED.add(self)
+
+    def __call__(self, *args: P.args, **kwargs: P.kwargs) -> R:
+        """Call the memoized function.
+
+        A cached exception is re-raised instead of returning a value.
+
+        Returns:
+            The cached or freshly computed result.
+        """
+        if self._key is None:
+            key = _make_key(args, kwargs)
+        else:
+            key = self._key(*args, **kwargs)
+
+        with self._lock:
+            entry = self._lookup(key)
+
+        if entry is None:
+            entry = self._compute(key, *args, **kwargs)
+
+        if entry.error is not None:
+            raise entry.error.with_traceback(None)
+
+        return entry.value  # type: ignore [reportReturnType]
+
+    def _lookup(self, key: Hashable) -> _Entry | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self._misses += 1
+            return None
+
+        if entry.expires is not None and entry.expires <= time.monotonic():
+            del self._entries[key]
+            self._evictions += 1
+            self._misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self._hits += 1
+        self._negative_hits += entry.error is not None
+        return entry
+
+    def _compute(
+        self, key: Hashable, *args: P.args, **kwargs: P.kwargs
+    ) -> _Entry:
+        expires = None if self._ttl is None else time.monotonic() + self._ttl
+        try:
+            entry = _Entry(self._function(*args, **kwargs), None, expires)
+        except self._negative_types() as error:
+            entry = _Entry(None, error, expires)
+
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            self._evict()
+
+        return entry
+
+    def _negative_types(self) -> ExceptionTypes:
+        if callable(self._negative):
+            self._negative = self._negative()
+
+        return self._negative
+
+    def _evict(self) -> None:
+        while self._maxsize is not None and len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def cache_info(self) -> CacheInfo:
+        """Report the cache statistics.
+
+        Returns:
+            The cache statistics.
+        """
+        with self._lock:
+            return CacheInfo(
+                self._hits,
+                self._misses,
+                self._evictions,
+                self._negative_hits,
+                self._maxsize,
+                self._ttl,
+                len(self._entries),
+            )
+
+    def cache_clear(self) -> None:
+        """Clear the cache and its statistics."""
+        with self._lock:
+            self._entries.clear()
+            self._hits = self._misses = self._evictions = 0
+            self._negative_hits = 0
+
+    def cache_configure(
+        self,
+        *,
+        maxsize: int | None,
+        ttl: float | None = None,
+    ) -> None:
+        """Change the cache bounds.
+
+        Entries exceeding the new size are evicted immediately; the new TTL
+        applies to entries cached from now on.
+
+        Arguments:
+            maxsize: Maximum number of entries, unbounded if None.
+            ttl: Maximum age of an entry in seconds, unbounded if None.
+        """
+        with self._lock:
+            self._maxsize = maxsize
+            self._ttl = ttl
+            self._evict()
+
+    def reset_lock(self) -> None:
+        """Replace the lock of the cache by a new, released, one.
+
+        A child process forked while another thread held the lock would
+        otherwise wait on it forever; the lock is reset in the children.
+        """
+        self._lock = threading.Lock()
+
+
+def memoize(
+    *,
+    maxsize: int | None = 128,
+    ttl: float | None = None,
+    negative: ExceptionTypes | Callable[[], ExceptionTypes] = (),
+    key: Callable[..., Hashable] | None = None,
+) -> Callable[[Callable[P, R]], MemoizedFunction[P, R]]:
+    """Memoize a function in a bounded and observable cache.
+
+    Contrary to `functools.lru_cache`, the cache reports its evictions,
+    supports a time to live and can cache exceptions.
+
+    Arguments:
+        maxsize: Maximum number of entries, unbounded if None.
+        ttl: Maximum age of an entry in seconds, unbounded if None.
+        negative: Exception types to cache, or a callable returning them.
+        key: Compute the cache key of the arguments, instead of the
+            arguments themselves.
+
+    Returns:
+        A decorator memoizing a function.
+    """
+
+    def decorator(function: Callable[P, R]) -> MemoizedFunction[P, R]:
+        return MemoizedFunction(
+            function,
+            maxsize=maxsize,
+            ttl=ttl,
+            negative=negative,
+            key=key,
+        )
+
+    return decorator
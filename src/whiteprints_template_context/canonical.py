@@ -0,0 +1,252 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints template context" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: MIT
+
+"""Canonical form of equivalent SPDX license expressions.
+
+`MIT OR Apache-2.0`, `Apache-2.0 OR MIT` and `(MIT)  or  Apache-2.0` are
+the same expression. `canonical_expression` maps them to a single key,
+without building the licensing table, so that the SPDX helpers share one
+cache entry, and one parse, for all of them.
+
+Identifiers keep their case: only the licensing table knows which
+identifiers are case-insensitive, and an unknown identifier is reported as
+written.
+
+The same parser locates the symbols of an expression for the compact
+licensing backend, see `parse_symbols`.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Final, NamedTuple
+
+from whiteprints_template_context.cache import memoize
+
+
+__all__: Final = [
+    "CANONICAL_CACHE_SIZE",
+    "ExpressionSymbol",
+    "canonical_expression",
+    "parse_symbols",
+]
+"""Public module attributes."""
+
+
+CANONICAL_CACHE_SIZE: Final = 4096
+"""Number of expressions memoized by `canonical_expression`."""
+
+_TOKENS: Final = re.compile(r"[()]|[^\s()]+")
+"""Parentheses, and words separated by whitespace or parentheses."""
+
+_OPERATORS: Final = ("or", "and")
+"""Commutative operators, by increasing precedence."""
+
+_WITH: Final = "with"
+"""The operator attaching an exception to a license."""
+
+_RESERVED: Final = frozenset(("(", ")", _WITH, *_OPERATORS))
+"""Tokens that cannot name a license or an exception."""
+
+
+class ExpressionSymbol(NamedTuple):
+    """A license or exception identifier, as written in an expression."""
+
+    text: str
+    """The identifier."""
+
+    start: int
+    """Position of the identifier in the expression."""
+
+    exception: bool
+    """Whether the identifier follows `WITH`, as an exception."""
+
+
+class _Term(NamedTuple):
+    operator: str | None
+    operands: tuple[_Term, ...] = ()
+    symbol: str = ""
+
+
+def _render(term: _Term, parent: str | None = None) -> str:
+    if term.operator is None:
+        return term.symbol
+
+    text = f" {term.operator.upper()} ".join(
+        _render(operand, term.operator) for operand in term.operands
+    )
+    return f"({text})" if (parent, term.operator) == ("and", "or") else text
+
+
+def _order(term: _Term) -> tuple[str, str]:
+    text = _render(term)
+    return text.casefold(), text
+
+
+def _combine(operator: str, operands: list[_Term]) -> _Term:
+    if len(operands) == 1:
+        return operands[0]
+
+    flattened = [
+        child
+        for operand in operands
+        for child in (
+            operand.operands if operand.operator == operator else (operand,)
+        )
+    ]
+    return _Term(operator, tuple(sorted(flattened, key=_order)))
+
+
+class _Parser:
+    def __init__(self, expression: str) -> None:
+        self.tokens = list(_TOKENS.finditer(expression))
+        self.position = 0
+        self.symbols: list[ExpressionSymbol] = []
+
+    def peek(self) -> str | None:
+        """Look at the next token without consuming it.
+
+        Returns:
+            The next token, case-folded, or None at the end.
+        """
+        if self.position == len(self.tokens):
+            return None
+
+        return self.tokens[self.position][0].casefold()
+
+    def take(self) -> str:
+        """Consume the next token.
+
+        Returns:
+            The token, as written.
+
+        Raises:
+            ValueError: At the end of the expression.
+        """
+        if self.position == len(self.tokens):
+            message = "Unexpected end of expression."
+            raise ValueError(message)
+
+        self.position += 1
+        return self.tokens[self.position - 1][0]
+
+    def identifier(self, *, exception: bool = False) -> str:
+        """Consume a license or exception identifier, and record it.
+
+        Arguments:
+            exception: Whether the identifier follows `WITH`.
+
+        Returns:
+            The identifier, as written.
+
+        Raises:
+            ValueError: If the token is an operator or a parenthesis.
+        """
+        token = self.take()
+        if token.casefold() in _RESERVED:
+            message = f"Unexpected {token!r}."
+            raise ValueError(message)
+
+        start = self.tokens[self.position - 1].start()
+        self.symbols.append(ExpressionSymbol(token, start, exception))
+        return token
+
+    def parse(self) -> _Term:
+        """Parse the whole expression.
+
+        Returns:
+            The expression tree.
+
+        Raises:
+            ValueError: If tokens follow a complete expression.
+        """
+        term = self.operation(0)
+        if self.peek() is not None:
+            message = f"Unexpected {self.take()!r}."
+            raise ValueError(message)
+
+        return term
+
+    def operation(self, level: int) -> _Term:
+        """Parse the operations of a precedence level.
+
+        Arguments:
+            level: The index of the operator in `_OPERATORS`.
+
+        Returns:
+            The combined operands.
+        """
+        if level == len(_OPERATORS):
+            return self.operand()
+
+        operator = _OPERATORS[level]
+        operands = [self.operation(level + 1)]
+        while self.peek() == operator:
+            self.take()
+            operands.append(self.operation(level + 1))
+
+        return _combine(operator, operands)
+
+    def operand(self) -> _Term:
+        """Parse a parenthesized operation or a license identifier.
+
+        Returns:
+            The operation, or the license and its exception.
+
+        Raises:
+            ValueError: If the parentheses are unbalanced.
+        """
+        if self.peek() == "(":
+            self.take()
+            term = self.operation(0)
+            if self.take() != ")":
+                message = "Unbalanced parentheses."
+                raise ValueError(message)
+
+            return term
+
+        symbol = self.identifier()
+        if self.peek() == _WITH:
+            self.take()
+            symbol += f" WITH {self.identifier(exception=True)}"
+
+        return _Term(None, symbol=symbol)
+
+
+@memoize(maxsize=CANONICAL_CACHE_SIZE)
+def canonical_expression(expression: str) -> str:
+    """Map equivalent SPDX license expressions to the same key.
+
+    Whitespace is normalized, operators are upper-cased, nested operations
+    of the same operator are flattened, the operands of `AND` and `OR` are
+    sorted regardless of case, and parentheses are reduced to the minimum.
+    Identifiers keep their case. A malformed expression is only whitespace
+    normalized, so that parsing it reports the error as written.
+
+    Arguments:
+        expression: An SPDX license expression.
+
+    Returns:
+        The canonical form of the expression.
+    """
+    try:
+        return _render(_Parser(expression).parse())
+    except ValueError:
+        return " ".join(expression.split())
+
+
+def parse_symbols(expression: str) -> tuple[ExpressionSymbol, ...]:
+    """Locate the license and exception identifiers of an expression.
+
+    A malformed expression raises a ValueError.
+
+    Arguments:
+        expression: An SPDX license expression.
+
+    Returns:
+        The identifiers, in order of appearance.
+    """
+    parser = _Parser(expression)
+    parser.parse()
+    return tuple(parser.symbols)
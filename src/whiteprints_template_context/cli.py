@@ -0,0 +1,511 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints template context" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: MIT
+
+"""Command line interface.
+
+`whiteprints-template-context validate` checks SPDX license expressions in
+bulk. Expressions are read from Copier answers files (`.yml`, `.yaml`),
+`pyproject.toml` files, or text files and the standard input, one expression
+per line. Identical expressions are validated once, in a pool of worker
+processes each holding a warm licensing table, and the results are written
+as JSON lines.
+
+`whiteprints-template-context cache` reports the statistics of the
+persistent cache of derived values, or clears it.
+
+`whiteprints-template-context regenerate` recomputes the derived values
+stored in Copier answers files, and writes back the changed ones (see
+`whiteprints_template_context.regenerate`).
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Final, NamedTuple, cast
+
+import yaml  # type: ignore [reportMissingTypeStubs]
+
+from whiteprints_template_context.filters import (
+    LicenseExpressionError,
+    is_spdx_expression,
+)
+from whiteprints_template_context.persistent_cache import (
+    CACHE_DIRECTORY_VARIABLE,
+    CACHE_FILE_NAME,
+    PersistentCache,
+    read_cache_info,
+)
+from whiteprints_template_context.preload import warmup
+from whiteprints_template_context.regenerate import (
+    ANSWERS_FILE_PATTERN,
+    find_answers_files,
+    regenerate,
+)
+from whiteprints_template_context.regenerate import (
+    DEFAULT_CHUNKSIZE as REGENERATE_CHUNKSIZE,
+)
+
+
+if sys.version_info >= (3, 11):
+    import tomllib
+else:
+    import tomli as tomllib
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator, Sequence
+    from contextlib import AbstractContextManager
+    from typing import TextIO
+
+
+__all__: Final = [
+    "DEFAULT_CHUNKSIZE",
+    "EXIT_ERROR",
+    "EXIT_INVALID",
+    "EXIT_SUCCESS",
+    "EXIT_VALID",
+    "LICENSE_KEYS",
+    "STDIN",
+    "Occurrence",
+    "main",
+    "read_expressions",
+    "validate_expression",
+    "validate_expressions",
+]
+"""Public module attributes."""
+
+
+STDIN: Final = "-"
+"""Path standing for the standard input."""
+
+LICENSE_KEYS: Final = ("code_license_id", "resources_license_id")
+"""Keys of the license expressions in Copier answers files."""
+
+DEFAULT_CHUNKSIZE: Final = 64
+"""Number of expressions sent to a worker process at once."""
+
+EXIT_SUCCESS: Final = 0
+"""Exit status of a successful command."""
+
+EXIT_VALID: Final = EXIT_SUCCESS
+"""Exit status when every expression is valid."""
+
+EXIT_INVALID: Final = 1
+"""Exit status when an expression is invalid."""
+
+EXIT_ERROR: Final = 3
+"""Exit status when a file cannot be read or regenerated.
+
+Distinct from `EXIT_INVALID`, and from the status 2 of usage errors.
+"""
+
+
+class Occurrence(NamedTuple):
+    """A license expression and where it was found."""
+
+    source: str
+    """The file and line, or key, of the expression."""
+
+    expression: str
+    """The license expression."""
+
+
+def _read_lines(name: str, stream: TextIO) -> Iterator[Occurrence]:
+    for number, line in enumerate(stream, start=1):
+        expression = line.strip()
+        if expression:
+            yield Occurrence(f"{name}:{number}", expression)
+
+
+def _read_text(path: Path) -> Iterator[Occurrence]:
+    with path.open(encoding="utf-8") as stream:
+        yield from _read_lines(str(path), stream)
+
+
+def _answers_mapping(answers: object) -> dict[str, object]:
+    if answers is None:
+        return {}
+
+    if not isinstance(answers, dict):
+        message = "The answers are not a mapping."
+        raise TypeError(message)
+
+    return cast("dict[str, object]", answers)
+
+
+def _read_answers(path: Path) -> Iterator[Occurrence]:
+    with path.open(encoding="utf-8") as stream:
+        answers = _answers_mapping(yaml.safe_load(stream))
+
+    for key in LICENSE_KEYS:
+        value = answers.get(key)
+        if isinstance(value, str):
+            yield Occurrence(f"{path}:{key}", value)
+
+
+def _read_pyproject(path: Path) -> Iterator[Occurrence]:
+    with path.open("rb") as stream:
+        project: object = tomllib.load(stream).get("project")
+
+    if not isinstance(project, dict):
+        return
+
+    # A table is a legacy, non SPDX, license.
+    value = cast("dict[str, object]", project).get("license")
+    if isinstance(value, str):
+        yield Occurrence(f"{path}:project.license", value)
+
+
+_READERS: Final[dict[str, Callable[[Path], Iterator[Occurrence]]]] = {
+    ".yaml": _read_answers,
+    ".yml": _read_answers,
+    ".toml": _read_pyproject,
+}
+
+
+def read_expressions(path: str) -> Iterator[Occurrence]:
+    """Read the license expressions of a file.
+
+    Arguments:
+        path: A Copier answers file, a `pyproject.toml` file, or a text file
+            with one expression per line; `STDIN` reads the standard input
+            as a text file.
+
+    Returns:
+        An iterator over the expressions found in the file. Iterating it
+        raises an OSError if the file cannot be read, a ValueError or a
+        `yaml.YAMLError` if it cannot be parsed, and a TypeError if a
+        Copier answers file is not a mapping.
+    """
+    if path == STDIN:
+        return _read_lines("<stdin>", sys.stdin)
+
+    file = Path(path)
+    return _READERS.get(file.suffix, _read_text)(file)
+
+
+def validate_expression(expression: str) -> str | None:
+    """Validate a license expression.
+
+    Arguments:
+        expression: An SPDX license expression.
+
+    Returns:
+        None if the expression is valid, the validation error otherwise.
+    """
+    try:
+        is_spdx_expression(expression)
+    except LicenseExpressionError as error:
+        return str(error)
+
+    return None
+
+
+def _initialize_worker() -> None:
+    # Build the licensing of the selected backend once per worker, before
+    # any expression.
+    warmup(freeze=False)
+
+
+def _validate_all(
+    expressions: Sequence[str],
+    jobs: int,
+    chunksize: int,
+) -> Iterator[str | None]:
+    # Do not start more workers than there are chunks to validate.
+    workers = min(jobs, -(-len(expressions) // chunksize))
+    if workers <= 1:
+        yield from map(validate_expression, expressions)
+        return
+
+    with ProcessPoolExecutor(workers, initializer=_initialize_worker) as pool:
+        yield from pool.map(
+            validate_expression, expressions, chunksize=chunksize
+        )
+
+
+def validate_expressions(
+    occurrences: Iterable[Occurrence],
+    *,
+    jobs: int = 1,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+) -> Iterator[dict[str, Any]]:
+    """Validate license expressions in a pool of processes.
+
+    The occurrences are all read before the first expression is validated,
+    so that each result lists every source of its expression: the memory
+    used grows with the number of distinct expressions and of occurrences.
+
+    Arguments:
+        occurrences: The license expressions to validate.
+        jobs: Maximum number of worker processes; with a single job, the
+            expressions are validated in the current process.
+        chunksize: Number of expressions sent to a worker at once.
+
+    Yields:
+        For each distinct expression, in order of first occurrence, its
+        validity, its validation error and the sources it was found in.
+    """
+    sources: dict[str, list[str]] = {}
+    for occurrence in occurrences:
+        sources.setdefault(occurrence.expression, []).append(occurrence.source)
+
+    expressions = list(sources)
+    for expression, error in zip(
+        expressions, _validate_all(expressions, jobs, chunksize)
+    ):
+        yield {
+            "expression": expression,
+            "valid": error is None,
+            "error": error,
+            "sources": sources[expression],
+        }
+
+
+def _open_output(path: Path | None) -> AbstractContextManager[TextIO]:
+    if path is None:
+        return contextlib.nullcontext(sys.stdout)
+
+    return path.open("w", encoding="utf-8")
+
+
+def _read_into(path: str, occurrences: list[Occurrence]) -> str | None:
+    try:
+        found = list(read_expressions(path))
+    except (OSError, TypeError, ValueError, yaml.YAMLError) as error:
+        return f"{type(error).__name__}: {error}"
+
+    occurrences.extend(found)
+    return None
+
+
+def _write_read_errors(
+    paths: Iterable[str],
+    occurrences: list[Occurrence],
+    output: TextIO,
+) -> bool:
+    failed = False
+    for path in paths:
+        error = _read_into(path, occurrences)
+        if error is not None:
+            output.write(json.dumps({"path": path, "error": error}) + "\n")
+            failed = True
+
+    return failed
+
+
+def _write_results(
+    results: Iterable[dict[str, Any]],
+    output: TextIO,
+) -> bool:
+    valid = True
+    for result in results:
+        output.write(json.dumps(result) + "\n")
+        valid = valid and result["valid"]
+
+    return valid
+
+
+def _validate(arguments: argparse.Namespace) -> int:
+    occurrences: list[Occurrence] = []
+    with _open_output(arguments.output) as output:
+        failed = _write_read_errors(arguments.paths, occurrences, output)
+        valid = _write_results(
+            validate_expressions(
+                occurrences,
+                jobs=arguments.jobs,
+                chunksize=arguments.chunksize,
+            ),
+            output,
+        )
+
+    if failed:
+        return EXIT_ERROR
+
+    return EXIT_VALID if valid else EXIT_INVALID
+
+
+def _cache(arguments: argparse.Namespace) -> int:
+    path = arguments.directory / CACHE_FILE_NAME
+    if arguments.action == "info":
+        info = read_cache_info(path)
+    else:
+        with PersistentCache(path) as persistent_cache:
+            persistent_cache.clear()
+            info = persistent_cache.info()
+
+    sys.stdout.write(json.dumps(info._asdict()) + "\n")
+    return EXIT_SUCCESS
+
+
+def _regenerate(arguments: argparse.Namespace) -> int:
+    regenerations = regenerate(
+        find_answers_files(arguments.paths),
+        jobs=arguments.jobs,
+        chunksize=arguments.chunksize,
+        dry_run=arguments.dry_run,
+        add_missing=arguments.add_missing,
+    )
+    status = EXIT_SUCCESS
+    with _open_output(arguments.output) as output:
+        for regeneration in regenerations:
+            output.write(json.dumps(regeneration._asdict()) + "\n")
+            if regeneration.error is not None:
+                status = EXIT_ERROR
+
+    return status
+
+
+def _add_validate_command(
+    add_parser: Callable[..., argparse.ArgumentParser],
+) -> None:
+    validate = add_parser(
+        "validate",
+        help="validate SPDX license expressions",
+        description=(
+            "Validate SPDX license expressions and write one JSON line per"
+            " distinct expression, after one JSON line per file that cannot"
+            f" be read. Exit with status {EXIT_INVALID} if any expression is"
+            f" invalid, {EXIT_ERROR} if any file cannot be read."
+        ),
+    )
+    validate.add_argument(
+        "paths",
+        nargs="*",
+        default=[STDIN],
+        metavar="PATH",
+        help=(
+            "Copier answers file (.yml, .yaml), pyproject.toml file, or text"
+            " file with one expression per line (default: standard input)"
+        ),
+    )
+    validate.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="number of worker processes (default: number of CPUs)",
+    )
+    validate.add_argument(
+        "--chunksize",
+        type=int,
+        default=DEFAULT_CHUNKSIZE,
+        help="number of expressions sent to a worker at once",
+    )
+    validate.add_argument(
+        "-o",
+        "--output",
+        type=Path,
+        help="file to write the results to (default: standard output)",
+    )
+    validate.set_defaults(command=_validate)
+
+
+def _add_cache_command(
+    add_parser: Callable[..., argparse.ArgumentParser],
+) -> None:
+    cache = add_parser(
+        "cache",
+        help="inspect or clear the persistent cache",
+        description=(
+            "Write the statistics of the persistent cache of derived values"
+            " as a JSON line, after clearing it with the clear action."
+        ),
+    )
+    cache.add_argument("action", choices=("info", "clear"))
+    directory = os.environ.get(CACHE_DIRECTORY_VARIABLE)
+    cache.add_argument(
+        "-d",
+        "--directory",
+        type=Path,
+        default=directory,
+        required=not directory,
+        help=f"cache directory (default: ${CACHE_DIRECTORY_VARIABLE})",
+    )
+    cache.set_defaults(command=_cache)
+
+
+def _add_regenerate_command(
+    add_parser: Callable[..., argparse.ArgumentParser],
+) -> None:
+    command = add_parser(
+        "regenerate",
+        help="regenerate the derived values of Copier answers files",
+        description=(
+            "Derive the values of Copier answers files again, write back"
+            " the changed ones, and write one JSON line per file. Exit with"
+            f" status {EXIT_ERROR} if any file cannot be regenerated."
+        ),
+    )
+    command.add_argument(
+        "paths",
+        nargs="+",
+        metavar="PATH",
+        help=(
+            "Copier answers file, or directory searched recursively for"
+            f" {ANSWERS_FILE_PATTERN} files"
+        ),
+    )
+    command.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="number of worker processes (default: 1)",
+    )
+    command.add_argument(
+        "--chunksize",
+        type=int,
+        default=REGENERATE_CHUNKSIZE,
+        help="number of files sent to a worker at once",
+    )
+    command.add_argument(
+        "-n",
+        "--dry-run",
+        action="store_true",
+        help="only report the changed values",
+    )
+    command.add_argument(
+        "--add-missing",
+        action="store_true",
+        help="also add the derived values missing from the files",
+    )
+    command.add_argument(
+        "-o",
+        "--output",
+        type=Path,
+        help="file to write the results to (default: standard output)",
+    )
+    command.set_defaults(command=_regenerate)
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="whiteprints-template-context",
+        description="Tools for the Whiteprints template context.",
+    )
+    commands = parser.add_subparsers(required=True, metavar="COMMAND")
+    _add_validate_command(commands.add_parser)
+    _add_cache_command(commands.add_parser)
+    _add_regenerate_command(commands.add_parser)
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run the command line interface.
+
+    Arguments:
+        argv: The command line arguments, without the program name. Defaults
+            to `sys.argv`.
+
+    Returns:
+        The exit status.
+    """
+    arguments = _parser().parse_args(argv)
+    return arguments.command(arguments)
@@ -0,0 +1,343 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints template context" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: MIT
+
+"""Compact SPDX licensing backend.
+
+The `license_expression` licensing object holds a symbol object per license,
+with its aliases, and the automaton matching them. The helpers of this
+package only need to look up, validate and extract the symbols of an
+expression: `CompactLicensing` does so with the interned SPDX keys, and a
+sorted array of their case-folded identifiers searched by bisection.
+
+Set the `WHITEPRINTS_TEMPLATE_CONTEXT_LICENSING_BACKEND` environment
+variable to `compact` to use it in `spdx_symbols`, `is_spdx_expression` and
+`render_links`. The `spdx_normalize` and `spdx_canonical` filters still use
+the full licensing object.
+
+Expressions are accepted and rejected as the full licensing does: a blank
+expression has no symbols, and an identifier with characters other than
+letters, digits, `_`, `.`, `:`, `-` and `+` is malformed.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import sys
+from array import array
+from bisect import bisect_left
+from functools import cache
+from typing import TYPE_CHECKING, Any, Final, NamedTuple
+
+from whiteprints_template_context.canonical import (
+    ExpressionSymbol,
+    parse_symbols,
+)
+from whiteprints_template_context.licensing import parse_errors
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Mapping
+
+
+__all__: Final = [
+    "BACKEND_VARIABLE",
+    "COMPACT_BACKEND",
+    "CompactExpressionInfo",
+    "CompactLicensing",
+    "compact_backend_selected",
+    "get_compact_licensing",
+]
+"""Public module attributes."""
+
+
+BACKEND_VARIABLE: Final = "WHITEPRINTS_TEMPLATE_CONTEXT_LICENSING_BACKEND"
+"""Environment variable selecting the licensing backend."""
+
+COMPACT_BACKEND: Final = "compact"
+"""Value of `BACKEND_VARIABLE` selecting the compact backend."""
+
+
+_KEY: Final = re.compile(r"[-:\w.+]+")
+"""Characters of a license key, as checked by `license_expression`."""
+
+
+def _symbols(expression: str) -> tuple[ExpressionSymbol, ...]:
+    if not expression.strip():
+        return ()
+
+    symbols = parse_symbols(expression)
+    for symbol in symbols:
+        if not _KEY.fullmatch(symbol.text):
+            message = (
+                "Invalid license key: the valid characters are: letters and"
+                " numbers, underscore, dot, colon or hyphen signs and"
+                f" spaces: {symbol.text!r}"
+            )
+            raise ValueError(message)
+
+    return symbols
+
+
+def _parse(expression: str) -> tuple[ExpressionSymbol, ...]:
+    try:
+        return _symbols(expression)
+    except ValueError as error:
+        (expression_error,) = parse_errors()
+        raise expression_error(str(error)) from error
+
+
+class CompactExpressionInfo(NamedTuple):
+    """Validation of a license expression, as `ExpressionInfo` reports it."""
+
+    original_expression: str
+    """The validated expression."""
+
+    errors: list[str]
+    """The validation errors, empty if the expression is valid."""
+
+
+class _Identifiers:
+    """Identifiers concatenated in a string, located by an array of offsets.
+
+    Items are case-folded, so that the identifiers, sorted
+    case-insensitively, can be searched by bisection.
+    """
+
+    __slots__ = ("_offsets", "_text")
+
+    def __init__(self, identifiers: Iterable[str]) -> None:
+        self._offsets = array("I", [0])
+        text: list[str] = []
+        for identifier in identifiers:
+            text.append(identifier)
+            self._offsets.append(self._offsets[-1] + len(identifier))
+
+        self._text = "".join(text)
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, position: int) -> str:
+        return self.spelling(position).casefold()
+
+    def spelling(self, position: int) -> str:
+        """Read an identifier as written.
+
+        Arguments:
+            position: The position of the identifier.
+
+        Returns:
+            The identifier, in its original case.
+        """
+        return self._text[
+            self._offsets[position] : self._offsets[position + 1]
+        ]
+
+
+def _identifier_keys(
+    licenses: Iterable[tuple[str, Iterable[str], bool]],
+) -> list[tuple[str, str]]:
+    keys: dict[str, str] = {}
+    for key, aliases, _ in licenses:
+        for identifier in (key, *aliases):
+            if len(identifier.split()) == 1:
+                keys.setdefault(identifier.casefold(), key)
+
+    return sorted(keys.items())
+
+
+class CompactLicensing:
+    """SPDX license and exception keys, with their aliases.
+
+    The keys and aliases are concatenated in a single string, sorted
+    case-insensitively, and located by an array of offsets; another array
+    maps each identifier to the position of its SPDX key. Identifiers are
+    matched case-insensitively, by bisection. The few aliases made of
+    several words, such as `GPL 2.0`, are not recognized, as words are
+    separated by whitespace in expressions.
+
+    Arguments:
+        licenses: The SPDX key, the aliases, and whether it is an exception,
+            of each license.
+    """
+
+    __slots__ = ("_exceptions", "_identifiers", "_targets")
+
+    def __init__(
+        self,
+        licenses: Iterable[tuple[str, Iterable[str], bool]],
+    ) -> None:
+        """Instantiate a CompactLicensing."""
+        licenses = list(licenses)
+        identifier_keys = _identifier_keys(licenses)
+        positions = {
+            folded: position
+            for position, (folded, _) in enumerate(identifier_keys)
+        }
+        # The keys keep their case, to be returned by lookups.
+        self._identifiers = _Identifiers(
+            key if key.casefold() == folded else folded
+            for folded, key in identifier_keys
+        )
+        self._targets = array(
+            "H", (positions[key.casefold()] for _, key in identifier_keys)
+        )
+        self._exceptions = frozenset(
+            sys.intern(key)
+            for key, _, is_exception in licenses
+            if is_exception
+        )
+
+    @classmethod
+    def from_license_index(
+        cls,
+        license_index: Iterable[Mapping[str, Any]],
+    ) -> CompactLicensing:
+        """Load the SPDX licenses of a ScanCode license index.
+
+        Arguments:
+            license_index: The license index, as returned by
+                `license_expression.get_license_index`.
+
+        Returns:
+            The compact licensing of the licenses with an SPDX key.
+        """
+        return cls(
+            (
+                license_["spdx_license_key"],
+                license_.get("other_spdx_license_keys", ()),
+                license_.get("is_exception", False),
+            )
+            for license_ in license_index
+            if license_.get("spdx_license_key")
+        )
+
+    def lookup(self, identifier: str) -> str | None:
+        """Find the SPDX key of a license or exception identifier.
+
+        Arguments:
+            identifier: An SPDX key or alias, in any case.
+
+        Returns:
+            The SPDX key, or None if the identifier is unknown.
+        """
+        folded = identifier.casefold()
+        identifiers = self._identifiers
+        position = bisect_left(identifiers, folded)
+        if position == len(identifiers) or identifiers[position] != folded:
+            return None
+
+        return sys.intern(identifiers.spelling(self._targets[position]))
+
+    def license_keys(self, expression: str) -> frozenset[str]:
+        """Extract the symbols of a license expression.
+
+        A malformed expression raises an `ExpressionError`.
+
+        Arguments:
+            expression: An SPDX license expression.
+
+        Returns:
+            The SPDX keys of the licenses and exceptions, unknown identifiers
+            as written.
+        """
+        return frozenset(
+            self.lookup(symbol.text) or symbol.text
+            for symbol in _parse(expression)
+        )
+
+    def _misuse(self, symbol: ExpressionSymbol) -> str | None:
+        key = self.lookup(symbol.text)
+        if key is None or symbol.exception == (key in self._exceptions):
+            return None
+
+        if symbol.exception:
+            return (
+                "A plain license symbol cannot be used as an exception in a"
+                f' "WITH symbol" statement. for token: "{symbol.text}"'
+            )
+
+        return (
+            "A license exception symbol can only be used as an exception in"
+            f' a "WITH exception" statement. for token: "{symbol.text}"'
+        )
+
+    def validate(self, expression: str) -> CompactExpressionInfo:
+        """Validate a license expression.
+
+        Arguments:
+            expression: An SPDX license expression.
+
+        Returns:
+            The validation errors: malformed expression, unknown identifiers,
+            and licenses and exceptions used in place of each other.
+        """
+        try:
+            symbols = _symbols(expression)
+        except ValueError as error:
+            return CompactExpressionInfo(expression, [str(error)])
+
+        errors: list[str] = []
+        unknown = [
+            symbol.text
+            for symbol in symbols
+            if self.lookup(symbol.text) is None
+        ]
+        if unknown:
+            errors.append(f"Unknown license key(s): {', '.join(unknown)}")
+
+        errors.extend(filter(None, map(self._misuse, symbols)))
+        return CompactExpressionInfo(expression, errors)
+
+    def segments(self, expression: str) -> Iterator[tuple[str, str | None]]:
+        """Split a license expression into its symbols and the text between.
+
+        A malformed expression raises an `ExpressionError`.
+
+        Arguments:
+            expression: An SPDX license expression.
+
+        Yields:
+            Pieces of the expression text, and the SPDX key of the symbol
+            they name, if any.
+        """
+        end = 0
+        for symbol in _parse(expression):
+            yield expression[end : symbol.start], None
+            yield symbol.text, self.lookup(symbol.text) or symbol.text
+            end = symbol.start + len(symbol.text)
+
+        yield expression[end:], None
+
+
+def compact_backend_selected() -> bool:
+    """Whether the environment selects the compact backend.
+
+    Returns:
+        Whether `BACKEND_VARIABLE` is set to `COMPACT_BACKEND`.
+    """
+    return os.environ.get(BACKEND_VARIABLE) == COMPACT_BACKEND
+
+
+@cache
+def get_compact_licensing() -> CompactLicensing | None:
+    """Process-wide compact licensing, if selected by the environment.
+
+    The compact licensing is built on first use from the license index
+    bundled with `license_expression`, which is then released.
+
+    Returns:
+        The compact licensing, or None unless `BACKEND_VARIABLE` is set to
+        `COMPACT_BACKEND`.
+    """
+    if not compact_backend_selected():
+        return None
+
+    # pylint: disable-next=import-outside-toplevel
+    from license_expression import (  # noqa: PLC0415  # type: ignore [reportMissingTypeStubs]
+        get_license_index,
+    )
+
+    return CompactLicensing.from_license_index(get_license_index())
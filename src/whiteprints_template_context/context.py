@@ -6,27 +6,118 @@
 from __future__ import annotations
 
 import re
-import sys
 import unicodedata
+from collections import Counter, defaultdict
+from collections.abc import Callable, Iterable, Iterator, Mapping
 from functools import lru_cache
-from typing import Any, Final, cast
+from typing import TYPE_CHECKING, Any, Final, NamedTuple, cast
 
-from copier_templates_extensions import ContextHook
-from license_expression import (  # type: ignore [reportMissingTypeStubs]
-    BaseSymbol,
-    get_spdx_licensing,
+from whiteprints_template_context.cache import memoize
+from whiteprints_template_context.canonical import canonical_expression
+from whiteprints_template_context.compact_licensing import (
+    get_compact_licensing,
 )
+from whiteprints_template_context.license_links import (
+    LOCAL_LINK,
+    SPDX_LINK,
+    render_links,
+)
+from whiteprints_template_context.licensing import get_licensing, parse_errors
+from whiteprints_template_context.python_matrix import (
+    LATEST_PYTHON,
+    LATEST_PYTHON_KEY,
+    latest_python_minor,
+    python_matrix,
+    python_minor,
+)
+
+
+__all__: Final = [
+    "DERIVED_CACHE_SIZE",
+    "INPUT_KEYS",
+    "LATEST_PYTHON",
+    "SLUG_CACHE_SIZE",
+    "SPDX_CACHE_SIZE",
+    "STAGES",
+    "ContextUpdater",
+    "DerivedContext",
+    "MissingContextKeysError",
+    "SpdxSymbolsTable",
+    "Stage",
+    "derive_context",
+    "derive_stage",
+    "missing_keys",
+    "option_defaults",
+    "read_stage_inputs",
+    "slugify",
+    "slugify_many",
+    "spdx_symbols",
+    "spdx_symbols_many",
+    "update_context",
+    "update_contexts",
+]
+"""Public module attributes."""
+
+
+if TYPE_CHECKING:
+    from license_expression import (  # type: ignore [reportMissingTypeStubs]
+        BaseSymbol,
+    )
+
+    from whiteprints_template_context.hook import ContextUpdater
+
+
+def __getattr__(name: str) -> object:
+    """Import `ContextUpdater` on first access.
+
+    `ContextUpdater` derives from `copier_templates_extensions.ContextHook`,
+    whose import pulls in the whole of Copier. Deferring it keeps the
+    helpers of this module cheap to import outside of Copier.
+
+    Returns:
+        The requested module attribute.
+
+    Raises:
+        AttributeError: If the module has no such attribute.
+    """
+    if name == "ContextUpdater":
+        # pylint: disable-next=import-outside-toplevel
+        from whiteprints_template_context.hook import (  # noqa: PLC0415
+            ContextUpdater,
+        )
+
+        return ContextUpdater
+
+    message = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(message)
+
+
+SPDX_CACHE_SIZE: Final = 1024
+"""Default number of license expressions memoized by the SPDX helpers."""
 
 
-if sys.version_info >= (3, 12):
-    from typing import override
-else:
-    from typing_extensions import override
+_NON_SLUG_CHARACTERS: Final = re.compile(r"[^\w\s-]")
+_SLUG_SEPARATORS: Final = re.compile(r"[-\s]+")
 
 
-LATEST_PYTHON: Final = 13
+def _ascii_slug_character(character: str) -> str | None:
+    lowered = character.lower()
+    if _NON_SLUG_CHARACTERS.fullmatch(lowered):
+        return None
 
+    return "-" if _SLUG_SEPARATORS.fullmatch(lowered) else lowered
 
+
+_ASCII_SLUG_TABLE: Final = str.maketrans({
+    chr(code): _ascii_slug_character(chr(code)) for code in range(128)
+})
+"""Lowercase, drop and separate ASCII characters as the slug patterns do."""
+
+SLUG_CACHE_SIZE: Final = 1024
+"""Number of slugs memoized by `slugify`."""
+
+
+@memoize(maxsize=SLUG_CACHE_SIZE)
 def slugify(value: str, *, allow_unicode: bool = False) -> str:
     """Slugify.
 
@@ -35,9 +126,16 @@ def slugify(value: str, *, allow_unicode: bool = False) -> str:
     underscores, or hyphens. Convert to lowercase. Also strip leading and
     trailing whitespace, dashes, and underscores.
 
+    ASCII values are slugified with a single `str.translate`, as they are
+    left unchanged by Unicode normalization.
+
     Returns:
         a slug of `value`.
     """
+    if value.isascii():
+        value = _SLUG_SEPARATORS.sub("-", value.translate(_ASCII_SLUG_TABLE))
+        return value.strip("-_")
+
     if allow_unicode:
         value = unicodedata.normalize("NFKC", value)
     else:
@@ -46,102 +144,500 @@ def slugify(value: str, *, allow_unicode: bool = False) -> str:
             .encode("ascii", "ignore")
             .decode("ascii")
         )
-    value = re.sub(r"[^\w\s-]", "", value.lower())
-    return re.sub(r"[-\s]+", "-", value).strip("-_")
+    value = _NON_SLUG_CHARACTERS.sub("", value.lower())
+    return _SLUG_SEPARATORS.sub("-", value).strip("-_")
 
 
 # SPDX-SnippetEnd
 
 
-@lru_cache
-def spdx_symbols(expression: str) -> set[str]:
+def slugify_many(
+    values: Iterable[str],
+    *,
+    allow_unicode: bool = False,
+) -> list[str]:
+    """Slugify many values.
+
+    Each distinct value is slugified once, whatever its number of
+    occurrences.
+
+    Arguments:
+        values: The values to slugify.
+        allow_unicode: Whether to keep non-ASCII characters, see `slugify`.
+
+    Returns:
+        The slugs of `values`, in order.
+    """
+    values = list(values)
+    slugs = {
+        value: slugify(value, allow_unicode=allow_unicode)
+        for value in dict.fromkeys(values)
+    }
+    return [slugs[value] for value in values]
+
+
+@memoize(
+    maxsize=SPDX_CACHE_SIZE,
+    negative=parse_errors,
+    key=canonical_expression,
+)
+def spdx_symbols(expression: str) -> frozenset[str]:
     """Extract SPDX symbols from a license expression.
 
     This function parses a given SPDX license expression and returns a set
     containing the symbols (licenses or exceptions) used in that expression.
+    Results, and parse errors, are memoized by the canonical form of the
+    expression, so that equivalent expressions are parsed once; see
+    `cache_info` for the cache statistics. The expression itself is parsed,
+    so that unknown symbols are returned as written.
 
     Arguments:
         expression: An SPDX license expression string, such as "MIT AND
            Apache-2.0".
 
     Returns:
-        A set of SPDX symbols (e.g., {"MIT", "Apache-2.0"}) extracted from the
-           input expression.
+        A frozen set of SPDX symbols (e.g., {"MIT", "Apache-2.0"}) extracted
+           from the input expression.
     """
-    licensing = get_spdx_licensing()
+    compact_licensing = get_compact_licensing()
+    if compact_licensing is not None:
+        return compact_licensing.license_keys(expression)
+
+    licensing = get_licensing()
     license_symbols = cast(
-        list[BaseSymbol],
+        "list[BaseSymbol]",
         licensing.license_symbols(  # type: ignore [reportGeneralTypeIssues]
             expression
         ),
     )
-    return {symbol.obj for symbol in license_symbols}
+    return frozenset(symbol.obj for symbol in license_symbols)
+
+
+class SpdxSymbolsTable(NamedTuple):
+    """The SPDX symbols of a column of license expressions."""
 
+    symbols: list[tuple[str, ...]]
+    """The sorted symbols of each expression, aligned with the column."""
 
-class ContextUpdater(ContextHook):  # pylint: disable=abstract-method
-    # Pylint tells that parse method need to be overriden, but is our case
-    # it is not necessary.
-    """Modify the Copier context with additional computed values.
+    rows: dict[str, list[int]]
+    """The rows of the column using each symbol, in increasing order."""
 
-    This method updates the context with various derived attributes based on
-    the provided input context. It includes attributes like `latest_python`,
-    `project_slug`, `package_name`, `target_python`, `tox_python_list`, and
-    license-related information.
+    counts: Counter[str]
+    """The number of rows using each symbol."""
+
+
+def spdx_symbols_many(expressions: Iterable[str]) -> SpdxSymbolsTable:
+    """Extract the SPDX symbols of a column of license expressions.
+
+    The column is factorized into its distinct expressions, each of which is
+    parsed once by `spdx_symbols`, whatever its number of occurrences. Any
+    iterable of strings is accepted, such as a list or a NumPy or pandas
+    column. As with `spdx_symbols`, an invalid expression raises a parse
+    error.
 
     Arguments:
-        context: A dictionary representing the current context of the project,
-            containing values like `project_name`, `target_python_version`,
-            `code_license_id`, and `resources_license_id`.
+        expressions: The license expressions, one per row.
 
     Returns:
-        A dictionary containing the updated context values, including modified
-        project settings and license information.
+        The symbols of each row, the rows using each symbol, and the number
+        of rows using each symbol.
     """
+    codes: dict[str, int] = {}
+    column = [
+        codes.setdefault(expression, len(codes)) for expression in expressions
+    ]
+    unique_symbols = [
+        tuple(sorted(spdx_symbols(expression))) for expression in codes
+    ]
+    rows: defaultdict[str, list[int]] = defaultdict(list)
+    for row, code in enumerate(column):
+        for symbol in unique_symbols[code]:
+            rows[symbol].append(row)
 
-    @staticmethod
-    def _hook(context: dict[str, Any]) -> dict[str, Any]:
-        latest_python = LATEST_PYTHON
-        target_python_minor = context["target_python_version"][3:]
-
-        context["latest_python"] = latest_python
-        context["project_slug"] = slugify(context["project_name"])
-        context["package_name"] = context["project_slug"].replace("-", "_")
-        context["target_python"] = f"3.{target_python_minor}"
-        context["tox_python_list"] = (
-            "py{"
-            + ",".join(
-                f"3{python_minor}"
-                for python_minor in range(
-                    int(target_python_minor),
-                    latest_python + 1,
-                )
-            )
-            + "}"
-        )
-        code_license_symbols = list(spdx_symbols(context["code_license_id"]))
-        context["code_license_symbols"] = list(code_license_symbols)
-        context["resources_license_symbols"] = list(
-            spdx_symbols(context["resources_license_id"])
+    return SpdxSymbolsTable(
+        [unique_symbols[code] for code in column],
+        dict(rows),
+        Counter({
+            symbol: len(symbol_rows) for symbol, symbol_rows in rows.items()
+        }),
+    )
+
+
+@lru_cache
+def _project_names(project_name: str) -> tuple[str, str]:
+    project_slug = slugify(project_name)
+    return project_slug, project_slug.replace("-", "_")
+
+
+def _python_versions(
+    target_python_version: str,
+    latest_python_version: str | None,
+) -> tuple[int, str, str, tuple[str, ...], str, str]:
+    target_python_minor = python_minor(target_python_version)
+    latest_python = latest_python_minor(latest_python_version)
+    matrix = python_matrix(target_python_minor, latest_python)
+    return (
+        latest_python,
+        f"3.{target_python_minor}",
+        matrix.tox_envlist,
+        matrix.classifiers,
+        matrix.ci_matrix,
+        matrix.nox_python_list,
+    )
+
+
+@lru_cache
+def _code_license(
+    code_license_id: str | None,
+) -> tuple[tuple[str, ...], str | None, str | None]:
+    # The license is unset while Copier is still prompting.
+    if not isinstance(code_license_id, str):
+        return (), None, None
+
+    code_license_text_ext, code_license_text = render_links(
+        code_license_id,
+        (SPDX_LINK, LOCAL_LINK),
+    )
+    return (
+        tuple(sorted(spdx_symbols(code_license_id))),
+        code_license_text_ext,
+        code_license_text,
+    )
+
+
+@lru_cache
+def _resources_license(
+    resources_license_id: str | None,
+) -> tuple[tuple[str, ...]]:
+    if not isinstance(resources_license_id, str):
+        return ((),)
+
+    return (tuple(sorted(spdx_symbols(resources_license_id))),)
+
+
+class Stage(NamedTuple):
+    """A group of derived values computed from the same input values."""
+
+    name: str
+    """Name of the stage."""
+
+    inputs: tuple[str, ...]
+    """Context keys of the input values."""
+
+    outputs: tuple[str, ...]
+    """Context keys of the derived values."""
+
+    derive: Callable[..., tuple[Any, ...]]
+    """Compute the derived values, in order, from the input values."""
+
+    options: tuple[str, ...] = ()
+    """Context keys of optional input values, defaulting when missing."""
+
+
+STAGES: Final = (
+    Stage(
+        "project",
+        ("project_name",),
+        ("project_slug", "package_name"),
+        _project_names,
+    ),
+    Stage(
+        "python",
+        ("target_python_version",),
+        (
+            "latest_python",
+            "target_python",
+            "tox_python_list",
+            "python_classifiers",
+            "python_ci_matrix",
+            "nox_python_list",
+        ),
+        _python_versions,
+        (LATEST_PYTHON_KEY,),
+    ),
+    Stage(
+        "code_license",
+        ("code_license_id",),
+        ("code_license_symbols", "code_license_text_ext", "code_license_text"),
+        _code_license,
+    ),
+    Stage(
+        "resources_license",
+        ("resources_license_id",),
+        ("resources_license_symbols",),
+        _resources_license,
+    ),
+)
+"""Stages deriving the context values, with the input keys they depend on."""
+
+
+def derive_stage(stage: Stage, inputs: tuple[Any, ...]) -> tuple[Any, ...]:
+    """Compute the derived values of a stage.
+
+    Arguments:
+        stage: The stage to compute.
+        inputs: The input values of the stage.
+
+    Returns:
+        The derived values of the stage, in order.
+    """
+    return stage.derive(*inputs)
+
+
+INPUT_KEYS: Final = tuple(
+    dict.fromkeys(key for stage in STAGES for key in stage.inputs)
+)
+"""Context keys of the input values of all the stages."""
+
+
+class MissingContextKeysError(KeyError):
+    """A Copier context is missing input values.
+
+    Arguments:
+        keys: The missing context keys.
+    """
+
+    def __init__(self, keys: tuple[str, ...]) -> None:
+        """Instantiate a MissingContextKeysError."""
+        self.keys = keys
+        super().__init__(f"Missing context keys: {', '.join(keys)}.")
+
+
+def missing_keys(context: Mapping[str, Any]) -> tuple[str, ...]:
+    """List the input values missing from a context.
+
+    Arguments:
+        context: A Copier context.
+
+    Returns:
+        The missing keys of `INPUT_KEYS`, in order.
+    """
+    return tuple(key for key in INPUT_KEYS if key not in context)
+
+
+def option_defaults() -> dict[str, Any]:
+    """Resolve the defaults of the optional input values.
+
+    The defaults are read from the environment, such as the latest Python
+    version from `WHITEPRINTS_TEMPLATE_CONTEXT_LATEST_PYTHON`, and passed to
+    the stages as explicit inputs: derived values, and their caches, only
+    depend on the stage inputs.
+
+    Returns:
+        The default value of each optional input key.
+    """
+    return {LATEST_PYTHON_KEY: f"3.{latest_python_minor()}"}
+
+
+def _option(
+    context: Mapping[str, Any],
+    defaults: Mapping[str, Any],
+    key: str,
+) -> Any:  # noqa: ANN401
+    value = context.get(key)
+    return defaults.get(key) if value is None else value
+
+
+def read_stage_inputs(
+    context: Mapping[str, Any],
+    *,
+    partial: bool = False,
+    defaults: Mapping[str, Any] | None = None,
+) -> list[tuple[Stage, tuple[Any, ...]]]:
+    """Look up the input values of the stages.
+
+    The context is checked against `INPUT_KEYS` before any value is looked
+    up, so that an incomplete context is rejected at once, with every
+    missing key.
+
+    Arguments:
+        context: A Copier context.
+        partial: Whether to skip the stages with missing input values
+            instead of rejecting the context.
+        defaults: The values of the optional inputs missing from the
+            context, resolved by `option_defaults` if None.
+
+    Returns:
+        Each stage whose input values are all in the context, with these
+        values, in order.
+
+    Raises:
+        MissingContextKeysError: If the context is missing input values and
+            `partial` is False.
+    """
+    missing = missing_keys(context)
+    if missing and not partial:
+        raise MissingContextKeysError(missing)
+
+    defaults = option_defaults() if defaults is None else defaults
+    return [
+        (
+            stage,
+            (
+                *(context[key] for key in stage.inputs),
+                *(_option(context, defaults, key) for key in stage.options),
+            ),
         )
-        context["code_license_text_ext"] = context["code_license_id"]
-        for symbol in code_license_symbols:
-            context["code_license_text_ext"] = context[
-                "code_license_text_ext"
-            ].replace(
-                symbol, f"[{symbol}](https://spdx.org/licenses/{symbol})"
-            )
-
-        context["code_license_text"] = context["code_license_id"]
-        for symbol in code_license_symbols:
-            context["code_license_text"] = context[
-                "code_license_text"
-            ].replace(symbol, f"[{symbol}](../LICENSES/{symbol}.txt)")
+        for stage in STAGES
+        if not missing or set(stage.inputs).isdisjoint(missing)
+    ]
+
+
+class DerivedContext(NamedTuple):
+    """The values derived from a Copier context.
+
+    Being a named tuple, it is immutable, hashable as long as its values
+    are, and stored without an instance dictionary. Sequences are tuples,
+    license symbols being sorted so that the values are reproducible.
+    The values of a stage whose inputs are missing from the context are
+    None.
+    """
+
+    project_slug: str | None = None
+    package_name: str | None = None
+    latest_python: int | None = None
+    target_python: str | None = None
+    tox_python_list: str | None = None
+    python_classifiers: tuple[str, ...] | None = None
+    python_ci_matrix: str | None = None
+    nox_python_list: str | None = None
+    code_license_symbols: tuple[str, ...] | None = None
+    code_license_text_ext: str | None = None
+    code_license_text: str | None = None
+    resources_license_symbols: tuple[str, ...] | None = None
 
+    @classmethod
+    def from_stages(
+        cls,
+        stage_outputs: Iterable[tuple[Stage, tuple[Any, ...]]],
+    ) -> DerivedContext:
+        """Collect the derived values of some stages.
+
+        Arguments:
+            stage_outputs: Stages with their derived values, in order.
+
+        Returns:
+            The derived context.
+        """
+        return cls(**{
+            key: value
+            for stage, outputs in stage_outputs
+            for key, value in zip(stage.outputs, outputs)
+        })
+
+    def merge_into(self, context: dict[str, Any]) -> dict[str, Any]:
+        """Add the derived values to a Copier context, in a single update.
+
+        Arguments:
+            context: The Copier context to update in place.
+
+        Returns:
+            The updated context.
+        """
+        context.update(
+            (key, value)
+            for key, value in zip(self._fields, self)
+            if value is not None
+        )
         return context
 
-    @override
-    def hook(self, context: dict[str, Any]) -> dict[str, Any]:
-        try:
-            return self._hook(context)
-        except KeyError:
-            return {}
+
+DERIVED_CACHE_SIZE: Final = 1024
+"""Number of derived contexts memoized by `update_contexts`."""
+
+
+def derive_context(
+    context: Mapping[str, Any],
+    derive: Callable[[Stage, tuple[Any, ...]], tuple[Any, ...]] = derive_stage,
+    *,
+    partial: bool = False,
+    defaults: Mapping[str, Any] | None = None,
+) -> DerivedContext:
+    """Derive the values of a Copier context.
+
+    Derived values only depend on `project_name`, `target_python_version`,
+    `code_license_id` and `resources_license_id`; they are memoized on those
+    inputs so that contexts sharing an input share the computation. The
+    inputs are checked before any value is derived.
+
+    Arguments:
+        context: A Copier context.
+        derive: Compute the derived values of a stage from its inputs.
+        partial: Whether to derive the values whose inputs are in the
+            context, instead of rejecting an incomplete context.
+        defaults: The values of the optional inputs missing from the
+            context, resolved by `option_defaults` if None.
+
+    Returns:
+        The derived context.
+    """
+    return DerivedContext.from_stages(
+        (stage, derive(stage, inputs))
+        for stage, inputs in read_stage_inputs(
+            context, partial=partial, defaults=defaults
+        )
+    )
+
+
+def update_context(
+    context: dict[str, Any],
+    derive: Callable[[Stage, tuple[Any, ...]], tuple[Any, ...]] = derive_stage,
+    *,
+    partial: bool = False,
+    defaults: Mapping[str, Any] | None = None,
+) -> dict[str, Any]:
+    """Add the derived values to a Copier context.
+
+    See `derive_context` for the arguments.
+
+    Returns:
+        The updated context.
+    """
+    return derive_context(
+        context, derive, partial=partial, defaults=defaults
+    ).merge_into(context)
+
+
+@lru_cache(maxsize=DERIVED_CACHE_SIZE)
+def _derive_inputs(inputs: tuple[tuple[Any, ...], ...]) -> DerivedContext:
+    return DerivedContext.from_stages(
+        (stage, derive_stage(stage, stage_inputs))
+        for stage, stage_inputs in zip(STAGES, inputs)
+    )
+
+
+def _update_context_or_empty(
+    context: dict[str, Any],
+    defaults: Mapping[str, Any],
+) -> dict[str, Any]:
+    try:
+        stage_inputs = read_stage_inputs(context, defaults=defaults)
+    except MissingContextKeysError:
+        return {}
+
+    derived = _derive_inputs(tuple(inputs for _, inputs in stage_inputs))
+    return derived.merge_into(context)
+
+
+def update_contexts(
+    contexts: Iterable[dict[str, Any]],
+) -> Iterator[dict[str, Any]]:
+    """Add the derived values to many Copier contexts.
+
+    This is the batch counterpart of `ContextUpdater.hook`: contexts are
+    consumed lazily and yielded one at a time, without instantiating a
+    Jinja environment. Slugs, tox lists and license values are shared
+    between contexts with an identical input, and the whole derived
+    context between contexts with identical inputs.
+
+    Arguments:
+        contexts: An iterable of Copier contexts, each updated in place.
+
+    Returns:
+        An iterator over the updated contexts in input order, yielding an
+        empty dictionary for a context missing one of the input values.
+    """
+    defaults = option_defaults()
+    return (
+        _update_context_or_empty(context, defaults) for context in contexts
+    )
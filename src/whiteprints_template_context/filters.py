@@ -5,12 +5,70 @@
 
 from __future__ import annotations
 
-from jinja2 import Environment
+import atexit
+import functools
+import os
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from operator import itemgetter
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Final, TypeVar, cast
+
 from jinja2.ext import Extension
-from license_expression import (  # type: ignore [reportMissingTypeStubs]
-    ExpressionInfo,
-    get_spdx_licensing,
+
+from whiteprints_template_context.cache import memoize
+from whiteprints_template_context.canonical import canonical_expression
+from whiteprints_template_context.compact_licensing import (
+    CompactExpressionInfo,
+    get_compact_licensing,
 )
+from whiteprints_template_context.context import spdx_symbols
+from whiteprints_template_context.license_links import (
+    LOCAL_LINK,
+    SPDX_LINK,
+    render_links,
+)
+from whiteprints_template_context.licensing import get_licensing, parse_errors
+
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, MutableMapping
+
+    from jinja2 import Environment, Template
+    from license_expression import (  # type: ignore [reportMissingTypeStubs]
+        ExpressionInfo,
+    )
+
+
+if sys.version_info >= (3, 10):
+    from typing import ParamSpec
+else:
+    from typing_extensions import ParamSpec
+
+if sys.version_info >= (3, 12):
+    from typing import override
+else:
+    from typing_extensions import override
+
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+
+SPDX_CACHE_SIZE: Final = 1024
+"""Default number of license expressions memoized by `is_spdx_expression`."""
+
+PROFILE_VARIABLE: Final = "WHITEPRINTS_TEMPLATE_CONTEXT_PROFILE"
+"""Environment variable naming the file `WhiteprintsProfiler` reports to.
+
+The report is written when the process exits; `-` writes it to the standard
+error.
+"""
+
+PROFILE_KINDS: Final = ("template", "filter", "test")
+"""Kinds of profiled renderings."""
 
 
 class LicenseExpressionError(ValueError):
@@ -25,7 +83,10 @@ class LicenseExpressionError(ValueError):
             the SPDX license expression.
     """
 
-    def __init__(self, expression_info: ExpressionInfo | None = None) -> None:
+    def __init__(
+        self,
+        expression_info: ExpressionInfo | CompactExpressionInfo | None = None,
+    ) -> None:
         """Instantiate a LicenseExpressionError."""
         error_message = (
             "Invalid license expression. See https://spdx.org/licenses."
@@ -39,12 +100,26 @@ def __init__(self, expression_info: ExpressionInfo | None = None) -> None:
         super().__init__(error_message)
 
 
+def _validate(value: str) -> ExpressionInfo:
+    licensing = get_licensing()
+    try:
+        return licensing.validate(  # type: ignore [reportGeneralTypeIssues]
+            value
+        )
+    except AttributeError as expression_parse_error:
+        raise LicenseExpressionError from expression_parse_error
+
+
+@memoize(maxsize=SPDX_CACHE_SIZE, negative=(LicenseExpressionError,))
 def is_spdx_expression(value: str) -> bool:
     """Check if a given string is a valid SPDX license expression.
 
     This function validates a provided license expression string against
     the SPDX license standard. If the expression is valid, it returns True.
-    If the expression is invalid, it raises a LicenseExpressionError.
+    If the expression is invalid, it raises a LicenseExpressionError. Both
+    outcomes are memoized; see `cache_info` for the cache statistics. The
+    compact licensing backend is used if selected, see
+    `whiteprints_template_context.compact_licensing`.
 
     Args:
         value: The license expression string to validate.
@@ -56,13 +131,11 @@ def is_spdx_expression(value: str) -> bool:
         LicenseExpressionError: If the expression is invalid or if there is an
             error during the parsing process.
     """
-    licensing = get_spdx_licensing()
-    try:
-        info = licensing.validate(  # type: ignore [reportGeneralTypeIssues]
-            value
-        )
-    except AttributeError as expression_parse_error:
-        raise LicenseExpressionError from expression_parse_error
+    compact_licensing = get_compact_licensing()
+    if compact_licensing is not None:
+        info = compact_licensing.validate(value)
+    else:
+        info = _validate(value)
 
     if info.errors:  # type: ignore [reportGeneralTypeIssues]
         raise LicenseExpressionError(info)
@@ -70,11 +143,111 @@ def is_spdx_expression(value: str) -> bool:
     return True
 
 
+def sorted_spdx_symbols(expression: str) -> tuple[str, ...]:
+    """Extract the license symbols of an SPDX expression, in order.
+
+    The symbols are memoized by `spdx_symbols`; sorting the few symbols of
+    an expression is cheaper than a second cache lookup.
+
+    Arguments:
+        expression: An SPDX license expression.
+
+    Returns:
+        The SPDX keys of the licenses and exceptions, sorted.
+    """
+    return tuple(sorted(spdx_symbols(expression)))
+
+
+@memoize(maxsize=SPDX_CACHE_SIZE, negative=parse_errors)
+def spdx_normalize(expression: str) -> str:
+    """Normalize an SPDX license expression.
+
+    Symbols are replaced by their SPDX key, operators are upper-cased, and
+    spacing and parentheses are reduced to the minimum.
+
+    Arguments:
+        expression: An SPDX license expression.
+
+    Returns:
+        The normalized expression.
+    """
+    return str(
+        get_licensing().parse(  # type: ignore [reportUnknownMemberType]
+            expression, validate=True
+        )
+    )
+
+
+def spdx_canonical(expression: str) -> str:
+    """Normalize an SPDX license expression to its canonical form.
+
+    Contrary to `spdx_normalize`, the operands of `AND` and `OR` are also
+    sorted, so that equivalent expressions have the same rendering.
+
+    Arguments:
+        expression: An SPDX license expression.
+
+    Returns:
+        The normalized canonical expression.
+    """
+    return spdx_normalize(canonical_expression(expression))
+
+
+def spdx_link(expression: str, link_format: str = SPDX_LINK) -> str:
+    """Render a license expression with links to the SPDX license pages.
+
+    Arguments:
+        expression: An SPDX license expression.
+        link_format: The link format, with a `{symbol}` field.
+
+    Returns:
+        The expression, each symbol replaced by its link.
+    """
+    (rendering,) = render_links(expression, (link_format,))
+    return rendering
+
+
+def spdx_local_link(expression: str) -> str:
+    """Render a license expression with links to the `LICENSES` directory.
+
+    Arguments:
+        expression: An SPDX license expression.
+
+    Returns:
+        The expression, each symbol replaced by its link.
+    """
+    return spdx_link(expression, LOCAL_LINK)
+
+
+# Jinja types the filters and tests with its untyped defaults.
+def _environment_filters(
+    environment: Environment,
+) -> MutableMapping[str, Callable[..., object]]:
+    return cast(
+        "MutableMapping[str, Callable[..., object]]",
+        environment.filters,  # type: ignore [reportUnknownMemberType]
+    )
+
+
+def _environment_tests(
+    environment: Environment,
+) -> MutableMapping[str, Callable[..., object]]:
+    return cast(
+        "MutableMapping[str, Callable[..., object]]",
+        environment.tests,  # type: ignore [reportUnknownMemberType]
+    )
+
+
 class WhiteprintsFilters(Extension):  # pylint: disable=abstract-method
     # Pylint tells that parse method need to be overriden, but is our case
     # it is not necessary.
     """Jinja2 extension for adding custom filters.
 
+    The `spdx_symbols`, `spdx_link`, `spdx_local_link`, `spdx_normalize`
+    and `spdx_canonical` filters share the memoized parser of
+    `ContextUpdater`, so templates do not need to manipulate license
+    expressions in Jinja loops.
+
     Args:
         environment (Environment): The Jinja2 environment to which the filter
             is added.
@@ -83,4 +256,185 @@ class WhiteprintsFilters(Extension):  # pylint: disable=abstract-method
     def __init__(self, environment: Environment) -> None:
         """Instantiate a WhiteprintsFilters."""
         super().__init__(environment)
-        environment.tests["spdx_expression"] = is_spdx_expression
+        _environment_tests(environment)["spdx_expression"] = is_spdx_expression
+        _environment_filters(environment).update({
+            "spdx_symbols": sorted_spdx_symbols,
+            "spdx_link": spdx_link,
+            "spdx_local_link": spdx_local_link,
+            "spdx_normalize": spdx_normalize,
+            "spdx_canonical": spdx_canonical,
+        })
+
+
+class RenderProfile:
+    """Accumulate the call count and wall time of templates, filters and tests.
+
+    Template times include the filters and tests they call.
+    """
+
+    def __init__(self) -> None:
+        """Instantiate an empty RenderProfile."""
+        self.calls: Counter[tuple[str, str]] = Counter()
+        self.seconds: defaultdict[tuple[str, str], float] = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def record(self, kind: str, name: str, seconds: float) -> None:
+        """Record a rendering.
+
+        Arguments:
+            kind: One of `PROFILE_KINDS`.
+            name: The name of the template, filter or test.
+            seconds: The wall time of the rendering.
+        """
+        with self._lock:
+            self.calls[kind, name] += 1
+            self.seconds[kind, name] += seconds
+
+    def hot(self, kind: str) -> list[tuple[str, int, float]]:
+        """List the renderings of a kind, slowest first.
+
+        Arguments:
+            kind: One of `PROFILE_KINDS`.
+
+        Returns:
+            The name, call count and total wall time of each rendering.
+        """
+        with self._lock:
+            return sorted(
+                (
+                    (name, calls, self.seconds[kind, name])
+                    for (calls_kind, name), calls in self.calls.items()
+                    if calls_kind == kind
+                ),
+                key=itemgetter(2),
+                reverse=True,
+            )
+
+    def report(self) -> str:
+        """Format the profile, slowest renderings first.
+
+        Returns:
+            A plain text report with a section per kind of rendering.
+        """
+        return "".join(
+            f"{kind}s:\n"
+            + "".join(
+                f"{seconds:12.6f}s {calls:8d}  {name}\n"
+                for name, calls, seconds in self.hot(kind)
+            )
+            for kind in PROFILE_KINDS
+        )
+
+
+def _timed(
+    function: Callable[P, R],
+    record: Callable[[float], None],
+) -> Callable[P, R]:
+    @functools.wraps(function, updated=())
+    def timed(*args: P.args, **kwargs: P.kwargs) -> R:
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            record(time.perf_counter() - start)
+
+    # Jinja reads how to call a filter or test from this attribute.
+    pass_arg = getattr(function, "jinja_pass_arg", None)
+    if pass_arg is not None:
+        timed.jinja_pass_arg = pass_arg  # type: ignore [reportAttributeAccessIssue]
+
+    return timed
+
+
+class WhiteprintsProfiler(Extension):  # pylint: disable=abstract-method
+    # Pylint tells that parse method need to be overriden, but is our case
+    # it is not necessary.
+    """Jinja2 extension profiling the renderings.
+
+    Every filter and test of the environment, including the ones registered
+    by extensions loaded afterwards, is wrapped with a timing probe, and the
+    render time of each template is recorded in `profile`. If the
+    `WHITEPRINTS_TEMPLATE_CONTEXT_PROFILE` environment variable is set, a
+    report of the hot templates, filters and tests is written at exit.
+
+    Args:
+        environment (Environment): The Jinja2 environment to profile.
+    """
+
+    def __init__(self, environment: Environment) -> None:
+        """Instantiate a WhiteprintsProfiler."""
+        super().__init__(environment)
+        self.profile = RenderProfile()
+        self._probes: dict[tuple[str, str], Callable[..., object]] = {}
+        self._add_probes()
+        environment.template_class = self._profiled(environment.template_class)
+        destination = os.environ.get(PROFILE_VARIABLE)
+        if destination:
+            atexit.register(self.write_report, destination)
+
+    def _add_probes_to(
+        self,
+        kind: str,
+        functions: MutableMapping[str, Callable[..., object]],
+    ) -> None:
+        for name, function in list(functions.items()):
+            if self._probes.get((kind, name)) is not function:
+                probe = _timed(
+                    function,
+                    functools.partial(self.profile.record, kind, name),
+                )
+                self._probes[kind, name] = functions[name] = probe
+
+    def _add_probes(self) -> None:
+        self._add_probes_to("filter", _environment_filters(self.environment))
+        self._add_probes_to("test", _environment_tests(self.environment))
+
+    def _profiled(self, template_class: type[Template]) -> type[Template]:
+        record = self.profile.record
+
+        class ProfiledTemplate(template_class):  # pylint: disable=too-few-public-methods
+            # The other public methods are inherited from the template class,
+            # which pylint cannot see through a variable base.
+            """A template recording its render time."""
+
+            @override
+            def render(self, *args: Any, **kwargs: Any) -> str:
+                """Render the template, and record its render time.
+
+                Returns:
+                    The rendered template.
+                """
+                start = time.perf_counter()
+                try:
+                    return super().render(*args, **kwargs)
+                finally:
+                    record(
+                        "template",
+                        self.name or "<string>",
+                        time.perf_counter() - start,
+                    )
+
+        return ProfiledTemplate
+
+    @override
+    def preprocess(
+        self,
+        source: str,
+        name: str | None,
+        filename: str | None = None,
+    ) -> str:
+        # Filters and tests registered since are probed before compiling.
+        self._add_probes()
+        return source
+
+    def write_report(self, destination: str) -> None:
+        """Write the profile report.
+
+        Arguments:
+            destination: The report file, `-` for the standard error.
+        """
+        report = self.profile.report()
+        if destination == "-":
+            sys.stderr.write(report)
+        else:
+            Path(destination).write_text(report, encoding="utf-8")
@@ -0,0 +1,197 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints template context" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: MIT
+
+"""Detect the changes of the derived context between renders.
+
+A `FingerprintStore` keeps, in a JSON file, the derived values of the last
+render and a stable fingerprint of them. Comparing a new derived context to
+the stored one tells whether any derived value changed, and which, so that
+an orchestration can skip the renders that would not change anything:
+
+    store = FingerprintStore(path)
+    changes = store.compare(derive_context(answers), save=False)
+    if not changes.unchanged:
+        ...  # Run Copier.
+
+When the `WHITEPRINTS_TEMPLATE_CONTEXT_FINGERPRINT_FILE` environment
+variable names a file, `ContextUpdater` compares each complete context to
+the one stored there when it was instantiated, stores the new one, and adds
+`derived_context_fingerprint`, `derived_context_unchanged` and
+`derived_context_changed_keys` to the context.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Final, NamedTuple, cast
+
+
+if TYPE_CHECKING:
+    from whiteprints_template_context.context import DerivedContext
+
+
+__all__: Final = [
+    "CHANGED_KEYS_KEY",
+    "FINGERPRINT_KEY",
+    "FINGERPRINT_VARIABLE",
+    "UNCHANGED_KEY",
+    "DerivedChanges",
+    "FingerprintStore",
+    "derived_values",
+    "fingerprint",
+    "store_from_environment",
+]
+"""Public module attributes."""
+
+
+FINGERPRINT_VARIABLE: Final = "WHITEPRINTS_TEMPLATE_CONTEXT_FINGERPRINT_FILE"
+"""Environment variable naming the file storing the derived context."""
+
+FINGERPRINT_KEY: Final = "derived_context_fingerprint"
+"""Context key of the fingerprint of the derived context."""
+
+UNCHANGED_KEY: Final = "derived_context_unchanged"
+"""Context key telling whether the derived context is unchanged."""
+
+CHANGED_KEYS_KEY: Final = "derived_context_changed_keys"
+"""Context key of the keys of the changed derived values."""
+
+
+def derived_values(derived: DerivedContext) -> dict[str, Any]:
+    """Convert a derived context to JSON values.
+
+    Arguments:
+        derived: A derived context.
+
+    Returns:
+        The derived values, sequences as lists, as they are stored.
+    """
+    return json.loads(json.dumps(derived._asdict()))
+
+
+def fingerprint(values: dict[str, Any]) -> str:
+    """Fingerprint derived values.
+
+    Arguments:
+        values: Derived values, as returned by `derived_values`.
+
+    Returns:
+        A hash of the values, independent of the process and of the order
+        of the keys.
+    """
+    payload = json.dumps(values, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class DerivedChanges(NamedTuple):
+    """The changes of a derived context since the stored one."""
+
+    fingerprint: str
+    """The fingerprint of the derived context."""
+
+    unchanged: bool
+    """Whether the derived context is the stored one."""
+
+    changed_keys: tuple[str, ...]
+    """The keys of the derived values different from the stored ones."""
+
+    def context_values(self) -> dict[str, Any]:
+        """Expose the changes as context values.
+
+        Returns:
+            The fingerprint, whether the derived context is unchanged, and
+            the changed keys.
+        """
+        return {
+            FINGERPRINT_KEY: self.fingerprint,
+            UNCHANGED_KEY: self.unchanged,
+            CHANGED_KEYS_KEY: self.changed_keys,
+        }
+
+
+def _load(path: Path) -> dict[str, Any]:
+    try:
+        with path.open(encoding="utf-8") as file:
+            stored: object = json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+    if not isinstance(stored, dict):
+        return {}
+
+    return cast("dict[str, Any]", stored)
+
+
+class FingerprintStore:  # pylint: disable=too-few-public-methods
+    # The store is only compared to; reading and writing the file are
+    # private to the comparison.
+    """A file storing a derived context and its fingerprint.
+
+    The stored derived context is read once, on instantiation, so that
+    every comparison of a render is made against the previous render.
+    Storing is best effort: failing to write the file is not an error.
+
+    Arguments:
+        path: The JSON file storing the derived context.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """Instantiate a FingerprintStore."""
+        self.path = path
+        stored = _load(path)
+        self.stored_fingerprint: str | None = stored.get("fingerprint")
+        self.stored_values: dict[str, Any] = stored.get("values", {})
+        self._saved_fingerprint = self.stored_fingerprint
+
+    def compare(
+        self,
+        derived: DerivedContext,
+        *,
+        save: bool = True,
+    ) -> DerivedChanges:
+        """Compare a derived context to the stored one.
+
+        Arguments:
+            derived: The new derived context.
+            save: Whether to store the new derived context.
+
+        Returns:
+            The fingerprint of the new derived context, and its changes.
+        """
+        values = derived_values(derived)
+        digest = fingerprint(values)
+        changes = DerivedChanges(
+            digest,
+            digest == self.stored_fingerprint,
+            tuple(
+                key
+                for key, value in values.items()
+                if self.stored_values.get(key) != value
+            ),
+        )
+        if save and digest != self._saved_fingerprint:
+            self._save(digest, values)
+
+        return changes
+
+    def _save(self, digest: str, values: dict[str, Any]) -> None:
+        payload = {"fingerprint": digest, "values": values}
+        with contextlib.suppress(OSError):
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text(json.dumps(payload), encoding="utf-8")
+            self._saved_fingerprint = digest
+
+
+def store_from_environment() -> FingerprintStore | None:
+    """Open the store of the `FINGERPRINT_VARIABLE` file.
+
+    Returns:
+        The store, or None if the variable is not set.
+    """
+    path = os.environ.get(FINGERPRINT_VARIABLE)
+    return FingerprintStore(Path(path)) if path else None
@@ -0,0 +1,147 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints template context" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: MIT
+"""Copier context hook."""
+
+from __future__ import annotations
+
+import sys
+from collections import Counter
+from typing import TYPE_CHECKING, Any
+
+from copier_templates_extensions import ContextHook
+
+from whiteprints_template_context.context import (
+    Stage,
+    derive_context,
+    derive_stage,
+    missing_keys,
+    option_defaults,
+)
+from whiteprints_template_context.fingerprint import (
+    DerivedChanges,
+    store_from_environment,
+)
+from whiteprints_template_context.instrumentation import (
+    instrument,
+    sink_from_context,
+    sink_from_environment,
+)
+from whiteprints_template_context.persistent_cache import (
+    cache_from_environment,
+)
+
+
+if TYPE_CHECKING:
+    from jinja2 import Environment
+
+if sys.version_info >= (3, 12):
+    from typing import override
+else:
+    from typing_extensions import override
+
+
+class ContextUpdater(ContextHook):  # pylint: disable=abstract-method,too-many-instance-attributes
+    # Pylint tells that parse method need to be overriden, but is our case
+    # it is not necessary. The attributes are the hook settings, resolved
+    # once on instantiation, and the statistics and state of the renders.
+    """Modify the Copier context with additional computed values.
+
+    This method updates the context with various derived attributes based on
+    the provided input context. It includes attributes like `latest_python`,
+    `project_slug`, `package_name`, `target_python`, `tox_python_list`, and
+    license-related information.
+
+    Copier calls the hook for every rendered file, with nearly identical
+    contexts. In incremental mode, a stage is only recomputed when one of
+    its input values changed since the previous call; `computed_stages` and
+    `skipped_stages` count, per stage name, the work done and skipped.
+
+    Per-stage timings are recorded when instrumentation is enabled, either
+    by the `WHITEPRINTS_TEMPLATE_CONTEXT_INSTRUMENTATION` environment
+    variable, read on instantiation, or by the `whiteprints_instrumentation`
+    context value (see `whiteprints_template_context.instrumentation`).
+
+    A context missing input values, as while Copier is still prompting, is
+    not rejected: the values whose inputs are known are derived, and
+    `missing_keys` lists the input keys missing from the last context.
+
+    The defaults of the optional input values, such as the latest Python
+    version set by the `WHITEPRINTS_TEMPLATE_CONTEXT_LATEST_PYTHON`
+    environment variable, are resolved once, on instantiation, and passed
+    to the stages as explicit inputs (see `option_defaults`).
+
+    When the `WHITEPRINTS_TEMPLATE_CONTEXT_CACHE_DIRECTORY` environment
+    variable is set on instantiation, derived values are also looked up in,
+    and stored to, a persistent cache shared between processes (see
+    `whiteprints_template_context.persistent_cache`).
+
+    When the `WHITEPRINTS_TEMPLATE_CONTEXT_FINGERPRINT_FILE` environment
+    variable is set on instantiation, each complete derived context is
+    compared to the one stored in that file by the previous render, and
+    stored in turn; `changes` tells whether it is unchanged and which keys
+    changed, and is added to the context (see
+    `whiteprints_template_context.fingerprint`).
+
+    Arguments:
+        context: A dictionary representing the current context of the project,
+            containing values like `project_name`, `target_python_version`,
+            `code_license_id`, and `resources_license_id`.
+
+    Returns:
+        A dictionary containing the updated context values, including modified
+        project settings and license information.
+    """
+
+    incremental: bool = True
+    """Whether to reuse the derived values of the previous call."""
+
+    def __init__(self, environment: Environment) -> None:
+        """Instantiate a ContextUpdater."""
+        super().__init__(environment)
+        self.computed_stages: Counter[str] = Counter()
+        self.skipped_stages: Counter[str] = Counter()
+        self._previous: dict[str, tuple[tuple[Any, ...], tuple[Any, ...]]] = {}
+        self.sink = sink_from_environment()
+        self.defaults = option_defaults()
+        self.missing_keys: tuple[str, ...] = ()
+        persistent_cache = cache_from_environment()
+        self._derive = (
+            derive_stage
+            if persistent_cache is None
+            else persistent_cache.derive
+        )
+        self.fingerprint_store = store_from_environment()
+        self.changes: DerivedChanges | None = None
+
+    def _derive_stage(
+        self,
+        stage: Stage,
+        inputs: tuple[Any, ...],
+    ) -> tuple[Any, ...]:
+        previous = self._previous.get(stage.name)
+        if self.incremental and previous is not None and previous[0] == inputs:
+            self.skipped_stages[stage.name] += 1
+            return previous[1]
+
+        outputs = self._derive(stage, inputs)
+        self._previous[stage.name] = (inputs, outputs)
+        self.computed_stages[stage.name] += 1
+        return outputs
+
+    @override
+    def hook(self, context: dict[str, Any]) -> dict[str, Any]:
+        self.missing_keys = missing_keys(context)
+        derive = self._derive_stage
+        sink = sink_from_context(context, self.sink)
+        if sink is not None:
+            derive = instrument(derive, sink)
+
+        derived = derive_context(
+            context, derive, partial=True, defaults=self.defaults
+        )
+        if self.fingerprint_store is not None and not self.missing_keys:
+            self.changes = self.fingerprint_store.compare(derived)
+            context.update(self.changes.context_values())
+
+        return derived.merge_into(context)
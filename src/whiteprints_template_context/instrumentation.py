@@ -0,0 +1,288 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints template context" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: MIT
+
+"""Opt-in timings of the context derivation stages.
+
+Instrumentation is enabled by the
+`WHITEPRINTS_TEMPLATE_CONTEXT_INSTRUMENTATION` environment variable, or by
+the `whiteprints_instrumentation` context value, which takes precedence.
+The setting names the sink receiving the timings:
+
+- `log`: the `whiteprints_template_context.instrumentation` logger;
+- `stats`: the in-process `STAGE_STATS` object;
+- any other value: a JSON lines file at that path.
+
+An empty setting, `0` or `false`, and a `None` or `False` context value,
+disable instrumentation. The `1` and `true` settings, which name no sink,
+and context values other than strings are rejected. When disabled, stages
+are derived without any wrapper.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import Counter, defaultdict
+from functools import cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Final, NamedTuple, Protocol
+
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Mapping
+
+    from whiteprints_template_context.context import Stage
+
+
+__all__: Final = [
+    "INSTRUMENTATION_KEY",
+    "INSTRUMENTATION_VARIABLE",
+    "STAGE_STATS",
+    "JsonLinesSink",
+    "LoggingSink",
+    "Sink",
+    "StageStats",
+    "Timing",
+    "instrument",
+    "sink_from_context",
+    "sink_from_environment",
+    "sink_from_setting",
+]
+"""Public module attributes."""
+
+
+INSTRUMENTATION_VARIABLE: Final = (
+    "WHITEPRINTS_TEMPLATE_CONTEXT_INSTRUMENTATION"
+)
+"""Environment variable naming the default sink of the timings."""
+
+INSTRUMENTATION_KEY: Final = "whiteprints_instrumentation"
+"""Context value naming the sink of the timings, overriding the variable."""
+
+
+class Timing(NamedTuple):
+    """The wall time of one derivation stage."""
+
+    stage: str
+    """Name of the stage."""
+
+    outputs: tuple[str, ...]
+    """Context keys derived by the stage."""
+
+    seconds: float
+    """Wall time of the stage, in seconds."""
+
+
+class Sink(Protocol):  # pylint: disable=too-few-public-methods
+    # A sink is any object with a record method.
+    """Receiver of the stage timings."""
+
+    def record(self, timing: Timing) -> None:
+        """Record the timing of a stage."""
+
+
+class LoggingSink:  # pylint: disable=too-few-public-methods
+    # Sinks only implement the single method of the Sink protocol.
+    """Log each timing."""
+
+    def __init__(
+        self,
+        logger: logging.Logger,
+        level: int = logging.INFO,
+    ) -> None:
+        """Instantiate a LoggingSink.
+
+        Arguments:
+            logger: The logger to write to.
+            level: The level of the records.
+        """
+        self.logger = logger
+        self.level = level
+
+    def record(self, timing: Timing) -> None:
+        """Log the timing of a stage."""
+        self.logger.log(
+            self.level,
+            "stage %s (%s) took %.6fs",
+            timing.stage,
+            ", ".join(timing.outputs),
+            timing.seconds,
+        )
+
+
+class JsonLinesSink:  # pylint: disable=too-few-public-methods
+    # Sinks only implement the single method of the Sink protocol.
+    """Append each timing to a JSON lines file."""
+
+    def __init__(self, path: Path) -> None:
+        """Instantiate a JsonLinesSink.
+
+        Arguments:
+            path: The file to append to, created if needed.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+
+    def record(self, timing: Timing) -> None:
+        """Append the timing of a stage to the file."""
+        line = json.dumps(timing._asdict()) + "\n"
+        with self._lock, self.path.open("a", encoding="utf-8") as file:
+            file.write(line)
+
+
+class StageStats:
+    """Accumulate the call count and wall time of each stage."""
+
+    def __init__(self) -> None:
+        """Instantiate an empty StageStats."""
+        self.calls: Counter[str] = Counter()
+        self.seconds: defaultdict[str, float] = defaultdict(float)
+        self.outputs: dict[str, tuple[str, ...]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, timing: Timing) -> None:
+        """Add the timing of a stage to the statistics."""
+        with self._lock:
+            self.calls[timing.stage] += 1
+            self.seconds[timing.stage] += timing.seconds
+            self.outputs[timing.stage] = timing.outputs
+
+    def as_dict(self) -> dict[str, dict[str, Any]]:
+        """Summarize the statistics.
+
+        Returns:
+            For each stage, its derived keys, call count and total wall time.
+        """
+        with self._lock:
+            return {
+                stage: {
+                    "outputs": list(self.outputs[stage]),
+                    "calls": calls,
+                    "seconds": self.seconds[stage],
+                }
+                for stage, calls in self.calls.items()
+            }
+
+    def clear(self) -> None:
+        """Reset the statistics."""
+        with self._lock:
+            self.calls.clear()
+            self.seconds.clear()
+            self.outputs.clear()
+
+
+STAGE_STATS: Final = StageStats()
+"""Statistics accumulated by the `stats` sink."""
+
+_NAMED_SINKS: Final[Mapping[str, Sink]] = {
+    "log": LoggingSink(logging.getLogger(__name__)),
+    "stats": STAGE_STATS,
+}
+
+_DISABLED: Final = frozenset(("", "0", "false"))
+"""Settings disabling instrumentation, case-folded."""
+
+_UNNAMED: Final = frozenset(("1", "true"))
+"""Settings enabling instrumentation without naming a sink, case-folded."""
+
+
+@cache
+def sink_from_setting(setting: str) -> Sink | None:
+    """Find the sink named by an instrumentation setting.
+
+    Arguments:
+        setting: `log`, `stats`, or the path of a JSON lines file. An empty
+            setting, `0` or `false` disables instrumentation.
+
+    Returns:
+        The sink, or None if instrumentation is disabled.
+
+    Raises:
+        ValueError: If the setting enables instrumentation without naming
+            a sink.
+    """
+    folded = setting.strip().casefold()
+    if folded in _DISABLED:
+        return None
+
+    if folded in _UNNAMED:
+        message = (
+            f"Instrumentation setting {setting!r} names no sink: use 'log',"
+            " 'stats' or the path of a JSON lines file."
+        )
+        raise ValueError(message)
+
+    return _NAMED_SINKS.get(setting) or JsonLinesSink(Path(setting))
+
+
+def sink_from_environment() -> Sink | None:
+    """Find the sink named by `INSTRUMENTATION_VARIABLE`.
+
+    Returns:
+        The sink, or None if instrumentation is disabled.
+    """
+    return sink_from_setting(os.environ.get(INSTRUMENTATION_VARIABLE, ""))
+
+
+def _setting_text(setting: object) -> str:
+    if setting is None or setting is False:
+        return ""
+
+    if not isinstance(setting, str):
+        message = (
+            f"The {INSTRUMENTATION_KEY} value must be a string, not"
+            f" {setting!r}."
+        )
+        raise TypeError(message)
+
+    return setting
+
+
+def sink_from_context(
+    context: Mapping[str, Any],
+    default: Sink | None,
+) -> Sink | None:
+    """Find the sink named by the `INSTRUMENTATION_KEY` value of a context.
+
+    Arguments:
+        context: A Copier context.
+        default: The sink to use if the context has no such value.
+
+    Returns:
+        The sink, or None if instrumentation is disabled, by a `None` or
+        `False` value as by a disabling setting.
+    """
+    if INSTRUMENTATION_KEY not in context:
+        return default
+
+    return sink_from_setting(_setting_text(context[INSTRUMENTATION_KEY]))
+
+
+def instrument(
+    derive: Callable[[Stage, tuple[Any, ...]], tuple[Any, ...]],
+    sink: Sink,
+) -> Callable[[Stage, tuple[Any, ...]], tuple[Any, ...]]:
+    """Time a stage derivation function.
+
+    Arguments:
+        derive: Compute the derived values of a stage from its inputs, as
+            `update_context` expects.
+        sink: The receiver of the timings.
+
+    Returns:
+        A derivation function recording the wall time of each stage.
+    """
+
+    def instrumented(stage: Stage, inputs: tuple[Any, ...]) -> tuple[Any, ...]:
+        start = time.perf_counter()
+        outputs = derive(stage, inputs)
+        sink.record(
+            Timing(stage.name, stage.outputs, time.perf_counter() - start)
+        )
+        return outputs
+
+    return instrumented
@@ -0,0 +1,132 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints template context" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: MIT
+
+"""Render SPDX license expressions with links to their licenses."""
+
+from __future__ import annotations
+
+import re
+from typing import TYPE_CHECKING, Final, Protocol, cast
+
+from whiteprints_template_context.cache import memoize
+from whiteprints_template_context.compact_licensing import (
+    get_compact_licensing,
+)
+from whiteprints_template_context.licensing import get_licensing, parse_errors
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+
+__all__: Final = [
+    "LINK_CACHE_SIZE",
+    "LOCAL_LINK",
+    "SPDX_LINK",
+    "render_links",
+]
+"""Public module attributes."""
+
+
+SPDX_LINK: Final = "[{symbol}](https://spdx.org/licenses/{symbol})"
+"""Markdown link to the SPDX page of a license."""
+
+LOCAL_LINK: Final = "[{symbol}](../LICENSES/{symbol}.txt)"
+"""Markdown link to the license text in the `LICENSES` directory."""
+
+LINK_CACHE_SIZE: Final = 1024
+"""Number of renderings memoized by `render_links`."""
+
+_WITH: Final = re.compile(r"(\s+with\s+)", re.IGNORECASE)
+"""The `WITH` operator, as it separates a license from its exception."""
+
+Segment = tuple[str, "str | None"]
+"""A piece of expression text, and the symbol it names if any."""
+
+
+class _Symbol(Protocol):  # pylint: disable=too-few-public-methods
+    # A symbol is only read for its key.
+    """A license or exception symbol of `license_expression`."""
+
+    key: str
+    """The SPDX key of the symbol."""
+
+
+class _SymbolWithException(Protocol):
+    """A license symbol with an exception, of `license_expression`."""
+
+    license_symbol: _Symbol
+    """The license."""
+
+    exception_symbol: _Symbol
+    """The exception."""
+
+
+def _token_segments(token: object, text: str) -> Iterator[Segment]:
+    # pylint: disable-next=import-outside-toplevel
+    from license_expression import (  # noqa: PLC0415  # type: ignore [reportMissingTypeStubs]
+        LicenseSymbol,
+        LicenseWithExceptionSymbol,
+    )
+
+    if isinstance(token, LicenseWithExceptionSymbol):
+        symbol = cast("_SymbolWithException", token)
+        license_text, operator, exception_text = _WITH.split(text, maxsplit=1)
+        yield license_text, symbol.license_symbol.key
+        yield operator, None
+        yield exception_text, symbol.exception_symbol.key
+    elif isinstance(token, LicenseSymbol):
+        yield text, cast("_Symbol", token).key
+    else:
+        yield text, None
+
+
+def _segments(expression: str) -> Iterator[Segment]:
+    compact_licensing = get_compact_licensing()
+    if compact_licensing is not None:
+        yield from compact_licensing.segments(expression)
+        return
+
+    tokens = cast(
+        "Iterable[tuple[object, str, int]]",
+        get_licensing().tokenize(  # type: ignore [reportUnknownMemberType]
+            expression
+        ),
+    )
+    end = 0
+    for token, text, position in tokens:
+        yield expression[end:position], None
+        yield from _token_segments(token, text)
+        end = position + len(text)
+
+    yield expression[end:], None
+
+
+@memoize(maxsize=LINK_CACHE_SIZE, negative=parse_errors)
+def render_links(
+    expression: str, link_formats: tuple[str, ...]
+) -> tuple[str, ...]:
+    """Render a license expression with links to its licenses.
+
+    The expression is tokenized once and every symbol is replaced by its
+    link in each format, while operators, parentheses and spacing are kept
+    as written. Symbols are linked by their SPDX key, so an alias such as
+    `GPL-2.0` links to `GPL-2.0-only`.
+
+    Arguments:
+        expression: An SPDX license expression.
+        link_formats: Link formats, each with a `{symbol}` field, such as
+            `SPDX_LINK` or `LOCAL_LINK`.
+
+    Returns:
+        The renderings of the expression, in the order of `link_formats`.
+    """
+    segments = list(_segments(expression))
+    return tuple(
+        "".join(
+            text if symbol is None else link_format.format(symbol=symbol)
+            for text, symbol in segments
+        )
+        for link_format in link_formats
+    )
@@ -0,0 +1,169 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints template context" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: MIT
+
+"""Shared SPDX licensing index.
+
+`license_expression` is only imported when the index is first needed.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import os
+import pickle  # nosec B403
+import tempfile
+from functools import cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Final
+
+
+if TYPE_CHECKING:
+    from license_expression import (  # type: ignore [reportMissingTypeStubs]
+        Licensing,
+    )
+
+
+__all__: Final = [
+    "SNAPSHOT_DIRECTORY_VARIABLE",
+    "get_licensing",
+    "license_list_version",
+    "load_snapshot",
+    "parse_errors",
+    "save_snapshot",
+    "snapshot_path",
+]
+"""Public module attributes."""
+
+
+SNAPSHOT_DIRECTORY_VARIABLE: Final = (
+    "WHITEPRINTS_TEMPLATE_CONTEXT_LICENSING_SNAPSHOT"
+)
+"""Environment variable naming the directory of the licensing snapshots."""
+
+
+def parse_errors() -> tuple[type[Exception], ...]:
+    """Exceptions raised by `license_expression` on invalid expressions.
+
+    Returns:
+        The exception types, imported on demand.
+    """
+    # pylint: disable-next=import-outside-toplevel
+    from license_expression import (  # noqa: PLC0415  # type: ignore [reportMissingTypeStubs]
+        ExpressionError,
+    )
+
+    return (ExpressionError,)
+
+
+def license_list_version() -> str:
+    """Version of the SPDX license list bundled with `license_expression`.
+
+    Returns:
+        The version of the `license-expression` distribution, which ships the
+        license list.
+    """
+    # pylint: disable-next=import-outside-toplevel
+    from importlib import metadata  # noqa: PLC0415
+
+    return metadata.version("license-expression")
+
+
+def snapshot_path(directory: Path) -> Path:
+    """Path of the licensing snapshot for the current license list.
+
+    Arguments:
+        directory: The directory containing the snapshots.
+
+    Returns:
+        The snapshot path, keyed by the license list version.
+    """
+    return directory / f"spdx-licensing-{license_list_version()}.pickle"
+
+
+def load_snapshot(path: Path) -> Licensing | None:
+    """Load a licensing snapshot.
+
+    Arguments:
+        path: The snapshot to load.
+
+    Returns:
+        The licensing object, or None if the snapshot is missing, truncated,
+        or written by other versions of the dependencies.
+    """
+    # pylint: disable-next=import-outside-toplevel
+    from license_expression import (  # noqa: PLC0415  # type: ignore [reportMissingTypeStubs]
+        Licensing,
+    )
+
+    try:
+        with path.open("rb") as snapshot:
+            licensing = pickle.load(snapshot)  # nosec B301
+    except (
+        OSError,
+        EOFError,
+        AttributeError,
+        ImportError,
+        IndexError,
+        ValueError,
+        pickle.UnpicklingError,
+    ):
+        return None
+
+    return licensing if isinstance(licensing, Licensing) else None
+
+
+def save_snapshot(licensing: Licensing, path: Path) -> None:
+    """Atomically save a licensing snapshot.
+
+    The temporary file is removed if the snapshot cannot be written.
+
+    Arguments:
+        licensing: The licensing object to save.
+        path: The snapshot destination.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(
+        dir=path.parent,
+        prefix=f".{path.name}.",
+        delete=False,
+    ) as snapshot:
+        temporary = Path(snapshot.name)
+        try:
+            pickle.dump(licensing, snapshot, protocol=pickle.HIGHEST_PROTOCOL)
+            snapshot.close()
+            temporary.replace(path)
+        finally:
+            temporary.unlink(missing_ok=True)
+
+
+@cache
+def get_licensing() -> Licensing:
+    """Process-wide SPDX licensing object.
+
+    The licensing object is built on first use. If the
+    `WHITEPRINTS_TEMPLATE_CONTEXT_LICENSING_SNAPSHOT` environment variable
+    names a directory, the object is loaded from a snapshot stored there,
+    and the snapshot is written if it does not exist yet (failing to write
+    it is not an error).
+
+    Returns:
+        The SPDX licensing object.
+    """
+    # pylint: disable-next=import-outside-toplevel
+    from license_expression import (  # noqa: PLC0415  # type: ignore [reportMissingTypeStubs]
+        get_spdx_licensing,
+    )
+
+    directory = os.environ.get(SNAPSHOT_DIRECTORY_VARIABLE)
+    if not directory:
+        return get_spdx_licensing()
+
+    path = snapshot_path(Path(directory))
+    licensing = load_snapshot(path)
+    if licensing is None:
+        licensing = get_spdx_licensing()
+        with contextlib.suppress(OSError, pickle.PicklingError):
+            save_snapshot(licensing, path)
+
+    return licensing
@@ -2,26 +2,115 @@
 #
 # SPDX-License-Identifier: MIT
 
-"""Localization."""
+"""Localization.
+
+Catalogs are loaded on the first translation and cached per locale, so that
+a long-running process can switch locales without reading them again.
+"""
+
+from __future__ import annotations
 
 import gettext
 import pathlib
-from typing import Final
+from collections.abc import Generator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import TYPE_CHECKING, Final
+
 
+if TYPE_CHECKING:
+    TRANSLATION: gettext.NullTranslations
+    """The Gettext translation of the environment locale."""
 
-__all__: Final = ["LOCALE_DIRECTORY", "TRANSLATION", "_"]
+
+__all__: Final = [
+    "LOCALE_DIRECTORY",
+    "TRANSLATION",
+    "TRANSLATION_CACHE_SIZE",
+    "_",
+    "get_translation",
+    "use_locale",
+]
 """Public module attributes."""
 
 
 LOCALE_DIRECTORY: Final = pathlib.Path(__file__).parent / "locale"
 """Path to the directory containing the locales."""
 
-TRANSLATION: Final = gettext.translation(
-    "messages",
-    LOCALE_DIRECTORY,
-    fallback=True,
+TRANSLATION_CACHE_SIZE: Final = 16
+"""Maximum number of locales whose translation is kept in memory."""
+
+_LANGUAGES: Final[ContextVar[tuple[str, ...] | None]] = ContextVar(
+    "languages",
+    default=None,
 )
-"""A Gettext translation."""
+"""Languages of the current context, None for the environment locale."""
+
+
+@lru_cache(maxsize=TRANSLATION_CACHE_SIZE)
+def get_translation(
+    languages: tuple[str, ...] | None = None,
+) -> gettext.NullTranslations:
+    """Load the Gettext translation of some languages.
+
+    Arguments:
+        languages: The languages to look up, in order of preference. If None,
+            the languages are read from the environment, as Gettext does.
+
+    Returns:
+        The translation, falling back to the untranslated messages if no
+        catalog is found.
+    """
+    return gettext.translation(
+        "messages",
+        LOCALE_DIRECTORY,
+        languages=languages,
+        fallback=True,
+    )
+
+
+def _(message: str) -> str:
+    """Translate a message in the languages of the current context.
+
+    Returns:
+        The translated message.
+    """
+    return get_translation(_LANGUAGES.get()).gettext(message)
+
+
+@contextmanager
+def use_locale(*languages: str) -> Generator[None, None, None]:
+    """Translate messages in some languages within a context.
+
+    The languages are bound to the current thread or asynchronous task, so
+    concurrent requests can use different locales.
+
+    Arguments:
+        languages: The languages to use, in order of preference. Without
+            languages, the environment locale is used.
+
+    Yields:
+        Nothing, translations use the languages until the context exits.
+    """
+    token = _LANGUAGES.set(languages or None)
+    try:
+        yield
+    finally:
+        _LANGUAGES.reset(token)
+
+
+def __getattr__(name: str) -> object:
+    """Load the translation of the environment locale on first access.
+
+    Returns:
+        The requested module attribute.
+
+    Raises:
+        AttributeError: If the module has no such attribute.
+    """
+    if name == "TRANSLATION":
+        return get_translation()
 
-_: Final = TRANSLATION.gettext
-"""Convenient access to Gettext's translation."""
+    message = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(message)
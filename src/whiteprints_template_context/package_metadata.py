@@ -2,10 +2,33 @@
 #
 # SPDX-License-Identifier: MIT
 
-"""Discover the package's version number."""
+"""Discover the package's version number.
 
-from importlib import metadata
-from typing import Final
+The attributes are read from the distribution metadata on first access and
+then cached as module attributes.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from functools import cache
+from typing import TYPE_CHECKING, Final
+
+
+if TYPE_CHECKING:
+    from importlib.metadata import Distribution, PackageMetadata, PackagePath
+
+    __version__: str
+    """The package version number as found by importlib metadata."""
+
+    __metadata__: PackageMetadata
+    """The package metadata."""
+
+    __license__: str
+    """The package code license as found by importlib metadata."""
+
+    __license_file__: list[PackagePath]
+    """A list containing the path to the license(s) of the package code."""
 
 
 __all__: Final = [
@@ -16,19 +39,54 @@
 ]
 """Public module attributes."""
 
-__version__: Final = metadata.version(__package__ or "")
-"""The package version number as found by importlib metadata."""
 
-__metadata__: Final = metadata.metadata(__package__ or "")
-"""The package metadata."""
+@cache
+def _distribution() -> Distribution:
+    # pylint: disable-next=import-outside-toplevel
+    from importlib import metadata  # noqa: PLC0415
 
-__license__: Final = metadata.metadata(__package__ or "")["License-Expression"]
-"""The package code license as found by importlib metadata."""
+    return metadata.distribution(__package__ or "")
 
-__license_file__: Final = [
-    license_path
-    for license_path in (metadata.files(__package__ or "") or [])
-    for license_file in (__metadata__.get_all("License-File") or [])
-    if license_path.match(license_file)
-]
-"""A list containing the path to the license(s) of the package code."""
+
+@cache
+def _metadata() -> PackageMetadata:
+    # `Distribution.metadata` parses the metadata file on every access.
+    return _distribution().metadata
+
+
+def _license_file() -> list[PackagePath]:
+    license_files = _metadata().get_all("License-File") or []
+    return [
+        license_path
+        for license_path in _distribution().files or []
+        if any(
+            license_path.match(license_file) for license_file in license_files
+        )
+    ]
+
+
+_LAZY_ATTRIBUTES: Final[dict[str, Callable[[], object]]] = {
+    "__version__": lambda: _metadata()["Version"],
+    "__metadata__": _metadata,
+    "__license__": lambda: _metadata()["License-Expression"],
+    "__license_file__": _license_file,
+}
+
+
+def __getattr__(name: str) -> object:
+    """Read a metadata attribute on first access.
+
+    Returns:
+        The requested module attribute.
+
+    Raises:
+        AttributeError: If the module has no such attribute.
+    """
+    try:
+        attribute = _LAZY_ATTRIBUTES[name]
+    except KeyError:
+        message = f"module {__name__!r} has no attribute {name!r}"
+        raise AttributeError(message) from None
+
+    value = globals()[name] = attribute()
+    return value
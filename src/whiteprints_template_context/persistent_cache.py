@@ -0,0 +1,354 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints template context" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: MIT
+
+"""Persistent cache of the derived context values.
+
+When the `WHITEPRINTS_TEMPLATE_CONTEXT_CACHE_DIRECTORY` environment variable
+names a directory, `ContextUpdater` stores the derived values of each stage
+in an SQLite database there. Entries are keyed by a fingerprint of the stage
+inputs, the package version, the SPDX license list version and the
+licensing backend, so that a process deriving values already in the cache
+neither builds the licensing table nor imports `license_expression`.
+
+The cache is best effort: a database error falls back to deriving values.
+A forked child reopens the connections of the caches it inherits, as SQLite
+connections must not be shared across processes.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+import weakref
+from functools import cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Final, NamedTuple, cast
+
+from whiteprints_template_context.compact_licensing import (
+    COMPACT_BACKEND,
+    compact_backend_selected,
+)
+from whiteprints_template_context.context import derive_stage
+from whiteprints_template_context.licensing import license_list_version
+
+
+if TYPE_CHECKING:
+    from whiteprints_template_context.context import Stage
+
+if sys.version_info >= (3, 11):
+    from typing import Self
+else:
+    from typing_extensions import Self
+
+
+__all__: Final = [
+    "CACHE_DIRECTORY_VARIABLE",
+    "CACHE_FILE_NAME",
+    "DEFAULT_MAX_ENTRIES",
+    "PersistentCache",
+    "PersistentCacheInfo",
+    "cache_from_environment",
+    "open_cache",
+    "read_cache_info",
+    "stage_fingerprint",
+]
+"""Public module attributes."""
+
+
+CACHE_DIRECTORY_VARIABLE: Final = (
+    "WHITEPRINTS_TEMPLATE_CONTEXT_CACHE_DIRECTORY"
+)
+"""Environment variable naming the directory of the persistent cache."""
+
+CACHE_FILE_NAME: Final = "derived-context.sqlite3"
+"""Name of the cache database in the cache directory."""
+
+DEFAULT_MAX_ENTRIES: Final = 4096
+"""Default number of entries kept, the least recently used are evicted."""
+
+_SCHEMA: Final = """
+CREATE TABLE IF NOT EXISTS derived (
+    key TEXT PRIMARY KEY,
+    outputs TEXT NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS derived_accessed ON derived (accessed);
+"""
+
+
+@cache
+def _versions() -> tuple[str, str]:
+    # pylint: disable-next=import-outside-toplevel
+    from whiteprints_template_context.package_metadata import (  # noqa: PLC0415
+        __version__,
+    )
+
+    return __version__, license_list_version()
+
+
+def stage_fingerprint(stage: Stage, inputs: tuple[Any, ...]) -> str:
+    """Fingerprint the inputs of a stage.
+
+    The input values must be JSON serializable, as Copier answers are. The
+    defaults of the optional inputs, such as the latest Python version, are
+    part of the inputs (see `context.option_defaults`).
+
+    Arguments:
+        stage: A derivation stage.
+        inputs: The input values of the stage.
+
+    Returns:
+        A hash of the stage name, its input values, the package version,
+        the SPDX license list version and the selected licensing backend.
+    """
+    backend = COMPACT_BACKEND if compact_backend_selected() else None
+    payload = json.dumps([*_versions(), backend, stage.name, inputs])
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _load_outputs(outputs: str) -> tuple[Any, ...]:
+    # JSON turns the derived tuples into lists.
+    values: list[Any] = json.loads(outputs)
+    return tuple(
+        tuple(cast("list[Any]", value)) if isinstance(value, list) else value
+        for value in values
+    )
+
+
+class PersistentCacheInfo(NamedTuple):
+    """Statistics of a persistent cache."""
+
+    path: str
+    """Path of the cache database."""
+
+    entries: int
+    """Number of cached stage outputs."""
+
+    max_entries: int
+    """Number of entries kept."""
+
+    size: int
+    """Size of the database, in bytes."""
+
+
+def _info(
+    connection: sqlite3.Connection,
+    path: Path,
+    max_entries: int,
+) -> PersistentCacheInfo:
+    entries: tuple[int] = connection.execute(
+        "SELECT COUNT(*) FROM derived"
+    ).fetchone()
+    return PersistentCacheInfo(
+        str(path), entries[0], max_entries, path.stat().st_size
+    )
+
+
+def read_cache_info(
+    path: Path,
+    max_entries: int = DEFAULT_MAX_ENTRIES,
+) -> PersistentCacheInfo:
+    """Report the statistics of a cache database without modifying it.
+
+    Unlike `PersistentCache.info`, the database is opened read-only and is
+    not created if it is missing.
+
+    Arguments:
+        path: The cache database.
+        max_entries: Number of entries kept by the cache.
+
+    Returns:
+        The path, number of entries, and size of the cache; a missing
+        database is reported empty.
+    """
+    if not path.is_file():
+        return PersistentCacheInfo(str(path), 0, max_entries, 0)
+
+    connection = sqlite3.connect(
+        f"{path.resolve().as_uri()}?mode=ro", uri=True
+    )
+    try:
+        return _info(connection, path, max_entries)
+    finally:
+        connection.close()
+
+
+class PersistentCache:
+    """An SQLite cache of the derived values of the stages.
+
+    Arguments:
+        path: The cache database, created if needed.
+        max_entries: Number of entries kept; the least recently used entries
+            are evicted beyond it.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ) -> None:
+        """Instantiate a PersistentCache."""
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.executescript(_SCHEMA)
+
+        _CACHES.add(self)
+
+    def reset_connection(self) -> None:
+        """Reopen the database, in a forked child.
+
+        The connection inherited from the parent is dropped without being
+        closed, as closing it could disturb the parent's transactions.
+        """
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+
+    def get(self, key: str) -> tuple[Any, ...] | None:
+        """Look up the derived values of a stage.
+
+        Arguments:
+            key: The fingerprint of the stage inputs.
+
+        Returns:
+            The derived values, or None if they are not cached.
+        """
+        with self._lock, self._connection:
+            row: tuple[str] | None = self._connection.execute(
+                "SELECT outputs FROM derived WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            self._connection.execute(
+                "UPDATE derived SET accessed = ? WHERE key = ?",
+                (time.time(), key),
+            )
+
+        return _load_outputs(row[0])
+
+    def put(self, key: str, outputs: tuple[Any, ...]) -> None:
+        """Store the derived values of a stage.
+
+        Arguments:
+            key: The fingerprint of the stage inputs.
+            outputs: The derived values.
+        """
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO derived VALUES (?, ?, ?)",
+                (key, json.dumps(outputs), time.time()),
+            )
+            self._connection.execute(
+                "DELETE FROM derived WHERE key IN (SELECT key FROM derived"
+                " ORDER BY accessed DESC, rowid DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def derive(self, stage: Stage, inputs: tuple[Any, ...]) -> tuple[Any, ...]:
+        """Compute the derived values of a stage, through the cache.
+
+        Arguments:
+            stage: The stage to compute.
+            inputs: The input values of the stage.
+
+        Returns:
+            The derived values of the stage, in order.
+        """
+        try:
+            key = stage_fingerprint(stage, inputs)
+            outputs = self.get(key)
+        except (TypeError, sqlite3.Error):
+            return derive_stage(stage, inputs)
+
+        if outputs is None:
+            outputs = derive_stage(stage, inputs)
+            with contextlib.suppress(sqlite3.Error):
+                self.put(key, outputs)
+
+        return outputs
+
+    def info(self) -> PersistentCacheInfo:
+        """Report the cache statistics.
+
+        Returns:
+            The path, number of entries, and size of the cache.
+        """
+        with self._lock:
+            return _info(self._connection, self.path, self.max_entries)
+
+    def clear(self) -> None:
+        """Remove every entry and shrink the database."""
+        with self._lock:
+            with self._connection:
+                self._connection.execute("DELETE FROM derived")
+
+            self._connection.execute("VACUUM")
+
+    def close(self) -> None:
+        """Close the database."""
+        _CACHES.discard(self)
+        with self._lock:
+            self._connection.close()
+
+    def __enter__(self) -> Self:
+        """Use the cache in a context, closing it on exit.
+
+        Returns:
+            The cache.
+        """
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Close the cache."""
+        self.close()
+
+
+@cache
+def open_cache(directory: str) -> PersistentCache | None:
+    """Open the cache of a directory, once per process.
+
+    Arguments:
+        directory: The cache directory.
+
+    Returns:
+        The cache, or None if it cannot be opened.
+    """
+    try:
+        return PersistentCache(Path(directory) / CACHE_FILE_NAME)
+    except (OSError, sqlite3.Error):
+        return None
+
+
+_CACHES: Final[weakref.WeakSet[PersistentCache]] = weakref.WeakSet()
+"""Every open cache, to reopen their connections after forking."""
+
+
+def _reset_connections() -> None:
+    for persistent_cache in _CACHES:
+        persistent_cache.reset_connection()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_connections)
+
+
+def cache_from_environment() -> PersistentCache | None:
+    """Open the cache of the `CACHE_DIRECTORY_VARIABLE` directory.
+
+    Returns:
+        The cache, or None if the variable is not set or the cache cannot
+        be opened.
+    """
+    directory = os.environ.get(CACHE_DIRECTORY_VARIABLE)
+    return open_cache(directory) if directory else None
@@ -0,0 +1,159 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints template context" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: MIT
+
+"""Warm up a process before it serves renders.
+
+A worker pays for building the SPDX licensing table, parsing the license
+expressions and loading the translation catalogs on its first render.
+Calling `warmup` in the parent of a pre-fork worker pool pays these costs
+once: the children share the warmed-up memory pages copy-on-write, and
+their first render is as fast as the following ones.
+"""
+
+from __future__ import annotations
+
+import gc
+import time
+from collections.abc import Callable, Iterable
+from functools import partial
+from typing import Any, Final, NamedTuple
+
+from whiteprints_template_context.compact_licensing import (
+    get_compact_licensing,
+)
+from whiteprints_template_context.context import (
+    STAGES,
+    Stage,
+    derive_stage,
+)
+from whiteprints_template_context.filters import (
+    LicenseExpressionError,
+    is_spdx_expression,
+    spdx_canonical,
+)
+from whiteprints_template_context.licensing import get_licensing, parse_errors
+from whiteprints_template_context.loc import get_translation
+
+
+__all__: Final = ["COMMON_EXPRESSIONS", "LICENSE_STAGES", "Warmup", "warmup"]
+"""Public module attributes."""
+
+
+COMMON_EXPRESSIONS: Final = (
+    "MIT",
+    "Apache-2.0",
+    "BSD-3-Clause",
+    "BSD-2-Clause",
+    "ISC",
+    "MPL-2.0",
+    "GPL-3.0-or-later",
+    "LGPL-3.0-or-later",
+    "AGPL-3.0-or-later",
+    "MIT OR Apache-2.0",
+    "CC-BY-4.0",
+    "CC-BY-SA-4.0",
+    "CC0-1.0",
+)
+"""License expressions primed by default."""
+
+LICENSE_STAGES: Final = tuple(
+    stage
+    for stage in STAGES
+    if stage.name in {"code_license", "resources_license"}
+)
+"""Stages deriving values from a single license expression."""
+
+
+class Warmup(NamedTuple):
+    """Summary of a warm-up."""
+
+    expressions: int
+    """Number of license expressions primed."""
+
+    invalid: tuple[str, ...]
+    """The invalid expressions, whose errors are cached."""
+
+    seconds: float
+    """Wall time of the warm-up."""
+
+
+def _derive_license_stage(stage: Stage, expression: str) -> tuple[Any, ...]:
+    return derive_stage(stage, (expression,))
+
+
+def _primers(*, compact: bool) -> list[Callable[[str], object]]:
+    primers: list[Callable[[str], object]] = [is_spdx_expression]
+    if not compact:
+        primers.append(spdx_canonical)
+
+    primers.extend(
+        partial(_derive_license_stage, stage) for stage in LICENSE_STAGES
+    )
+    return primers
+
+
+def _primed(primer: Callable[[str], object], expression: str) -> bool:
+    try:
+        primer(expression)
+    except (LicenseExpressionError, *parse_errors()):
+        return False
+
+    return True
+
+
+def _prime(expression: str, primers: list[Callable[[str], object]]) -> bool:
+    # Each primer runs even if a previous one failed, so that every cache
+    # storing errors holds the error of an invalid expression.
+    failed = [primer for primer in primers if not _primed(primer, expression)]
+    return not failed
+
+
+def warmup(
+    expressions: Iterable[str] = COMMON_EXPRESSIONS,
+    languages: Iterable[tuple[str, ...] | None] = (None,),
+    *,
+    freeze: bool = True,
+) -> Warmup:
+    """Build the licensing table, prime the caches and load the catalogs.
+
+    The caches of the `ContextUpdater` stages and of the
+    `WhiteprintsFilters` filters are primed for each expression; invalid
+    expressions are primed too, so that every cache storing errors holds
+    theirs. With the compact licensing backend, the full licensing table is
+    not built, and the normalization filters, which need it, are not primed.
+
+    It is safe to call before forking: the caches renew their locks in the
+    children. With `freeze`, the objects allocated so far are moved out of
+    the reach of the garbage collector (see `gc.freeze`), so that collecting
+    in a child does not copy the shared pages.
+
+    Arguments:
+        expressions: The license expressions to prime.
+        languages: The languages whose catalogs are loaded, as accepted by
+            `get_translation`; None stands for the environment locale.
+        freeze: Whether to freeze the allocated objects.
+
+    Returns:
+        A summary of the warm-up.
+    """
+    start = time.perf_counter()
+    compact = get_compact_licensing() is not None
+    if not compact:
+        get_licensing()
+
+    expressions = tuple(dict.fromkeys(expressions))
+    primers = _primers(compact=compact)
+    invalid = tuple(
+        expression
+        for expression in expressions
+        if not _prime(expression, primers)
+    )
+    for language in languages:
+        get_translation(language)
+
+    if freeze:
+        gc.collect()
+        gc.freeze()
+
+    return Warmup(len(expressions), invalid, time.perf_counter() - start)
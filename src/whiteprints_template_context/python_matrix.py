@@ -0,0 +1,122 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints template context" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: MIT
+
+"""Derive the supported Python versions in the forms the templates use.
+
+The latest supported version defaults to `LATEST_PYTHON`. It can be set by
+the `WHITEPRINTS_TEMPLATE_CONTEXT_LATEST_PYTHON` environment variable, read
+once per context updater (see `context.option_defaults`), or by the
+`latest_python_version` context value, which takes precedence.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+from functools import lru_cache
+from typing import Final, NamedTuple
+
+
+__all__: Final = [
+    "LATEST_PYTHON",
+    "LATEST_PYTHON_KEY",
+    "LATEST_PYTHON_VARIABLE",
+    "PythonMatrix",
+    "latest_python_minor",
+    "python_matrix",
+    "python_minor",
+]
+"""Public module attributes."""
+
+
+LATEST_PYTHON: Final = 13
+"""Default latest supported minor version of Python 3."""
+
+LATEST_PYTHON_VARIABLE: Final = "WHITEPRINTS_TEMPLATE_CONTEXT_LATEST_PYTHON"
+"""Environment variable setting the latest supported Python version."""
+
+LATEST_PYTHON_KEY: Final = "latest_python_version"
+"""Context value setting the latest supported Python version."""
+
+_PYTHON_VERSION: Final = re.compile(r"(?:py3|3\.)(?P<minor>\d+)")
+"""A Python 3 version, as `py310` or `3.10`."""
+
+
+def python_minor(version: str) -> int:
+    """Parse the minor version of a Python 3 version.
+
+    Arguments:
+        version: A Python 3 version, as `py310` or `3.10`.
+
+    Returns:
+        The minor version.
+
+    Raises:
+        ValueError: If the version is not a Python 3 version.
+    """
+    match = _PYTHON_VERSION.fullmatch(version)
+    if match is None:
+        message = f"Invalid Python 3 version {version!r}."
+        raise ValueError(message)
+
+    return int(match["minor"])
+
+
+def latest_python_minor(version: str | None = None) -> int:
+    """Find the latest supported minor version of Python 3.
+
+    Arguments:
+        version: The latest supported version, as `py313` or `3.13`. If
+            None, it is read from `LATEST_PYTHON_VARIABLE`.
+
+    Returns:
+        The minor version, `LATEST_PYTHON` if no version is set.
+    """
+    version = version or os.environ.get(LATEST_PYTHON_VARIABLE)
+    return python_minor(version) if version else LATEST_PYTHON
+
+
+class PythonMatrix(NamedTuple):
+    """The supported Python versions, in every derived form."""
+
+    versions: tuple[str, ...]
+    """The supported versions, as `3.10`."""
+
+    tox_envlist: str
+    """The tox environments, as `py{310,311}`."""
+
+    classifiers: tuple[str, ...]
+    """The trove classifiers of the supported versions."""
+
+    ci_matrix: str
+    """A JSON CI matrix, as `{"python-version": ["3.10", "3.11"]}`."""
+
+    nox_python_list: str
+    """The versions as a Python list literal, for `nox.session(python=...)`."""
+
+
+@lru_cache
+def python_matrix(target_minor: int, latest_minor: int) -> PythonMatrix:
+    """Derive the supported Python versions between two minor versions.
+
+    Arguments:
+        target_minor: The oldest supported minor version of Python 3.
+        latest_minor: The latest supported minor version of Python 3.
+
+    Returns:
+        The supported versions, in every derived form.
+    """
+    minors = range(target_minor, latest_minor + 1)
+    versions = tuple(f"3.{minor}" for minor in minors)
+    return PythonMatrix(
+        versions=versions,
+        tox_envlist="py{" + ",".join(f"3{minor}" for minor in minors) + "}",
+        classifiers=tuple(
+            f"Programming Language :: Python :: {version}"
+            for version in versions
+        ),
+        ci_matrix=json.dumps({"python-version": versions}),
+        nox_python_list=json.dumps(versions),
+    )
@@ -0,0 +1,278 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints template context" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: MIT
+
+"""Regenerate the derived values stored in Copier answers files.
+
+After upgrading this package, the derived values stored in answers files may
+be stale. `regenerate` derives them again from the answers, as
+`ContextUpdater` does, without running Copier, and writes back only the keys
+whose value changed. The rest of the file, comments included, is kept as
+written.
+
+Files are read lazily, one at a time, and regenerated in order, optionally
+in a pool of worker processes; at most a bounded window of files is in
+flight, so that sweeping a whole fleet runs in constant memory.
+"""
+
+from __future__ import annotations
+
+import re
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import islice, starmap
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Final, NamedTuple, cast
+
+import yaml  # type: ignore [reportMissingTypeStubs]
+
+from whiteprints_template_context.context import DerivedContext, derive_context
+from whiteprints_template_context.licensing import parse_errors
+from whiteprints_template_context.preload import warmup
+
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator, Mapping
+
+
+__all__: Final = [
+    "ANSWERS_FILE_PATTERN",
+    "DEFAULT_CHUNKSIZE",
+    "DERIVED_KEYS",
+    "WINDOW_CHUNKS",
+    "Regeneration",
+    "changed_values",
+    "find_answers_files",
+    "regenerate",
+    "regenerate_file",
+]
+"""Public module attributes."""
+
+
+ANSWERS_FILE_PATTERN: Final = ".copier-answers*.yml"
+"""Pattern of the Copier answers files looked up in directories."""
+
+DERIVED_KEYS: Final = DerivedContext._fields
+"""Keys of the derived values."""
+
+DEFAULT_CHUNKSIZE: Final = 16
+"""Number of files sent to a worker process at once."""
+
+WINDOW_CHUNKS: Final = 4
+"""Number of chunks per worker in flight at once."""
+
+_TOP_LEVEL_KEY: Final = re.compile(r"(?P<key>[A-Za-z_][\w-]*)\s*:(?:\s|$)")
+"""A plain key of the top-level mapping."""
+
+
+class Regeneration(NamedTuple):
+    """The outcome of the regeneration of an answers file."""
+
+    path: str
+    """The answers file."""
+
+    changed: tuple[str, ...]
+    """The derived keys whose value changed."""
+
+    error: str | None = None
+    """Why the file could not be regenerated, if it could not."""
+
+
+def find_answers_files(paths: Iterable[str | Path]) -> Iterator[Path]:
+    """Find the answers files, lazily.
+
+    Arguments:
+        paths: Answers files, or directories searched recursively for files
+            matching `ANSWERS_FILE_PATTERN`.
+
+    Yields:
+        The answers files.
+    """
+    for path in map(Path, paths):
+        if path.is_dir():
+            yield from path.rglob(ANSWERS_FILE_PATTERN)
+        else:
+            yield path
+
+
+def _plain(value: object) -> object:
+    # YAML answers hold lists, the derived context holds tuples.
+    if isinstance(value, tuple):
+        return list(cast("tuple[Any, ...]", value))
+
+    return value
+
+
+def changed_values(
+    answers: Mapping[str, Any],
+    *,
+    add_missing: bool = False,
+) -> dict[str, Any]:
+    """Derive the values of some answers, and compare them to the answers.
+
+    Arguments:
+        answers: The answers of a Copier answers file.
+        add_missing: Whether to include the derived keys missing from the
+            answers, instead of only updating the stored ones.
+
+    Returns:
+        The derived values different from the answers, in the order of
+        `DERIVED_KEYS`.
+    """
+    derived = derive_context(answers, partial=True)
+    return {
+        key: _plain(value)
+        for key, value in zip(DERIVED_KEYS, derived)
+        if value is not None
+        and (add_missing or key in answers)
+        and answers.get(key) != _plain(value)
+    }
+
+
+def _dump(key: str, value: object) -> str:
+    return yaml.safe_dump(
+        {key: value},
+        allow_unicode=True,
+        default_flow_style=False,
+        sort_keys=False,
+    )
+
+
+def _is_continuation(line: str) -> bool:
+    # Block sequences of the top-level mapping are not indented.
+    return line.startswith((" ", "\t", "- ")) or line.rstrip() == "-"
+
+
+def _top_level_key(line: str) -> str:
+    match = _TOP_LEVEL_KEY.match(line)
+    return "" if match is None else match["key"]
+
+
+def _replace_values(text: str, values: Mapping[str, Any]) -> str:
+    pending = dict(values)
+    lines: list[str] = []
+    replacing = False
+    for line in text.splitlines(keepends=True):
+        if not (replacing and _is_continuation(line)):
+            key = _top_level_key(line)
+            replacing = key in pending
+            lines.append(_dump(key, pending.pop(key)) if replacing else line)
+
+    if lines and not lines[-1].endswith("\n"):
+        lines.append("\n")
+
+    lines.extend(starmap(_dump, pending.items()))
+    return "".join(lines)
+
+
+def _write(path: Path, text: str) -> None:
+    with tempfile.NamedTemporaryFile(
+        "w",
+        encoding="utf-8",
+        dir=path.parent,
+        prefix=f".{path.name}.",
+        delete=False,
+    ) as file:
+        file.write(text)
+
+    written = Path(file.name)
+    written.chmod(path.stat().st_mode)
+    written.replace(path)
+
+
+def _load_answers(text: str) -> dict[str, Any]:
+    answers: object = yaml.safe_load(text) or {}
+    if not isinstance(answers, dict):
+        message = "The answers are not a mapping."
+        raise TypeError(message)
+
+    return cast("dict[str, Any]", answers)
+
+
+def regenerate_file(
+    path: Path,
+    *,
+    dry_run: bool = False,
+    add_missing: bool = False,
+) -> Regeneration:
+    """Regenerate the derived values of an answers file.
+
+    Only the lines of the changed keys are rewritten, atomically.
+
+    Arguments:
+        path: The answers file.
+        dry_run: Whether to only report the changed keys, leaving the file
+            untouched.
+        add_missing: Whether to add the derived keys missing from the file.
+
+    Returns:
+        The changed keys, or the error preventing the regeneration.
+    """
+    try:
+        text = path.read_text(encoding="utf-8")
+        values = changed_values(_load_answers(text), add_missing=add_missing)
+        if values and not dry_run:
+            _write(path, _replace_values(text, values))
+    except (
+        OSError,
+        TypeError,
+        ValueError,
+        yaml.YAMLError,
+        *parse_errors(),
+    ) as error:
+        return Regeneration(str(path), (), f"{type(error).__name__}: {error}")
+
+    return Regeneration(str(path), tuple(values))
+
+
+def _batches(items: Iterable[Path], size: int) -> Iterator[list[Path]]:
+    iterator = iter(items)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def _initialize_worker() -> None:
+    # Build the licensing table once per worker, before any file.
+    warmup(freeze=False)
+
+
+def _regenerate_in_pool(
+    regenerate_one: Callable[[Path], Regeneration],
+    paths: Iterable[Path],
+    jobs: int,
+    chunksize: int,
+) -> Iterator[Regeneration]:
+    with ProcessPoolExecutor(jobs, initializer=_initialize_worker) as pool:
+        for batch in _batches(paths, jobs * chunksize * WINDOW_CHUNKS):
+            yield from pool.map(regenerate_one, batch, chunksize=chunksize)
+
+
+def regenerate(
+    paths: Iterable[Path],
+    *,
+    jobs: int = 1,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    dry_run: bool = False,
+    add_missing: bool = False,
+) -> Iterator[Regeneration]:
+    """Regenerate the derived values of many answers files.
+
+    Arguments:
+        paths: The answers files, consumed lazily.
+        jobs: Number of worker processes; with a single job, the files are
+            regenerated in the current process.
+        chunksize: Number of files sent to a worker at once.
+        dry_run: Whether to only report the changed keys.
+        add_missing: Whether to add the derived keys missing from the files.
+
+    Returns:
+        An iterator over the outcome of each file, in order.
+    """
+    regenerate_one = partial(
+        regenerate_file, dry_run=dry_run, add_missing=add_missing
+    )
+    if jobs <= 1:
+        return map(regenerate_one, paths)
+
+    return _regenerate_in_pool(regenerate_one, paths, jobs, chunksize)
@@ -0,0 +1,9 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints template context" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: MIT
+
+"""Benchmark the render hot path.
+
+Under `pytest-xdist`, benchmarks run once as plain tests. Run them without
+it (see the `benchmark` receipts of the justfile) to measure them.
+"""
@@ -0,0 +1,85 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints template context" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: MIT
+
+"""Benchmark the Copier context hook."""
+
+import collections
+from collections.abc import Callable
+from typing import Any, Final
+
+from jinja2 import Environment
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from tests.fixtures.contexts import CONTEXT
+from whiteprints_template_context.context import (
+    ContextUpdater,
+    update_contexts,
+)
+
+
+COLD_ROUNDS: Final = 50
+"""Rounds of the cold benchmarks, each rebuilding the licensing."""
+
+BATCH_ROUNDS: Final = 5
+"""Rounds of the batch benchmarks."""
+
+
+class TestHook:
+    """Benchmark the latency of ContextUpdater.hook."""
+
+    @staticmethod
+    def test_warm(
+        benchmark: BenchmarkFixture, environment: Environment
+    ) -> None:
+        """Benchmark the hook called again with the same inputs."""
+        updater = ContextUpdater(environment)
+        benchmark.group = "hook"
+        benchmark(lambda: updater.hook(dict(CONTEXT)))
+
+    @staticmethod
+    def test_warm_non_incremental(
+        benchmark: BenchmarkFixture,
+        environment: Environment,
+    ) -> None:
+        """Benchmark the hook recomputing every stage from warm caches."""
+        updater = ContextUpdater(environment)
+        updater.incremental = False
+        benchmark.group = "hook"
+        benchmark(lambda: updater.hook(dict(CONTEXT)))
+
+    @staticmethod
+    def test_cold(
+        benchmark: BenchmarkFixture,
+        environment: Environment,
+        cold: Callable[[], None],
+    ) -> None:
+        """Benchmark the first hook call of a process."""
+
+        def setup() -> tuple[
+            tuple[ContextUpdater, dict[str, Any]], dict[str, Any]
+        ]:
+            cold()
+            return (ContextUpdater(environment), dict(CONTEXT)), {}
+
+        benchmark.group = "hook"
+        benchmark.pedantic(  # type: ignore [reportUnknownMemberType]
+            ContextUpdater.hook,
+            setup=setup,
+            rounds=COLD_ROUNDS,
+        )
+
+
+def test_update_contexts_throughput(
+    benchmark: BenchmarkFixture,
+    synthetic_contexts: list[dict[str, Any]],
+) -> None:
+    """Benchmark the batch API on synthetic contexts."""
+    benchmark.group = "update_contexts"
+    benchmark.extra_info["contexts"] = len(  # type: ignore [reportUnknownMemberType]
+        synthetic_contexts
+    )
+    benchmark.pedantic(  # type: ignore [reportUnknownMemberType]
+        lambda: collections.deque(update_contexts(synthetic_contexts), 0),
+        rounds=BATCH_ROUNDS,
+    )
@@ -0,0 +1,67 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints template context" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: MIT
+
+"""Benchmark the public functions of the render hot path."""
+
+from collections.abc import Callable
+from typing import Any, Final
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from whiteprints_template_context.context import (
+    slugify,
+    spdx_symbols,
+    spdx_symbols_many,
+)
+from whiteprints_template_context.filters import is_spdx_expression
+from whiteprints_template_context.license_links import (
+    LOCAL_LINK,
+    SPDX_LINK,
+    render_links,
+)
+
+
+COLD_ROUNDS: Final = 50
+"""Rounds of the cold benchmarks, each rebuilding the licensing."""
+
+EXPRESSION: Final = (
+    "(MIT AND BSD-3-Clause) OR GPL-3.0-or-later WITH GCC-exception-3.1"
+)
+"""A license expression exercising every operator."""
+
+COLUMN: Final = [EXPRESSION, "MIT", "Apache-2.0 OR MIT", "CC-BY-4.0"] * 2500
+"""A column of license expressions, with few distinct values."""
+
+FUNCTIONS: Final[dict[str, tuple[Callable[..., Any], tuple[Any, ...]]]] = {
+    "slugify-ascii": (slugify, ("My Great Project",)),
+    "slugify-unicode": (slugify, ("Café Münsterländer",)),
+    "spdx_symbols": (spdx_symbols, (EXPRESSION,)),
+    "spdx_symbols_many": (spdx_symbols_many, (COLUMN,)),
+    "is_spdx_expression": (is_spdx_expression, (EXPRESSION,)),
+    "render_links": (render_links, (EXPRESSION, (SPDX_LINK, LOCAL_LINK))),
+}
+"""Benchmarked functions, and their arguments."""
+
+
+@pytest.mark.parametrize("name", FUNCTIONS)
+def test_warm(benchmark: BenchmarkFixture, name: str) -> None:
+    """Benchmark a function whose caches are filled."""
+    function, args = FUNCTIONS[name]
+    benchmark.group = f"warm-{name}"
+    benchmark(function, *args)
+
+
+@pytest.mark.parametrize("name", FUNCTIONS)
+def test_cold(
+    benchmark: BenchmarkFixture,
+    cold: Callable[[], None],
+    name: str,
+) -> None:
+    """Benchmark a function whose caches, and licensing, are empty."""
+    function, args = FUNCTIONS[name]
+    benchmark.group = f"cold-{name}"
+    benchmark.pedantic(  # type: ignore [reportUnknownMemberType]
+        function, args=args, setup=cold, rounds=COLD_ROUNDS
+    )
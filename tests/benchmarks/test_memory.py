@@ -0,0 +1,89 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints template context" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: MIT
+
+"""Benchmark the memory footprint of the licensing backends."""
+
+import gc
+import tracemalloc
+from collections.abc import Callable
+from typing import Final
+
+import pytest
+from license_expression import (  # type: ignore [reportMissingTypeStubs]
+    get_license_index,
+    get_spdx_licensing,
+)
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from whiteprints_template_context.compact_licensing import CompactLicensing
+
+
+BUILD_ROUNDS: Final = 5
+"""Rounds of the build benchmarks."""
+
+FOOTPRINT_RATIO: Final = 5
+"""Minimum ratio of the full licensing footprint to the compact one."""
+
+BACKENDS: Final[dict[str, Callable[[], object]]] = {
+    "full": get_spdx_licensing,
+    "compact": lambda: CompactLicensing.from_license_index(
+        get_license_index()
+    ),
+}
+"""Build the licensing of each backend."""
+
+
+def retained_bytes(build: Callable[[], object]) -> int:
+    """Measure the memory retained by a built object.
+
+    Returns:
+        The size of the memory blocks allocated by `build` and still alive
+        while its result is.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        built = build()
+        gc.collect()
+        retained = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+
+    del built
+    return retained
+
+
+@pytest.fixture(name="footprints", scope="module")
+def fixture_footprints() -> dict[str, int]:
+    """Fixture measuring the retained memory of each backend.
+
+    Returns:
+        The retained bytes of each backend.
+    """
+    return {name: retained_bytes(build) for name, build in BACKENDS.items()}
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+def test_build(
+    benchmark: BenchmarkFixture,
+    footprints: dict[str, int],
+    name: str,
+) -> None:
+    """Benchmark building a licensing, reporting its retained memory."""
+    benchmark.group = "licensing-build"
+    benchmark.extra_info["retained_bytes"] = (  # type: ignore [reportUnknownMemberType]
+        footprints[name]
+    )
+    benchmark.pedantic(  # type: ignore [reportUnknownMemberType]
+        BACKENDS[name], rounds=BUILD_ROUNDS
+    )
+
+
+def test_compact_footprint(footprints: dict[str, int]) -> None:
+    """Test that the compact licensing is a fraction of the full one."""
+    assert footprints["compact"] * FOOTPRINT_RATIO < footprints["full"], (
+        f"Compact licensing retains {footprints['compact']} bytes,"
+        f" the full one {footprints['full']}"
+    )
@@ -0,0 +1,104 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints template context" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: MIT
+
+"""Benchmark fixtures."""
+
+import importlib
+import itertools
+import pkgutil
+from collections.abc import Callable
+from functools import cache
+from typing import Any, Final
+
+import pytest
+
+import whiteprints_template_context
+
+
+PROJECT_NAMES: Final = (
+    "Test Project",
+    "Café Münsterländer",
+    "my_tool",
+    "Résumé",
+)
+TARGET_PYTHON_VERSIONS: Final = ("py39", "py310", "py311", "py312")
+LICENSE_IDS: Final = (
+    "MIT",
+    "MIT OR Apache-2.0",
+    "GPL-3.0-or-later WITH GCC-exception-3.1",
+    "(BSD-3-Clause AND CC-BY-4.0) OR MPL-2.0",
+)
+
+
+@cache
+def _cache_clears() -> tuple[Callable[[], None], ...]:
+    modules = [
+        importlib.import_module(module.name)
+        for module in pkgutil.walk_packages(
+            whiteprints_template_context.__path__,
+            prefix=f"{whiteprints_template_context.__name__}.",
+        )
+    ]
+    # Classes are skipped, as their cache_clear is an unbound method.
+    return tuple(
+        dict.fromkeys(
+            value.cache_clear
+            for module in modules
+            for value in vars(module).values()
+            if not isinstance(value, type)
+            and callable(getattr(value, "cache_clear", None))
+        )
+    )
+
+
+def clear_caches() -> None:
+    """Clear every cache of the package, down to the licensing.
+
+    The caches are found in the package modules, as the functions with a
+    `cache_clear` method, so that new caches are cleared as well.
+    """
+    for cache_clear in _cache_clears():
+        cache_clear()
+
+
+@pytest.fixture
+def cold() -> Callable[[], None]:
+    """Fixture clearing the caches, to set up cold benchmark rounds.
+
+    Returns:
+        A function clearing the caches of the render hot path.
+    """
+    return clear_caches
+
+
+@pytest.fixture(params=[100, 10_000], ids=["100", "10k"])
+def synthetic_contexts(request: pytest.FixtureRequest) -> list[dict[str, Any]]:
+    """Fixture generating a batch of contexts with repeated inputs.
+
+    Returns:
+        Contexts cycling through a few names, Python versions and licenses.
+    """
+    inputs = itertools.islice(
+        zip(
+            itertools.cycle(PROJECT_NAMES),
+            itertools.cycle(TARGET_PYTHON_VERSIONS),
+            itertools.cycle(LICENSE_IDS),
+            itertools.cycle(reversed(LICENSE_IDS)),
+        ),
+        request.param,
+    )
+    return [
+        {
+            "project_name": f"{project_name} {index % 97}",
+            "target_python_version": target_python_version,
+            "code_license_id": code_license_id,
+            "resources_license_id": resources_license_id,
+        }
+        for index, (
+            project_name,
+            target_python_version,
+            code_license_id,
+            resources_license_id,
+        ) in enumerate(inputs)
+    ]
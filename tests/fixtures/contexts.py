@@ -0,0 +1,16 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints template context" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: MIT
+
+"""Copier context fixtures."""
+
+from typing import Final
+
+
+CONTEXT: Final = {
+    "target_python_version": "py310",
+    "project_name": "Test Project",
+    "code_license_id": "MIT OR Apache-2.0",
+    "resources_license_id": "CC-BY-4.0",
+}
+"""A complete Copier context."""
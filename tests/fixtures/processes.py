@@ -0,0 +1,28 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints template context" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: MIT
+
+"""Child process helpers."""
+
+import subprocess  # nosec B404
+import sys
+
+
+def run_python(code: str, *args: str) -> str:
+    """Run Python code in a child interpreter.
+
+    Arguments:
+        code: The code to run.
+        args: The command line arguments of the code.
+
+    Returns:
+        The standard output of the child, stripped.
+    """
+    process = subprocess.run(  # nosec B603
+        [sys.executable, "-c", code, *args],
+        capture_output=True,
+        check=True,
+        text=True,
+        timeout=60,
+    )
+    return process.stdout.strip()
@@ -0,0 +1,83 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints template context" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: MIT
+
+"""Test the asynchronous context update."""
+
+import asyncio
+from collections import Counter
+from typing import Any, Final
+
+import pytest
+
+from tests.fixtures.contexts import CONTEXT
+from whiteprints_template_context import asynchronous
+from whiteprints_template_context.asynchronous import (
+    OFFLOADED_STAGES,
+    AsyncContextUpdater,
+)
+from whiteprints_template_context.context import (
+    Stage,
+    derive_stage,
+    update_context,
+)
+
+
+CONCURRENT_RENDERS: Final = 8
+"""Number of contexts updated at once."""
+
+
+class TestAsyncContextUpdater:
+    """Test suite for the AsyncContextUpdater class."""
+
+    @staticmethod
+    def test_matches_synchronous() -> None:
+        """Test that the asynchronous update matches the synchronous one."""
+        updated_context = asyncio.run(
+            AsyncContextUpdater().hook(dict(CONTEXT))
+        )
+        assert updated_context == update_context(dict(CONTEXT)), (
+            "Asynchronous update mismatch"
+        )
+
+    @staticmethod
+    def test_missing_input() -> None:
+        """Test that a context missing an input is not updated."""
+        assert asyncio.run(AsyncContextUpdater().hook({})) == {}, (
+            "Incomplete context updated"
+        )
+
+    @staticmethod
+    def test_coalesced(monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that concurrent requests share the license computations."""
+        derived: Counter[str] = Counter()
+
+        def counting_derive_stage(
+            stage: Stage,
+            inputs: tuple[Any, ...],
+        ) -> tuple[Any, ...]:
+            derived[stage.name] += 1
+            return derive_stage(stage, inputs)
+
+        monkeypatch.setattr(
+            asynchronous, "derive_stage", counting_derive_stage
+        )
+
+        async def render() -> list[dict[str, Any]]:
+            updater = AsyncContextUpdater()
+            await updater.warm_up()
+            return await asyncio.gather(
+                *(
+                    updater.hook(dict(CONTEXT))
+                    for _ in range(CONCURRENT_RENDERS)
+                )
+            )
+
+        updated_contexts = asyncio.run(render())
+        assert all(
+            updated_context == updated_contexts[0]
+            for updated_context in updated_contexts
+        ), "Concurrent updates mismatch"
+        assert all(derived[name] == 1 for name in OFFLOADED_STAGES), (
+            "License computations not shared"
+        )
@@ -0,0 +1,170 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints template context" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: MIT
+
+"""Test the bounded and observable memoization."""
+
+from typing import Final
+
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+
+from whiteprints_template_context.cache import memoize
+
+
+MAXSIZE: Final = 4
+
+
+def square(value: int) -> int:
+    """Square a number, rejecting negative ones.
+
+    Returns:
+        The square of `value`.
+
+    Raises:
+        ValueError: If `value` is negative.
+    """
+    if value < 0:
+        message = "Negative value"
+        raise ValueError(message)
+
+    return value * value
+
+
+class TestMemoize:
+    """Test suite for the memoize decorator."""
+
+    @staticmethod
+    @given(st.lists(st.integers(min_value=0, max_value=8)))
+    def test_results(values: list[int]) -> None:
+        """Test that memoization does not change the results."""
+        memoized = memoize(maxsize=MAXSIZE)(square)
+        assert [memoized(value) for value in values] == [
+            square(value) for value in values
+        ], "Memoized results mismatch"
+
+    @staticmethod
+    @given(st.lists(st.integers(min_value=0, max_value=8)))
+    def test_statistics(values: list[int]) -> None:
+        """Test that every call is either a hit or a miss."""
+        memoized = memoize(maxsize=MAXSIZE)(square)
+        for value in values:
+            memoized(value)
+
+        info = memoized.cache_info()
+        assert info.hits + info.misses == len(values), "Calls not counted"
+        assert info.currsize <= MAXSIZE, "Cache not bounded"
+        assert info.misses - info.currsize == info.evictions, (
+            "Evictions not counted"
+        )
+
+    @staticmethod
+    def test_least_recently_used_eviction() -> None:
+        """Test that the least recently used entry is evicted."""
+        memoized = memoize(maxsize=2)(square)
+        memoized(1)
+        memoized(2)
+        memoized(1)
+        memoized(3)
+        memoized(1)
+        memoized(2)
+        info = memoized.cache_info()
+        assert (info.hits, info.evictions) == (2, 2), "Wrong entry evicted"
+
+    @staticmethod
+    def test_time_to_live() -> None:
+        """Test that expired entries are recomputed."""
+        memoized = memoize(ttl=0)(square)
+        memoized(2)
+        memoized(2)
+        info = memoized.cache_info()
+        assert (info.hits, info.evictions) == (0, 1), "Entry did not expire"
+
+    @staticmethod
+    def test_negative_cache() -> None:
+        """Test that listed exceptions are cached and re-raised."""
+        memoized = memoize(negative=(ValueError,))(square)
+        for _ in range(2):
+            with pytest.raises(ValueError, match="Negative value"):
+                memoized(-1)
+
+        assert memoized.cache_info().negative_hits == 1, "Exception not cached"
+
+    @staticmethod
+    def test_lazy_negative_cache() -> None:
+        """Test that negative exception types can be resolved on demand."""
+        memoized = memoize(negative=lambda: (ValueError,))(square)
+        for _ in range(2):
+            with pytest.raises(ValueError, match="Negative value"):
+                memoized(-1)
+
+        assert memoized.cache_info().negative_hits == 1, "Exception not cached"
+
+    @staticmethod
+    def test_uncached_exception() -> None:
+        """Test that unlisted exceptions are not cached."""
+        memoized = memoize()(square)
+        for _ in range(2):
+            with pytest.raises(ValueError, match="Negative value"):
+                memoized(-1)
+
+        assert memoized.cache_info().currsize == 0, "Exception cached"
+
+    @staticmethod
+    def test_keyword_arguments() -> None:
+        """Test that keyword arguments are part of the cache key."""
+        memoized = memoize()(square)
+        memoized(value=2)
+        memoized(value=2)
+        memoized(2)
+        info = memoized.cache_info()
+        assert (info.hits, info.currsize) == (1, 2), "Keys mismatch"
+
+    @staticmethod
+    def test_key() -> None:
+        """Test that arguments with the same key share an entry."""
+        memoized = memoize(key=abs)(square)
+        memoized(2)
+        memoized(-2)
+        info = memoized.cache_info()
+        assert (info.hits, info.currsize) == (1, 1), "Keys not shared"
+
+    @staticmethod
+    def test_configure() -> None:
+        """Test that shrinking the cache evicts entries."""
+        memoized = memoize(maxsize=None)(square)
+        for value in range(4):
+            memoized(value)
+
+        memoized.cache_configure(maxsize=1, ttl=60)
+        info = memoized.cache_info()
+        assert (info.currsize, info.evictions, info.ttl) == (1, 3, 60), (
+            "Cache not reconfigured"
+        )
+
+    @staticmethod
+    def test_clear() -> None:
+        """Test that clearing the cache resets its statistics."""
+        memoized = memoize()(square)
+        memoized(2)
+        memoized.cache_clear()
+        assert memoized.cache_info() == (0, 0, 0, 0, 128, None, 0), (
+            "Cache not cleared"
+        )
+
+    @staticmethod
+    def test_reset_lock() -> None:
+        """Test that resetting the lock keeps the entries."""
+        memoized = memoize()(square)
+        memoized(2)
+        memoized.reset_lock()
+        assert memoized(2) == square(2), "Result mismatch"
+        assert memoized.cache_info()[:2] == (1, 1), "Entries not kept"
+
+    @staticmethod
+    def test_wraps() -> None:
+        """Test that the memoized function keeps its metadata."""
+        assert memoize()(square).__doc__ == square.__doc__, (
+            "Docstring not preserved"
+        )
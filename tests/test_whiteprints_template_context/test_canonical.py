@@ -0,0 +1,85 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints template context" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: MIT
+
+"""Test the canonical form of SPDX license expressions."""
+
+from random import Random
+
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+
+from whiteprints_template_context.canonical import canonical_expression
+from whiteprints_template_context.context import spdx_symbols
+
+
+LICENSES = st.sampled_from([
+    "MIT",
+    "Apache-2.0",
+    "GPL-3.0-or-later WITH Classpath-exception-2.0",
+    "BSD-3-Clause",
+    "LicenseRef-Proprietary",
+])
+"""License identifiers, with or without an exception."""
+
+
+class TestCanonicalExpression:
+    """Test suite for the canonical_expression function."""
+
+    @staticmethod
+    @given(
+        st.lists(LICENSES, min_size=1, max_size=4),
+        st.sampled_from(["OR", "AND", "or", "and"]),
+        st.randoms(),
+    )
+    def test_commutative(
+        licenses: list[str],
+        operator: str,
+        random: Random,
+    ) -> None:
+        """Test that the order of the operands does not matter."""
+        shuffled = list(licenses)
+        random.shuffle(shuffled)
+        assert canonical_expression(
+            f" {operator} ".join(licenses)
+        ) == canonical_expression(f"  {operator.upper()}  ".join(shuffled)), (
+            "Operand order changes the key"
+        )
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        ("expression", "canonical"),
+        [
+            ("mit OR (Apache-2.0)", "Apache-2.0 OR mit"),
+            ("ISC AND (MIT AND BSD-3-Clause)", "BSD-3-Clause AND ISC AND MIT"),
+            ("(MIT OR ISC) AND Zlib", "(ISC OR MIT) AND Zlib"),
+            ("LicenseRef-Foo or MIT", "LicenseRef-Foo OR MIT"),
+            ("foo OR Foo", "Foo OR foo"),
+            ("MIT  OR", "MIT OR"),
+        ],
+    )
+    def test_forms(expression: str, canonical: str) -> None:
+        """Test the canonical form of expressions."""
+        assert canonical_expression(expression) == canonical, (
+            "Canonical form mismatch"
+        )
+
+    @staticmethod
+    def test_shared_cache_entry() -> None:
+        """Test that equivalent expressions share a cache entry."""
+        result = spdx_symbols("BSD-2-Clause OR 0BSD")
+        hits = spdx_symbols.cache_info().hits
+        assert spdx_symbols("(0BSD)  or  BSD-2-Clause") is result, (
+            "Equivalent expressions parsed twice"
+        )
+        assert spdx_symbols.cache_info().hits == hits + 1, "Hit not counted"
+
+    @staticmethod
+    def test_unknown_identifier_case() -> None:
+        """Test that unknown identifiers are returned as written."""
+        assert spdx_symbols("Foo-Bar") == {"Foo-Bar"}, "Unknown case changed"
+        assert spdx_symbols("foo-bar") == {"foo-bar"}, "Unknown case shared"
+        assert spdx_symbols("mit OR Foo-Bar") == {"MIT", "Foo-Bar"}, (
+            "Known identifier not normalized"
+        )
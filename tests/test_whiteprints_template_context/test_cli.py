@@ -0,0 +1,171 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints template context" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: MIT
+
+"""Test the command line interface."""
+
+import io
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from whiteprints_template_context import cli
+
+
+def validate_after(
+    tmp_path: Path,
+    source: Path,
+) -> tuple[int, dict[str, Any], dict[str, Any]]:
+    """Validate a file, then a file with a valid expression.
+
+    Returns:
+        The exit status, the error record of the file, and the result of
+        the valid expression.
+    """
+    valid = tmp_path / "licenses.txt"
+    valid.write_text("MIT\n", encoding="utf-8")
+    output = tmp_path / "results.jsonl"
+    status = cli.main(["validate", str(source), str(valid), "-o", str(output)])
+    failed, result = map(
+        json.loads, output.read_text(encoding="utf-8").splitlines()
+    )
+    return status, failed, result
+
+
+class TestReadExpressions:
+    """Test suite for the read_expressions function."""
+
+    @staticmethod
+    def test_answers(tmp_path: Path) -> None:
+        """Test that the license keys of an answers file are read."""
+        path = tmp_path / ".copier-answers.yml"
+        path.write_text(
+            "project_name: Test\n"
+            "code_license_id: MIT\n"
+            "resources_license_id: CC-BY-4.0\n",
+            encoding="utf-8",
+        )
+        assert list(cli.read_expressions(str(path))) == [
+            cli.Occurrence(f"{path}:code_license_id", "MIT"),
+            cli.Occurrence(f"{path}:resources_license_id", "CC-BY-4.0"),
+        ], "Answers mismatch"
+
+    @staticmethod
+    def test_pyproject(tmp_path: Path) -> None:
+        """Test that the project license of a pyproject file is read."""
+        path = tmp_path / "pyproject.toml"
+        path.write_text('[project]\nlicense = "MIT"\n', encoding="utf-8")
+        assert list(cli.read_expressions(str(path))) == [
+            cli.Occurrence(f"{path}:project.license", "MIT"),
+        ], "Project license mismatch"
+
+    @staticmethod
+    def test_stdin(monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that the standard input is read line by line."""
+        monkeypatch.setattr("sys.stdin", io.StringIO("MIT\n\n Apache-2.0\n"))
+        assert list(cli.read_expressions(cli.STDIN)) == [
+            cli.Occurrence("<stdin>:1", "MIT"),
+            cli.Occurrence("<stdin>:3", "Apache-2.0"),
+        ], "Standard input mismatch"
+
+
+class TestValidateExpressions:
+    """Test suite for the validate_expressions function."""
+
+    OCCURRENCES = (
+        cli.Occurrence("a:1", "MIT"),
+        cli.Occurrence("a:2", "not-a-license"),
+        cli.Occurrence("b:1", "MIT"),
+    )
+
+    @staticmethod
+    def test_deduplicated() -> None:
+        """Test that identical expressions are validated once."""
+        results = list(
+            cli.validate_expressions(TestValidateExpressions.OCCURRENCES)
+        )
+        assert [
+            (result["expression"], result["valid"], result["sources"])
+            for result in results
+        ] == [
+            ("MIT", True, ["a:1", "b:1"]),
+            ("not-a-license", False, ["a:2"]),
+        ], "Results mismatch"
+        assert results[1]["error"], "Error missing"
+
+    @staticmethod
+    def test_process_pool() -> None:
+        """Test that a process pool gives the in-process results."""
+        assert list(
+            cli.validate_expressions(
+                TestValidateExpressions.OCCURRENCES, jobs=2, chunksize=1
+            )
+        ) == list(
+            cli.validate_expressions(TestValidateExpressions.OCCURRENCES)
+        ), "Process pool results mismatch"
+
+
+class TestMain:
+    """Test suite for the command line entry point."""
+
+    @staticmethod
+    def test_valid(tmp_path: Path) -> None:
+        """Test that valid expressions are written as JSON lines."""
+        source = tmp_path / "licenses.txt"
+        source.write_text("MIT\nApache-2.0\nMIT\n", encoding="utf-8")
+        output = tmp_path / "results.jsonl"
+        status = cli.main(["validate", str(source), "--output", str(output)])
+        assert status == cli.EXIT_VALID, "Valid expressions rejected"
+        assert [
+            json.loads(line)["expression"]
+            for line in output.read_text(encoding="utf-8").splitlines()
+        ] == ["MIT", "Apache-2.0"], "Output mismatch"
+
+    @staticmethod
+    def test_invalid(tmp_path: Path) -> None:
+        """Test that an invalid expression fails the validation."""
+        source = tmp_path / "licenses.txt"
+        source.write_text("MIT\nnot-a-license\n", encoding="utf-8")
+        status = cli.main([
+            "validate",
+            str(source),
+            "--output",
+            str(tmp_path / "results.jsonl"),
+        ])
+        assert status == cli.EXIT_INVALID, "Invalid expression accepted"
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        ("name", "content", "error"),
+        [
+            (".copier-answers.yml", "- not a mapping\n", "TypeError"),
+            (".copier-answers.yml", "key: [unclosed\n", "ParserError"),
+            ("pyproject.toml", "[project\n", "TOMLDecodeError"),
+        ],
+    )
+    def test_unreadable(
+        tmp_path: Path,
+        name: str,
+        content: str,
+        error: str,
+    ) -> None:
+        """Test that an unparsable file is reported, not raised."""
+        source = tmp_path / name
+        source.write_text(content, encoding="utf-8")
+        status, failed, result = validate_after(tmp_path, source)
+        assert status == cli.EXIT_ERROR, "Unparsable file accepted"
+        assert failed["path"] == str(source), "Path mismatch"
+        assert failed["error"].startswith(error), "Error mismatch"
+        assert result["expression"] == "MIT", "Readable file skipped"
+
+    @staticmethod
+    def test_missing(tmp_path: Path) -> None:
+        """Test that a missing file is reported, not raised."""
+        status, failed, result = validate_after(tmp_path, tmp_path / "no")
+        assert status == cli.EXIT_ERROR, "Missing file accepted"
+        assert failed["error"].startswith("FileNotFoundError"), (
+            "Error mismatch"
+        )
+        assert result["expression"] == "MIT", "Readable file skipped"
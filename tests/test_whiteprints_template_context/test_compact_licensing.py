@@ -0,0 +1,158 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints template context" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: MIT
+
+"""Test the compact SPDX licensing backend."""
+
+import asyncio
+from collections.abc import Callable, Iterator
+from typing import Final
+
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+from license_expression import (  # type: ignore [reportMissingTypeStubs]
+    ExpressionError,
+    get_license_index,
+)
+
+from tests.fixtures.benchmarks import clear_caches
+from tests.fixtures.contexts import CONTEXT
+from whiteprints_template_context import context, filters, license_links
+from whiteprints_template_context.asynchronous import AsyncContextUpdater
+from whiteprints_template_context.compact_licensing import (
+    BACKEND_VARIABLE,
+    COMPACT_BACKEND,
+    CompactLicensing,
+    get_compact_licensing,
+)
+from whiteprints_template_context.licensing import get_licensing, parse_errors
+from whiteprints_template_context.preload import Warmup
+
+
+COMPACT_LICENSING: Final = CompactLicensing.from_license_index(
+    get_license_index()
+)
+"""The compact licensing of the bundled license index."""
+
+EXPRESSIONS: Final = st.sampled_from([
+    "MIT",
+    "mit OR apache-2.0",
+    "GPL-2.0+",
+    "(BSD-3-Clause AND CC-BY-4.0) OR MPL-2.0",
+    "GPL-3.0-or-later WITH GCC-exception-3.1",
+    "LicenseRef-Proprietary",
+    "Classpath-exception-2.0",
+    "MIT WITH Apache-2.0",
+    "MIT AND not-a-license",
+    "",
+    "  ",
+    "MIT/Apache",
+    "MIT,ISC",
+])
+"""Valid, invalid, blank and malformed expressions."""
+
+ERROR: Final = "error"
+"""Outcome of a call raising an expression error."""
+
+
+def outcome(function: Callable[[str], object], expression: str) -> object:
+    """Call a function of an expression, telling errors apart.
+
+    Returns:
+        The result of the call, or `ERROR` if it raised an expression error.
+    """
+    try:
+        return function(expression)
+    except (filters.LicenseExpressionError, *parse_errors()):
+        return ERROR
+
+
+@pytest.fixture
+def compact_backend(monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+    """Select the compact licensing backend.
+
+    Yields:
+        Nothing, the compact backend is selected until the test ends.
+    """
+    monkeypatch.setenv(BACKEND_VARIABLE, COMPACT_BACKEND)
+    clear_caches()
+    yield
+    monkeypatch.delenv(BACKEND_VARIABLE)
+    clear_caches()
+
+
+class TestCompactLicensing:
+    """Test suite for the CompactLicensing class."""
+
+    @staticmethod
+    @given(EXPRESSIONS)
+    def test_matches_full_licensing(expression: str) -> None:
+        """Test that the symbols and validity match the full licensing."""
+        assert get_compact_licensing() is None, "Compact backend selected"
+        assert outcome(COMPACT_LICENSING.license_keys, expression) == (
+            outcome(context.spdx_symbols, expression)
+        ), "Symbols mismatch"
+        assert (not COMPACT_LICENSING.validate(expression).errors) == (
+            outcome(filters.is_spdx_expression, expression) is True
+        ), "Validity mismatch"
+
+    @staticmethod
+    def test_lookup() -> None:
+        """Test that identifiers are looked up by key or alias, in any case."""
+        assert [
+            COMPACT_LICENSING.lookup(identifier)
+            for identifier in ("apache-2.0", "GPL-2.0", "zzz", "")
+        ] == ["Apache-2.0", "GPL-2.0-only", None, None], "Lookup mismatch"
+
+    @staticmethod
+    def test_malformed() -> None:
+        """Test that malformed expressions are rejected."""
+        assert COMPACT_LICENSING.validate("MIT OR").errors, "Error missed"
+        with pytest.raises(ExpressionError):
+            COMPACT_LICENSING.license_keys("(MIT")
+
+
+@pytest.mark.usefixtures("compact_backend")
+class TestCompactBackend:
+    """Test suite for the selection of the compact backend."""
+
+    @staticmethod
+    def test_helpers() -> None:
+        """Test that the SPDX helpers use the compact backend."""
+        assert get_compact_licensing() is not None, "Backend not selected"
+        assert context.spdx_symbols("mit or isc") == {"MIT", "ISC"}, (
+            "Symbols mismatch"
+        )
+        assert filters.is_spdx_expression("MIT"), "Validation mismatch"
+        with pytest.raises(filters.LicenseExpressionError):
+            filters.is_spdx_expression("MIT AND not-a-license")
+
+        assert license_links.render_links(
+            "gpl-2.0+", (license_links.SPDX_LINK,)
+        ) == (
+            "[GPL-2.0-or-later](https://spdx.org/licenses/GPL-2.0-or-later)",
+        ), "Links mismatch"
+
+    @staticmethod
+    def test_derived_context() -> None:
+        """Test that the license values are derived by the compact backend."""
+        derived = context.derive_context(CONTEXT)
+        assert derived.code_license_symbols == ("Apache-2.0", "MIT"), (
+            "Code license symbols mismatch"
+        )
+        assert derived.resources_license_symbols == ("CC-BY-4.0",), (
+            "Resources license symbols mismatch"
+        )
+
+    @staticmethod
+    def test_warm_up() -> None:
+        """Test that warming up does not build the full licensing table."""
+
+        async def warm_up() -> Warmup:
+            return await AsyncContextUpdater().warm_up()
+
+        assert not asyncio.run(warm_up()).invalid, "Expressions rejected"
+        assert get_licensing.cache_info().currsize == 0, (
+            "Full licensing table built"
+        )
@@ -5,19 +5,49 @@
 """Test Copier context update."""
 
 import re
+import unicodedata
+from collections import Counter
+from typing import Any, Final
 
+import pytest
 from hypothesis import given
 from hypothesis import strategies as st
 from jinja2 import Environment
+from license_expression import (  # type: ignore [reportMissingTypeStubs]
+    ExpressionError,
+)
 
+from tests.fixtures.contexts import CONTEXT
 from whiteprints_template_context.context import (
     LATEST_PYTHON,
+    STAGES,
     ContextUpdater,
+    DerivedContext,
+    MissingContextKeysError,
+    derive_context,
     slugify,
+    slugify_many,
     spdx_symbols,
+    spdx_symbols_many,
+    update_context,
+    update_contexts,
 )
 
 
+def reference_slugify(value: str, *, allow_unicode: bool = False) -> str:
+    """Slugify as the original, regular expression only, implementation.
+
+    Returns:
+        a slug of `value`.
+    """
+    value = unicodedata.normalize("NFKC" if allow_unicode else "NFKD", value)
+    if not allow_unicode:
+        value = value.encode("ascii", "ignore").decode("ascii")
+
+    value = re.sub(r"[^\w\s-]", "", value.lower())
+    return re.sub(r"[-\s]+", "-", value).strip("-_")
+
+
 class TestSlugify:
     """Test suite for the slugify function."""
 
@@ -28,7 +58,8 @@ class TestSlugify:
         "jalapeño",
         "façade",
     ])
-    TEXT_STRATEGY = st.one_of(st.text(), UNICODE_EXAMPLES)
+    ASCII_STRATEGY = st.text(st.characters(max_codepoint=127))
+    TEXT_STRATEGY = st.one_of(st.text(), ASCII_STRATEGY, UNICODE_EXAMPLES)
 
     @staticmethod
     def test_slugify_empty_string() -> None:
@@ -55,6 +86,31 @@ def test_slugify_ascii(value: str) -> None:
                 "ASCII slug not valid"
             )
 
+    @staticmethod
+    @given(value=TEXT_STRATEGY, allow_unicode=st.booleans())
+    def test_slugify_matches_reference(
+        *,
+        value: str,
+        allow_unicode: bool,
+    ) -> None:
+        """Test that slugify is identical to the reference implementation."""
+        assert slugify(value, allow_unicode=allow_unicode) == (
+            reference_slugify(value, allow_unicode=allow_unicode)
+        ), "Slug differs from the reference implementation"
+
+    @staticmethod
+    @given(values=st.lists(TEXT_STRATEGY), allow_unicode=st.booleans())
+    def test_slugify_many(
+        *,
+        values: list[str],
+        allow_unicode: bool,
+    ) -> None:
+        """Test that slugify_many slugifies each value in order."""
+        assert slugify_many(values, allow_unicode=allow_unicode) == [
+            reference_slugify(value, allow_unicode=allow_unicode)
+            for value in values
+        ], "Bulk slugs mismatch"
+
 
 class TestSpdxSymbols:
     """Test suite for the spdx_symbols function."""
@@ -76,9 +132,9 @@ class TestSpdxSymbols:
     @staticmethod
     @given(MIXED_SPDX_AND_RANDOM)
     def test_spdx_symbols_type(expression: str) -> None:
-        """Test that spdx_symbols returns a set."""
+        """Test that spdx_symbols returns a frozen set."""
         result = spdx_symbols(expression)
-        assert isinstance(result, set), "Result should be a set"
+        assert isinstance(result, frozenset), "Result should be a frozenset"
 
     @staticmethod
     @given(MIXED_SPDX_AND_RANDOM)
@@ -88,6 +144,52 @@ def test_spdx_symbols_elements(expression: str) -> None:
         for symbol in result:
             assert isinstance(symbol, str), "Each symbol should be a string"
 
+    @staticmethod
+    @given(MIXED_SPDX_AND_RANDOM)
+    def test_spdx_symbols_is_cached(expression: str) -> None:
+        """Test that spdx_symbols memoizes its results."""
+        result = spdx_symbols(expression)
+        hits = spdx_symbols.cache_info().hits
+        assert spdx_symbols(expression) is result, "Result not memoized"
+        assert spdx_symbols.cache_info().hits == hits + 1, "Hit not counted"
+
+    @staticmethod
+    def test_spdx_symbols_invalid_is_cached() -> None:
+        """Test that spdx_symbols memoizes parse errors."""
+        negative_hits = spdx_symbols.cache_info().negative_hits
+        for _ in range(2):
+            with pytest.raises(ExpressionError):
+                spdx_symbols("MIT OR")
+
+        assert spdx_symbols.cache_info().negative_hits > negative_hits, (
+            "Parse error not cached"
+        )
+
+
+class TestSpdxSymbolsMany:
+    """Test suite for the spdx_symbols_many function."""
+
+    @staticmethod
+    @given(st.lists(TestSpdxSymbols.SPDX_IDENTIFIERS))
+    def test_aligned(expressions: list[str]) -> None:
+        """Test that the symbols of each row are the ones of spdx_symbols."""
+        table = spdx_symbols_many(expressions)
+        assert table.symbols == [
+            tuple(sorted(spdx_symbols(expression)))
+            for expression in expressions
+        ], "Symbols mismatch"
+        assert table.counts == Counter(
+            symbol for symbols in table.symbols for symbol in symbols
+        ), "Counts mismatch"
+
+    @staticmethod
+    def test_inverted_index() -> None:
+        """Test that each symbol lists the rows using it."""
+        table = spdx_symbols_many(["MIT", "ISC", "MIT OR ISC", "MIT"])
+        assert table.rows == {"MIT": [0, 2, 3], "ISC": [1, 2]}, (
+            "Inverted index mismatch"
+        )
+
 
 class TestContextUpdater:
     """Test suite for the ContextUpdater class."""
@@ -204,3 +306,169 @@ def test_empty_environment(
         updater = ContextUpdater(environment)
         updated_context = updater.hook({})
         assert not updated_context
+
+    @staticmethod
+    def test_partial_context(environment: Environment) -> None:
+        """Test that the values with known inputs are derived."""
+        updater = ContextUpdater(environment)
+        updated_context = updater.hook({"project_name": "Test Project"})
+        assert updated_context["package_name"] == "test_project", (
+            "Known inputs not derived"
+        )
+        assert "code_license_symbols" not in updated_context, (
+            "Unknown inputs derived"
+        )
+        assert updater.missing_keys == (
+            "target_python_version",
+            "code_license_id",
+            "resources_license_id",
+        ), "Missing keys mismatch"
+
+    @staticmethod
+    def test_unset_licenses(environment: Environment) -> None:
+        """Test that unset licenses, as while prompting, have no symbols."""
+        updater = ContextUpdater(environment)
+        updated_context = updater.hook({
+            "target_python_version": "py310",
+            "project_name": "Test Project",
+            "code_license_id": None,
+            "resources_license_id": None,
+        })
+        assert not updated_context["code_license_symbols"], (
+            "Unset code license has symbols"
+        )
+        assert not updated_context["resources_license_symbols"], (
+            "Unset resources license has symbols"
+        )
+        assert updated_context.get("code_license_text") is None, (
+            "Unset code license rendered"
+        )
+
+
+class TestIncrementalContextUpdater:
+    """Test suite for the incremental mode of the ContextUpdater class."""
+
+    STAGE_NAMES: Final = [stage.name for stage in STAGES]
+
+    @staticmethod
+    def test_unchanged_inputs_are_skipped(environment: Environment) -> None:
+        """Test that stages with unchanged inputs are not recomputed."""
+        updater = ContextUpdater(environment)
+        first = updater.hook(dict(CONTEXT))
+        second = updater.hook(dict(CONTEXT))
+        assert first == second, "Incremental update mismatch"
+        assert updater.skipped_stages == Counter(
+            TestIncrementalContextUpdater.STAGE_NAMES
+        ), "Unchanged stages recomputed"
+
+    @staticmethod
+    def test_changed_inputs_are_recomputed(environment: Environment) -> None:
+        """Test that only the stages with changed inputs are recomputed."""
+        updater = ContextUpdater(environment)
+        updater.hook(dict(CONTEXT))
+        updated_context = updater.hook({
+            **CONTEXT,
+            "project_name": "Other Project",
+        })
+        assert updated_context["project_slug"] == "other-project", (
+            "Changed stage not recomputed"
+        )
+        assert updater.computed_stages == Counter([
+            *TestIncrementalContextUpdater.STAGE_NAMES,
+            "project",
+        ]), "Unchanged stages recomputed"
+
+    @staticmethod
+    def test_non_incremental(environment: Environment) -> None:
+        """Test that every stage is recomputed when not incremental."""
+        updater = ContextUpdater(environment)
+        updater.incremental = False
+        updater.hook(dict(CONTEXT))
+        updater.hook(dict(CONTEXT))
+        assert not updater.skipped_stages, "Stages skipped"
+
+
+class TestDerivedContext:
+    """Test suite for the DerivedContext class."""
+
+    @staticmethod
+    def test_fields_match_stages() -> None:
+        """Test that the fields are the outputs of the stages, in order."""
+        assert DerivedContext._fields == tuple(
+            key for stage in STAGES for key in stage.outputs
+        ), "Fields mismatch"
+
+    @staticmethod
+    def test_is_hashable() -> None:
+        """Test that derived contexts can be cached."""
+        derived = derive_context(CONTEXT)
+        assert hash(derived) == hash(derive_context(dict(CONTEXT))), (
+            "Derived contexts hash mismatch"
+        )
+        assert isinstance(derived.code_license_symbols, tuple), (
+            "Sequence copied to a list"
+        )
+
+    @staticmethod
+    def test_partial_merge() -> None:
+        """Test that only the derived values are merged."""
+        derived = derive_context(
+            {"project_name": "Test Project"}, partial=True
+        )
+        assert derived.merge_into({}) == {
+            "project_slug": "test-project",
+            "package_name": "test_project",
+        }, "Underived values merged"
+
+
+class TestUpdateContexts:
+    """Test suite for the update_contexts function."""
+
+    CONTEXT_EXAMPLES = st.fixed_dictionaries({
+        "target_python_version": st.sampled_from(["py39", "py310", "py313"]),
+        "project_name": st.sampled_from(["Test Project", "Café Münster"]),
+        "code_license_id": st.sampled_from(["MIT", "MIT OR Apache-2.0"]),
+        "resources_license_id": st.sampled_from(["CC-BY-4.0", "MIT"]),
+    })
+
+    @staticmethod
+    @given(st.lists(CONTEXT_EXAMPLES, max_size=8))
+    def test_matches_hook(
+        environment: Environment,
+        contexts: list[dict[str, str]],
+    ) -> None:
+        """Test that the batch API derives the same values as the hook."""
+        updater = ContextUpdater(environment)
+        expected = [updater.hook(dict(context)) for context in contexts]
+        assert list(update_contexts(contexts)) == expected, (
+            "Batch update mismatch"
+        )
+
+    @staticmethod
+    def test_is_lazy() -> None:
+        """Test that contexts are consumed one at a time."""
+        empty_contexts: list[dict[str, Any]] = [{}, {}]
+        contexts = iter(empty_contexts)
+        updated_contexts = update_contexts(contexts)
+        assert next(updated_contexts) == {}, "Empty context not rejected"
+        assert next(contexts) == {}, "Contexts consumed eagerly"
+
+    @staticmethod
+    def test_missing_keys_listed() -> None:
+        """Test that an incomplete context is rejected with every key."""
+        with pytest.raises(MissingContextKeysError) as error:
+            update_context({"code_license_id": "not-a-license"})
+
+        assert error.value.keys == (
+            "project_name",
+            "target_python_version",
+            "resources_license_id",
+        ), "Missing keys mismatch"
+
+    @staticmethod
+    def test_missing_keys() -> None:
+        """Test that incomplete contexts yield empty dictionaries."""
+        contexts = [{"project_name": "Test Project"}]
+        assert list(update_contexts(contexts)) == [{}], (
+            "Incomplete context not rejected"
+        )
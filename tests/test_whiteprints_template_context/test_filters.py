@@ -4,15 +4,24 @@
 
 """Test Copier Whiteprints custom filters."""
 
+from pathlib import Path
+
 import pytest
 from hypothesis import given
 from hypothesis import strategies as st
-from jinja2 import Environment
+from jinja2 import Environment, pass_context
+from jinja2.runtime import Context
+from license_expression import (  # type: ignore [reportMissingTypeStubs]
+    ExpressionError,
+)
 
 from whiteprints_template_context.filters import (
+    PROFILE_VARIABLE,
     LicenseExpressionError,
     WhiteprintsFilters,
+    WhiteprintsProfiler,
     is_spdx_expression,
+    spdx_normalize,
 )
 
 
@@ -49,6 +58,21 @@ def test_invalid_spdx_expression(value: str) -> None:
         with pytest.raises(LicenseExpressionError):
             is_spdx_expression(value)
 
+    @staticmethod
+    @given(INVALID_SPDX_STRATEGY)
+    def test_invalid_spdx_expression_is_cached(value: str) -> None:
+        """Test that invalid SPDX expressions are negatively cached."""
+        with pytest.raises(LicenseExpressionError):
+            is_spdx_expression(value)
+
+        negative_hits = is_spdx_expression.cache_info().negative_hits
+        with pytest.raises(LicenseExpressionError):
+            is_spdx_expression(value)
+
+        assert (
+            is_spdx_expression.cache_info().negative_hits == negative_hits + 1
+        ), f"Invalid SPDX expression '{value}' should be cached"
+
 
 def test_spdx_expression_filter_added() -> None:
     """Test that 'spdx_expression' test is added to the environment."""
@@ -57,3 +81,142 @@ def test_spdx_expression_filter_added() -> None:
     assert "spdx_expression" in env.tests, (
         "'spdx_expression' should be available in Jinja2 tests"
     )
+
+
+class TestLicenseFilters:
+    """Test suite for the license filters."""
+
+    @staticmethod
+    def render(template: str, expression: str) -> str:
+        """Render a template with the extension.
+
+        Returns:
+            The rendered template.
+        """
+        environment = Environment(autoescape=True)
+        WhiteprintsFilters(environment)
+        return environment.from_string(template).render(expression=expression)
+
+    @staticmethod
+    def test_spdx_symbols() -> None:
+        """Test that symbols are extracted by their key, sorted."""
+        assert (
+            TestLicenseFilters.render(
+                "{{ expression | spdx_symbols | join(' ') }}",
+                "mit OR GPL-2.0+ OR Apache-2.0",
+            )
+            == "Apache-2.0 GPL-2.0-or-later MIT"
+        ), "Symbols mismatch"
+
+    @staticmethod
+    def test_spdx_links() -> None:
+        """Test that symbols are replaced by links."""
+        assert TestLicenseFilters.render(
+            "{{ expression | spdx_link }} {{ expression | spdx_local_link }}",
+            "MIT",
+        ) == (
+            "[MIT](https://spdx.org/licenses/MIT) [MIT](../LICENSES/MIT.txt)"
+        ), "Links mismatch"
+
+    @staticmethod
+    def test_spdx_normalize() -> None:
+        """Test that expressions are normalized."""
+        assert (
+            TestLicenseFilters.render(
+                "{{ expression | spdx_normalize }}",
+                "(mit)  or  gpl-3.0-or-later with classpath-exception-2.0",
+            )
+            == "MIT OR GPL-3.0-or-later WITH Classpath-exception-2.0"
+        ), "Normalization mismatch"
+
+    @staticmethod
+    def test_spdx_canonical() -> None:
+        """Test that equivalent expressions have the same rendering."""
+        assert (
+            TestLicenseFilters.render(
+                "{{ expression | spdx_canonical }}",
+                "isc and (mit or apache-2.0)",
+            )
+            == "(Apache-2.0 OR MIT) AND ISC"
+        ), "Canonical rendering mismatch"
+
+    @staticmethod
+    def test_spdx_normalize_invalid() -> None:
+        """Test that invalid expressions are rejected."""
+        with pytest.raises(ExpressionError):
+            spdx_normalize("not-a-license OR MIT")
+
+
+class TestWhiteprintsProfiler:
+    """Test suite for the WhiteprintsProfiler extension."""
+
+    @staticmethod
+    def profiler(environment: Environment) -> WhiteprintsProfiler:
+        """Find the profiler of an environment.
+
+        Returns:
+            The profiler extension.
+        """
+        extension = environment.extensions[
+            WhiteprintsProfiler.identifier  # type: ignore [reportUnknownMemberType]
+        ]
+        assert isinstance(extension, WhiteprintsProfiler), "Not a profiler"
+        return extension
+
+    @staticmethod
+    def test_render(monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that templates, filters and tests are profiled."""
+        monkeypatch.delenv(PROFILE_VARIABLE, raising=False)
+        environment = Environment(
+            autoescape=True,
+            extensions=[WhiteprintsProfiler, WhiteprintsFilters],
+        )
+        template = environment.from_string(
+            "{{ name | upper }}{% if name is string %}{{ name | lower }}"
+            "{% endif %}{{ name | upper }}"
+        )
+        assert template.render(name="Mit") == "MITmitMIT", "Render mismatch"
+        profile = TestWhiteprintsProfiler.profiler(environment).profile
+        assert profile.calls["template", "<string>"] == 1, "Template missed"
+        assert profile.calls["filter", "upper"] == 2, "Filter missed"  # noqa: PLR2004
+        assert profile.calls["test", "string"] == 1, "Test missed"
+        seconds = [seconds for *_, seconds in profile.hot("filter")]
+        assert seconds == sorted(seconds, reverse=True), "Report not sorted"
+        assert "filters:" in profile.report(), "Report mismatch"
+
+    @staticmethod
+    def test_late_filters() -> None:
+        """Test that filters registered after the profiler are profiled."""
+        environment = Environment(
+            autoescape=True,
+            extensions=[WhiteprintsProfiler],
+        )
+
+        @pass_context
+        def template_name(context: Context, value: str) -> str:
+            return f"{value}:{context.name}"
+
+        # Jinja types the filters with its untyped defaults.
+        filters = environment.filters  # type: ignore [reportUnknownMemberType]
+        filters["template_name"] = template_name
+        template = environment.from_string("{{ 'a' | template_name }}")
+        assert template.render() == "a:None", "Context not passed"
+        profile = TestWhiteprintsProfiler.profiler(environment).profile
+        assert profile.calls["filter", "template_name"] == 1, (
+            "Late filter missed"
+        )
+
+    @staticmethod
+    def test_write_report(tmp_path: Path) -> None:
+        """Test that the report is written to a file."""
+        environment = Environment(
+            autoescape=True,
+            extensions=[WhiteprintsProfiler],
+        )
+        environment.from_string("{{ 1 | abs }}").render()
+        profiler = TestWhiteprintsProfiler.profiler(environment)
+        path = tmp_path / "profile.txt"
+        profiler.write_report(str(path))
+        assert path.read_text(encoding="utf-8") == profiler.profile.report(), (
+            "Report mismatch"
+        )
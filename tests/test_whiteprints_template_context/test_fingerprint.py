@@ -0,0 +1,161 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints template context" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: MIT
+
+"""Test the detection of the changes of the derived context."""
+
+from pathlib import Path
+from typing import Final
+
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+from jinja2 import Environment
+
+from tests.fixtures.contexts import CONTEXT
+from whiteprints_template_context.context import (
+    ContextUpdater,
+    DerivedContext,
+    derive_context,
+)
+from whiteprints_template_context.fingerprint import (
+    CHANGED_KEYS_KEY,
+    FINGERPRINT_KEY,
+    FINGERPRINT_VARIABLE,
+    UNCHANGED_KEY,
+    FingerprintStore,
+    derived_values,
+    fingerprint,
+)
+
+
+FINGERPRINT_FILE: Final = "fingerprint.json"
+"""Name of the test fingerprint files."""
+
+
+class TestFingerprint:
+    """Test suite for the fingerprint function."""
+
+    @staticmethod
+    @given(st.permutations(list(derived_values(derive_context(CONTEXT)))))
+    def test_key_order(keys: list[str]) -> None:
+        """Test that the fingerprint does not depend on the key order."""
+        values = derived_values(derive_context(CONTEXT))
+        assert fingerprint({key: values[key] for key in keys}) == (
+            fingerprint(values)
+        ), "Fingerprint depends on the key order"
+
+    @staticmethod
+    def test_values() -> None:
+        """Test that different derived values have different fingerprints."""
+        other = derive_context({**CONTEXT, "project_name": "Other Project"})
+        assert fingerprint(derived_values(other)) != fingerprint(
+            derived_values(derive_context(CONTEXT))
+        ), "Fingerprint collision"
+
+
+class TestFingerprintStore:
+    """Test suite for the FingerprintStore class."""
+
+    @staticmethod
+    def test_first_render(tmp_path: Path) -> None:
+        """Test that every derived key changed without a stored context."""
+        changes = FingerprintStore(tmp_path / FINGERPRINT_FILE).compare(
+            derive_context(CONTEXT)
+        )
+        assert not changes.unchanged, "Missing context unchanged"
+        assert changes.changed_keys == DerivedContext._fields, (
+            "Changed keys mismatch"
+        )
+
+    @staticmethod
+    def test_changed_keys(tmp_path: Path) -> None:
+        """Test that only the changed derived keys are listed."""
+        path = tmp_path / FINGERPRINT_FILE
+        FingerprintStore(path).compare(derive_context(CONTEXT))
+        changes = FingerprintStore(path).compare(
+            derive_context({**CONTEXT, "project_name": "Other Project"})
+        )
+        assert not changes.unchanged, "Changed context unchanged"
+        assert changes.changed_keys == ("project_slug", "package_name"), (
+            "Changed keys mismatch"
+        )
+        assert FingerprintStore(path).compare(
+            derive_context(CONTEXT), save=False
+        ).changed_keys == ("project_slug", "package_name"), (
+            "Changed context not stored"
+        )
+
+    @staticmethod
+    def test_unchanged(tmp_path: Path) -> None:
+        """Test that a derived context equal to the stored one is reported."""
+        path = tmp_path / FINGERPRINT_FILE
+        FingerprintStore(path).compare(derive_context(CONTEXT))
+        changes = FingerprintStore(path).compare(derive_context(CONTEXT))
+        assert changes.unchanged, "Unchanged context changed"
+        assert not changes.changed_keys, "Unchanged keys listed"
+
+    @staticmethod
+    def test_dry_run(tmp_path: Path) -> None:
+        """Test that the derived context is not stored when not saving."""
+        path = tmp_path / FINGERPRINT_FILE
+        FingerprintStore(path).compare(derive_context(CONTEXT), save=False)
+        assert not path.exists(), "Derived context stored"
+
+    @staticmethod
+    def test_corrupted_file(tmp_path: Path) -> None:
+        """Test that an unreadable stored context is ignored."""
+        path = tmp_path / FINGERPRINT_FILE
+        path.write_text("[", encoding="utf-8")
+        changes = FingerprintStore(path).compare(derive_context(CONTEXT))
+        assert not changes.unchanged, "Corrupted context unchanged"
+        assert FingerprintStore(path).stored_fingerprint == (
+            changes.fingerprint
+        ), "Derived context not stored"
+
+
+class TestContextUpdater:
+    """Test suite for the fingerprint of the ContextUpdater class."""
+
+    @staticmethod
+    def test_disabled(environment: Environment) -> None:
+        """Test that the changes are not computed by default."""
+        updater = ContextUpdater(environment)
+        updated_context = updater.hook(dict(CONTEXT))
+        assert updater.changes is None, "Changes computed"
+        assert FINGERPRINT_KEY not in updated_context, "Fingerprint exposed"
+
+    @staticmethod
+    def test_renders(
+        monkeypatch: pytest.MonkeyPatch,
+        environment: Environment,
+        tmp_path: Path,
+    ) -> None:
+        """Test that the changes since the previous render are exposed."""
+        monkeypatch.setenv(
+            FINGERPRINT_VARIABLE, str(tmp_path / FINGERPRINT_FILE)
+        )
+        updater = ContextUpdater(environment)
+        updater.hook(dict(CONTEXT))
+        updated_context = updater.hook(dict(CONTEXT))
+        assert updated_context[UNCHANGED_KEY] is False, (
+            "First render unchanged"
+        )
+        updated_context = ContextUpdater(environment).hook(dict(CONTEXT))
+        assert updated_context[UNCHANGED_KEY] is True, "Second render changed"
+        assert updated_context[CHANGED_KEYS_KEY] == (), "Changed keys listed"
+
+    @staticmethod
+    def test_incomplete_context(
+        monkeypatch: pytest.MonkeyPatch,
+        environment: Environment,
+        tmp_path: Path,
+    ) -> None:
+        """Test that incomplete contexts are not compared nor stored."""
+        path = tmp_path / FINGERPRINT_FILE
+        monkeypatch.setenv(FINGERPRINT_VARIABLE, str(path))
+        updater = ContextUpdater(environment)
+        updated_context = updater.hook({"project_name": "Test Project"})
+        assert updater.changes is None, "Incomplete context compared"
+        assert FINGERPRINT_KEY not in updated_context, "Fingerprint exposed"
+        assert not path.exists(), "Incomplete context stored"
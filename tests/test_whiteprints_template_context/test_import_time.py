@@ -0,0 +1,85 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints template context" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: MIT
+
+"""Test the import cost of the Jinja extensions."""
+
+import re
+import subprocess  # nosec B404
+import sys
+from typing import Final
+
+
+IMPORT_TIME_BUDGET: Final = 100_000
+"""Maximum import time of the extensions, in microseconds.
+
+Importing Copier alone takes about twice this budget.
+"""
+
+EXTENSION_MODULES: Final = (
+    "whiteprints_template_context.context",
+    "whiteprints_template_context.filters",
+)
+"""Modules loaded by Copier as Jinja extensions."""
+
+HEAVY_MODULES: Final = ("copier", "license_expression")
+"""Modules that should only be imported on first use."""
+
+IMPORT_TIME_PATTERN: Final = re.compile(
+    r"^import time:\s+\d+ \|\s+(?P<cumulative>\d+) \| (?P<module>\S+)$",
+    re.MULTILINE,
+)
+"""Top-level entries of the `-X importtime` report."""
+
+
+def import_extensions() -> subprocess.CompletedProcess[str]:
+    """Import the extensions in a fresh interpreter.
+
+    Jinja is imported beforehand, as Copier always loads it before the
+    extensions.
+
+    Returns:
+        The completed process, reporting the import times on stderr and the
+        imported modules on stdout.
+    """
+    code = "; ".join((
+        "import sys",
+        "import jinja2",
+        *(f"import {module}" for module in EXTENSION_MODULES),
+        "print(*sys.modules)",
+    ))
+    return subprocess.run(  # nosec B603
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+
+
+class TestImportTime:
+    """Test the import cost of the extensions."""
+
+    @staticmethod
+    def test_heavy_modules_are_lazy() -> None:
+        """Test that importing the extensions defers heavy imports."""
+        imported = {
+            module.partition(".")[0]
+            for module in import_extensions().stdout.split()
+        }
+        assert imported.isdisjoint(HEAVY_MODULES), (
+            f"Extensions import {sorted(imported & set(HEAVY_MODULES))}"
+        )
+
+    @staticmethod
+    def test_import_time_budget() -> None:
+        """Test that importing the extensions stays within budget."""
+        import_time = sum(
+            int(match["cumulative"])
+            for match in IMPORT_TIME_PATTERN.finditer(
+                import_extensions().stderr
+            )
+            if match["module"].startswith("whiteprints_template_context")
+        )
+        assert import_time <= IMPORT_TIME_BUDGET, (
+            f"Importing the extensions took {import_time}us"
+        )
@@ -0,0 +1,170 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints template context" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: MIT
+
+"""Test the instrumentation of the context derivation stages."""
+
+import json
+import logging
+from pathlib import Path
+from typing import Final
+
+import pytest
+from jinja2 import Environment
+
+from tests.fixtures.contexts import CONTEXT
+from whiteprints_template_context import instrumentation
+from whiteprints_template_context.context import (
+    STAGES,
+    ContextUpdater,
+    derive_stage,
+    update_context,
+)
+
+
+STAGE_NAMES: Final = {stage.name for stage in STAGES}
+"""Names of the derivation stages."""
+
+ROUNDS: Final = 2
+"""Number of updates of an instrumented context."""
+
+
+class TestSinks:
+    """Test suite for the timing sinks."""
+
+    @staticmethod
+    def test_stage_stats() -> None:
+        """Test that statistics count calls and derived keys per stage."""
+        stats = instrumentation.StageStats()
+        derive = instrumentation.instrument(derive_stage, stats)
+        for _ in range(ROUNDS):
+            update_context(dict(CONTEXT), derive)
+
+        summary = stats.as_dict()
+        assert set(summary) == STAGE_NAMES, "Stage missing from statistics"
+        assert all(entry["calls"] == ROUNDS for entry in summary.values()), (
+            "Call count mismatch"
+        )
+        assert summary["project"]["outputs"] == [
+            "project_slug",
+            "package_name",
+        ], "Derived keys mismatch"
+        stats.clear()
+        assert not stats.as_dict(), "Statistics not cleared"
+
+    @staticmethod
+    def test_json_lines(tmp_path: Path) -> None:
+        """Test that timings are appended as JSON lines."""
+        path = tmp_path / "timings.jsonl"
+        sink = instrumentation.JsonLinesSink(path)
+        update_context(
+            dict(CONTEXT), instrumentation.instrument(derive_stage, sink)
+        )
+        timings = [
+            json.loads(line)
+            for line in path.read_text(encoding="utf-8").splitlines()
+        ]
+        assert {timing["stage"] for timing in timings} == STAGE_NAMES, (
+            "Stage missing from the file"
+        )
+        assert all(timing["seconds"] >= 0 for timing in timings), (
+            "Negative timing"
+        )
+
+    @staticmethod
+    def test_logging(caplog: pytest.LogCaptureFixture) -> None:
+        """Test that the log sink logs each stage."""
+        sink = instrumentation.sink_from_setting("log")
+        assert sink is not None, "Log sink not found"
+        with caplog.at_level(logging.INFO, instrumentation.__name__):
+            update_context(
+                dict(CONTEXT), instrumentation.instrument(derive_stage, sink)
+            )
+
+        assert len(caplog.records) == len(STAGES), "Stage not logged"
+
+
+class TestSettings:
+    """Test suite for the instrumentation settings."""
+
+    @staticmethod
+    @pytest.mark.parametrize("setting", ["", "0", "false", "False"])
+    def test_disabled(setting: str) -> None:
+        """Test that empty and false settings disable instrumentation."""
+        assert instrumentation.sink_from_setting(setting) is None, (
+            "Instrumentation enabled"
+        )
+
+    @staticmethod
+    @pytest.mark.parametrize("setting", ["1", "true"])
+    def test_unnamed_sink(setting: str) -> None:
+        """Test that settings naming no sink are rejected."""
+        with pytest.raises(ValueError, match="names no sink"):
+            instrumentation.sink_from_setting(setting)
+
+    @staticmethod
+    @pytest.mark.parametrize("value", [None, False, "", "0", "false"])
+    def test_context_disabled(
+        monkeypatch: pytest.MonkeyPatch,
+        tmp_path: Path,
+        value: object,
+    ) -> None:
+        """Test that falsy context values disable instrumentation."""
+        monkeypatch.chdir(tmp_path)
+        assert (
+            instrumentation.sink_from_context(
+                {instrumentation.INSTRUMENTATION_KEY: value},
+                instrumentation.STAGE_STATS,
+            )
+            is None
+        ), "Instrumentation enabled"
+        assert not list(tmp_path.iterdir()), "Timings written to a file"
+
+    @staticmethod
+    @pytest.mark.parametrize("value", [True, 1, 0.5])
+    def test_context_not_string(value: object) -> None:
+        """Test that context values other than strings are rejected."""
+        with pytest.raises(TypeError, match="must be a string"):
+            instrumentation.sink_from_context(
+                {instrumentation.INSTRUMENTATION_KEY: value}, None
+            )
+
+    @staticmethod
+    def test_context_default() -> None:
+        """Test that a context without setting uses the default sink."""
+        assert (
+            instrumentation.sink_from_context(
+                dict(CONTEXT), instrumentation.STAGE_STATS
+            )
+            is instrumentation.STAGE_STATS
+        ), "Default sink ignored"
+
+    @staticmethod
+    def test_file_setting(tmp_path: Path) -> None:
+        """Test that an unnamed setting is the path of a JSON lines file."""
+        sink = instrumentation.sink_from_setting(str(tmp_path / "t.jsonl"))
+        assert isinstance(sink, instrumentation.JsonLinesSink), (
+            "File sink not found"
+        )
+
+    @staticmethod
+    def test_context_overrides_environment(
+        monkeypatch: pytest.MonkeyPatch,
+        environment: Environment,
+    ) -> None:
+        """Test that the context value takes precedence over the variable."""
+        monkeypatch.setenv(instrumentation.INSTRUMENTATION_VARIABLE, "stats")
+        updater = ContextUpdater(environment)
+        assert updater.sink is instrumentation.STAGE_STATS, (
+            "Environment variable ignored"
+        )
+        instrumentation.STAGE_STATS.clear()
+        updater.hook({**CONTEXT, instrumentation.INSTRUMENTATION_KEY: ""})
+        assert not instrumentation.STAGE_STATS.as_dict(), (
+            "Context value ignored"
+        )
+        updater.hook(dict(CONTEXT))
+        assert set(instrumentation.STAGE_STATS.as_dict()) == STAGE_NAMES, (
+            "Stages not instrumented"
+        )
+        instrumentation.STAGE_STATS.clear()
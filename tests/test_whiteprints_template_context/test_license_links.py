@@ -0,0 +1,95 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints template context" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: MIT
+
+"""Test the rendering of license expressions with links."""
+
+from hypothesis import given
+from hypothesis import strategies as st
+
+from whiteprints_template_context.context import spdx_symbols
+from whiteprints_template_context.license_links import (
+    LOCAL_LINK,
+    SPDX_LINK,
+    render_links,
+)
+
+
+def reference_render_links(expression: str, link_format: str) -> str:
+    """Render links by replacing each symbol, as the original loop did.
+
+    Returns:
+        The rendered expression.
+    """
+    for symbol in spdx_symbols(expression):
+        expression = expression.replace(
+            symbol,
+            link_format.format(symbol=symbol),
+        )
+
+    return expression
+
+
+class TestRenderLinks:
+    """Test suite for the render_links function."""
+
+    SPDX_IDENTIFIERS = st.sampled_from([
+        "Apache-2.0",
+        "GPL-2.0-only OR MIT",
+        "GPL-3.0-or-later WITH LGPL-3.0-linking-exception",
+        "(MIT AND BSD-3-Clause) OR Apache-2.0",
+        "CC-BY-4.0 AND MPL-2.0",
+        "ISC",
+    ])
+
+    @staticmethod
+    @given(SPDX_IDENTIFIERS, st.sampled_from([SPDX_LINK, LOCAL_LINK]))
+    def test_matches_reference(expression: str, link_format: str) -> None:
+        """Test that links match the symbol by symbol replacement."""
+        (rendering,) = render_links(expression, (link_format,))
+        assert rendering == reference_render_links(expression, link_format), (
+            "Rendering differs from the reference"
+        )
+
+    @staticmethod
+    def test_symbol_within_symbol() -> None:
+        """Test that a symbol within another one is not linked twice."""
+        (rendering,) = render_links(
+            "GPL-2.0-only OR LGPL-2.0-only", ("<{symbol}>",)
+        )
+        assert rendering == "<GPL-2.0-only> OR <LGPL-2.0-only>", (
+            "Symbol linked within another symbol"
+        )
+
+    @staticmethod
+    def test_exception_and_spacing() -> None:
+        """Test that exceptions are linked and spacing is kept."""
+        (rendering,) = render_links(
+            "(mit  or GPL-3.0-or-later with Classpath-exception-2.0)",
+            ("<{symbol}>",),
+        )
+        assert rendering == (
+            "(<MIT>  or <GPL-3.0-or-later> with <Classpath-exception-2.0>)"
+        ), "Expression layout not kept"
+
+    @staticmethod
+    def test_aliases_link_to_keys() -> None:
+        """Test that aliases are linked by their SPDX key."""
+        (rendering,) = render_links("GPL-2.0+", ("<{symbol}>",))
+        assert rendering == "<GPL-2.0-or-later>", "Alias not resolved"
+
+    @staticmethod
+    def test_single_pass_formats() -> None:
+        """Test that every format is rendered from one call."""
+        assert render_links("MIT", (SPDX_LINK, LOCAL_LINK)) == (
+            "[MIT](https://spdx.org/licenses/MIT)",
+            "[MIT](../LICENSES/MIT.txt)",
+        ), "Formats mismatch"
+
+    @staticmethod
+    def test_is_cached() -> None:
+        """Test that renderings are memoized per expression and formats."""
+        rendering = render_links("MIT OR Apache-2.0", (SPDX_LINK,))
+        assert render_links("MIT OR Apache-2.0", (SPDX_LINK,)) is rendering, (
+            "Rendering not memoized"
+        )
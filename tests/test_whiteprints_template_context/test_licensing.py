@@ -0,0 +1,139 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints template context" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: MIT
+
+"""Test the shared SPDX licensing index."""
+
+import pickle  # nosec B403
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from license_expression import (  # type: ignore [reportMissingTypeStubs]
+    Licensing,
+)
+
+from whiteprints_template_context import licensing
+
+
+@pytest.fixture(name="snapshot_directory")
+def fixture_snapshot_directory(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> Iterator[Path]:
+    """Enable licensing snapshots in a temporary directory.
+
+    Yields:
+        The snapshot directory.
+    """
+    monkeypatch.setenv(licensing.SNAPSHOT_DIRECTORY_VARIABLE, str(tmp_path))
+    licensing.get_licensing.cache_clear()
+    yield tmp_path
+    licensing.get_licensing.cache_clear()
+
+
+class TestGetLicensing:
+    """Test suite for the get_licensing function."""
+
+    @staticmethod
+    def test_is_shared() -> None:
+        """Test that the licensing object is built once per process."""
+        assert licensing.get_licensing() is licensing.get_licensing(), (
+            "Licensing object rebuilt"
+        )
+
+    @staticmethod
+    def test_writes_snapshot(snapshot_directory: Path) -> None:
+        """Test that a missing snapshot is written."""
+        licensing.get_licensing()
+        assert licensing.snapshot_path(snapshot_directory).is_file(), (
+            "Snapshot not written"
+        )
+
+    @staticmethod
+    @pytest.mark.usefixtures("snapshot_directory")
+    def test_loads_snapshot() -> None:
+        """Test that an existing snapshot is loaded."""
+        licensing.get_licensing()
+        licensing.get_licensing.cache_clear()
+        loaded = licensing.get_licensing()
+        symbols = loaded.license_symbols(  # type: ignore [reportUnknownMemberType]
+            "MIT OR Apache-2.0"
+        )
+        assert symbols, "Snapshot not usable"
+
+    @staticmethod
+    def test_unpicklable_snapshot(
+        snapshot_directory: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Test that a snapshot failing to pickle leaves no file behind."""
+
+        def dump(*_args: object, **_kwargs: object) -> None:
+            message = "unpicklable"
+            raise pickle.PicklingError(message)
+
+        monkeypatch.setattr(pickle, "dump", dump)
+        assert isinstance(licensing.get_licensing(), Licensing), (
+            "Licensing object not built"
+        )
+        assert not any(snapshot_directory.iterdir()), "Snapshot file left"
+
+    @staticmethod
+    def test_corrupted_snapshot(snapshot_directory: Path) -> None:
+        """Test that a corrupted snapshot is rebuilt."""
+        path = licensing.snapshot_path(snapshot_directory)
+        path.write_bytes(b"corrupted")
+        assert isinstance(licensing.get_licensing(), Licensing), (
+            "Corrupted snapshot not rebuilt"
+        )
+        assert isinstance(licensing.load_snapshot(path), Licensing), (
+            "Corrupted snapshot not replaced"
+        )
+
+
+class TestSnapshot:
+    """Test suite for the licensing snapshots."""
+
+    @staticmethod
+    def test_keyed_by_license_list_version(tmp_path: Path) -> None:
+        """Test that snapshots are keyed by the license list version."""
+        path = licensing.snapshot_path(tmp_path)
+        assert licensing.license_list_version() in path.name, (
+            "Snapshot not keyed by version"
+        )
+
+    @staticmethod
+    def test_missing_snapshot(tmp_path: Path) -> None:
+        """Test that a missing snapshot loads as None."""
+        assert licensing.load_snapshot(tmp_path / "missing") is None, (
+            "Missing snapshot loaded"
+        )
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "content",
+        [
+            b"cwhiteprints_template_context.missing\nLicensing\n.",
+            b"cwhiteprints_template_context\nMissingLicensing\n.",
+            b"cbuiltins\nint\n(S'not a number'\ntR.",
+        ],
+        ids=["missing module", "missing attribute", "invalid value"],
+    )
+    def test_stale_snapshot(tmp_path: Path, content: bytes) -> None:
+        """Test that a snapshot of other dependencies loads as None."""
+        path = tmp_path / "snapshot.pickle"
+        path.write_bytes(content)
+        assert licensing.load_snapshot(path) is None, "Stale snapshot loaded"
+
+    @staticmethod
+    def test_unexpected_snapshot(tmp_path: Path) -> None:
+        """Test that a snapshot of another type loads as None."""
+        path = tmp_path / "snapshot.pickle"
+        licensing.save_snapshot(
+            "not a licensing",  # type: ignore [reportArgumentType]
+            path,
+        )
+        assert licensing.load_snapshot(path) is None, (
+            "Unexpected snapshot loaded"
+        )
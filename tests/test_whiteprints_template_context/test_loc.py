@@ -4,8 +4,11 @@
 
 """Test the loc module."""
 
+import gettext
 from pathlib import Path
 
+import pytest
+
 from whiteprints_template_context import loc
 
 
@@ -29,3 +32,52 @@ def test_translation_functions_are_available() -> None:
             "Translation function `TRANSLATION` not found."
         )
         assert hasattr(loc, "_"), "Translation function `_` not found."
+
+
+class TestTranslationProvider:
+    """Test the lazy, per-locale, translation provider."""
+
+    @staticmethod
+    def test_translation_is_cached() -> None:
+        """Test that the translation of a locale is loaded once."""
+        assert loc.get_translation(("fr",)) is loc.get_translation(("fr",)), (
+            "Translation loaded twice"
+        )
+
+    @staticmethod
+    def test_translation_cache_is_bounded() -> None:
+        """Test that the translation cache is bounded."""
+        assert (
+            loc.get_translation.cache_info().maxsize
+            == loc.TRANSLATION_CACHE_SIZE
+        ), "Translation cache not bounded"
+
+    @staticmethod
+    def test_environment_translation() -> None:
+        """Test that TRANSLATION is the environment locale translation."""
+        assert loc.TRANSLATION is loc.get_translation(), (
+            "TRANSLATION does not use the environment locale"
+        )
+
+    @staticmethod
+    def test_use_locale() -> None:
+        """Test that messages are translated in the current locale."""
+        with loc.use_locale("xx"):
+            assert loc._("message") == "message", "Missing catalog not ignored"
+            assert loc.get_translation.cache_info().currsize, (
+                "Translation not cached"
+            )
+
+    @staticmethod
+    def test_fallback() -> None:
+        """Test that a missing catalog falls back to the messages."""
+        assert isinstance(
+            loc.get_translation(("xx",)),
+            gettext.NullTranslations,
+        ), "Missing catalog not ignored"
+
+    @staticmethod
+    def test_unknown_attribute() -> None:
+        """Test that unknown attributes raise an AttributeError."""
+        with pytest.raises(AttributeError, match="UNKNOWN"):
+            _ = loc.UNKNOWN  # type: ignore [reportAttributeAccessIssue]
@@ -6,6 +6,9 @@
 
 import re
 
+import pytest
+
+import whiteprints_template_context
 from whiteprints_template_context import package_metadata
 
 
@@ -87,3 +90,34 @@ def test___license__() -> None:
     def test___license_file__() -> None:
         """Test if the license files are found."""
         assert package_metadata.__license_file__, "No license file found."
+
+
+class TestLazyAttributes:
+    """Test the lazily computed metadata attributes."""
+
+    @staticmethod
+    @pytest.mark.parametrize("name", package_metadata.__all__)
+    def test_attribute_is_cached(name: str) -> None:
+        """Test that attributes are cached as module attributes."""
+        value = getattr(package_metadata, name)
+        assert vars(package_metadata)[name] is value, (
+            f"Attribute {name} not cached"
+        )
+
+    @staticmethod
+    def test_package_version() -> None:
+        """Test that the package exposes the metadata version."""
+        assert (
+            whiteprints_template_context.__version__
+            == package_metadata.__version__
+        ), "Package version mismatch"
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "module",
+        [package_metadata, whiteprints_template_context],
+    )
+    def test_unknown_attribute(module: object) -> None:
+        """Test that unknown attributes raise an AttributeError."""
+        with pytest.raises(AttributeError, match="__unknown__"):
+            getattr(module, "__unknown__")  # noqa: B009
@@ -0,0 +1,205 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints template context" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: MIT
+
+"""Test the persistent cache of the derived context values."""
+
+import json
+import os
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Final
+
+import pytest
+from jinja2 import Environment
+
+from tests.fixtures.contexts import CONTEXT
+from tests.fixtures.processes import run_python
+from whiteprints_template_context import cli
+from whiteprints_template_context.compact_licensing import (
+    BACKEND_VARIABLE,
+    COMPACT_BACKEND,
+)
+from whiteprints_template_context.context import (
+    STAGES,
+    ContextUpdater,
+    derive_stage,
+)
+from whiteprints_template_context.persistent_cache import (
+    CACHE_DIRECTORY_VARIABLE,
+    CACHE_FILE_NAME,
+    PersistentCache,
+    open_cache,
+    stage_fingerprint,
+)
+from whiteprints_template_context.python_matrix import LATEST_PYTHON_VARIABLE
+
+
+MAX_ENTRIES: Final = 2
+"""Number of entries kept by the test caches."""
+
+FORK_CODE: Final = """
+import os
+import sys
+from whiteprints_template_context.persistent_cache import open_cache
+
+persistent_cache = open_cache(sys.argv[1])
+persistent_cache._lock.acquire()
+pid = os.fork()
+if pid == 0:
+    persistent_cache.put("child", ("child",))
+    os._exit(0 if persistent_cache.get("child") == ("child",) else 1)
+
+print(os.waitstatus_to_exitcode(os.waitpid(pid, 0)[1]))
+"""
+"""Fork while a cache is in use, then use the cache in the child."""
+
+
+@pytest.fixture(name="persistent_cache")
+def fixture_persistent_cache(tmp_path: Path) -> Iterator[PersistentCache]:
+    """Fixture opening a persistent cache in a temporary directory.
+
+    Yields:
+        The persistent cache, closed after the test.
+    """
+    with PersistentCache(
+        tmp_path / CACHE_FILE_NAME, max_entries=MAX_ENTRIES
+    ) as persistent_cache:
+        yield persistent_cache
+
+
+class TestPersistentCache:
+    """Test suite for the PersistentCache class."""
+
+    @staticmethod
+    def test_round_trip(persistent_cache: PersistentCache) -> None:
+        """Test that cached values are the derived values."""
+        for stage in STAGES:
+            inputs = tuple(CONTEXT.get(key) for key in stage.inputs)
+            inputs += (None,) * len(stage.options)
+            outputs = persistent_cache.derive(stage, inputs)
+            assert (
+                persistent_cache.get(stage_fingerprint(stage, inputs))
+                == derive_stage(stage, inputs)
+                == outputs
+            ), "Round trip mismatch"
+
+    @staticmethod
+    def test_eviction(persistent_cache: PersistentCache) -> None:
+        """Test that the least recently used entries are evicted."""
+        for key in ("a", "b", "c"):
+            persistent_cache.put(key, (key,))
+
+        assert persistent_cache.get("a") is None, "Oldest entry kept"
+        assert persistent_cache.info().entries == MAX_ENTRIES, (
+            "Cache size exceeded"
+        )
+
+    @staticmethod
+    def test_clear(persistent_cache: PersistentCache) -> None:
+        """Test that clearing the cache removes every entry."""
+        persistent_cache.put("a", ("a",))
+        persistent_cache.clear()
+        assert persistent_cache.info().entries == 0, "Entries kept"
+
+    @staticmethod
+    def test_context_updater(
+        monkeypatch: pytest.MonkeyPatch,
+        environment: Environment,
+        tmp_path: Path,
+    ) -> None:
+        """Test that the hook stores its derived values in the cache."""
+        monkeypatch.setenv(CACHE_DIRECTORY_VARIABLE, str(tmp_path))
+        updated_context = ContextUpdater(environment).hook(dict(CONTEXT))
+        with PersistentCache(tmp_path / CACHE_FILE_NAME) as opened_cache:
+            assert opened_cache.info().entries == len(STAGES), (
+                "Derived values not cached"
+            )
+
+        assert ContextUpdater(environment).hook(dict(CONTEXT)) == (
+            updated_context
+        ), "Cached values mismatch"
+        opened_cache = open_cache(str(tmp_path))
+        assert opened_cache is not None, "Cache not opened"
+        opened_cache.close()
+
+    @staticmethod
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="Requires fork")
+    def test_fork_safe(tmp_path: Path) -> None:
+        """Test that a child forked with an open cache reopens it."""
+        assert run_python(FORK_CODE, str(tmp_path)) == "0", "Child failed"
+
+    @staticmethod
+    def test_latest_python(
+        monkeypatch: pytest.MonkeyPatch,
+        environment: Environment,
+        tmp_path: Path,
+    ) -> None:
+        """Test that cached matrices are keyed by the latest version."""
+        monkeypatch.setenv(CACHE_DIRECTORY_VARIABLE, str(tmp_path))
+        monkeypatch.delenv(LATEST_PYTHON_VARIABLE, raising=False)
+        ContextUpdater(environment).hook(dict(CONTEXT))
+        monkeypatch.setenv(LATEST_PYTHON_VARIABLE, "3.14")
+        updated_context = ContextUpdater(environment).hook(dict(CONTEXT))
+        assert updated_context["tox_python_list"].endswith(",314}"), (
+            "Stale cached matrix"
+        )
+
+    @staticmethod
+    def test_backend(monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that cached values are keyed by the licensing backend."""
+        stage = STAGES[-1]
+        monkeypatch.delenv(BACKEND_VARIABLE, raising=False)
+        fingerprint = stage_fingerprint(stage, ("MIT",))
+        monkeypatch.setenv(BACKEND_VARIABLE, COMPACT_BACKEND)
+        assert stage_fingerprint(stage, ("MIT",)) != fingerprint, (
+            "Backend not fingerprinted"
+        )
+
+
+class TestCacheCommand:
+    """Test suite for the cache command."""
+
+    @staticmethod
+    def test_info_and_clear(
+        tmp_path: Path,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        """Test that the command reports and clears the cache."""
+        with PersistentCache(tmp_path / CACHE_FILE_NAME) as opened_cache:
+            opened_cache.put("a", ("a",))
+
+        cli.main(["cache", "info", "--directory", str(tmp_path)])
+        cli.main(["cache", "clear", "--directory", str(tmp_path)])
+        info, cleared = map(json.loads, capsys.readouterr().out.splitlines())
+        assert (info["entries"], cleared["entries"]) == (1, 0), (
+            "Cache statistics mismatch"
+        )
+
+    @staticmethod
+    def test_info_missing(
+        tmp_path: Path,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        """Test that reporting a missing cache does not create it."""
+        directory = tmp_path / "missing"
+        cli.main(["cache", "info", "--directory", str(directory)])
+        info = json.loads(capsys.readouterr().out)
+        assert (info["entries"], info["size"]) == (0, 0), (
+            "Missing cache not empty"
+        )
+        assert not directory.exists(), "Cache created"
+
+    @staticmethod
+    def test_directory_from_environment(
+        monkeypatch: pytest.MonkeyPatch,
+        tmp_path: Path,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        """Test that the cache directory defaults to the environment."""
+        monkeypatch.setenv(CACHE_DIRECTORY_VARIABLE, str(tmp_path))
+        cli.main(["cache", "info"])
+        info = json.loads(capsys.readouterr().out)
+        assert info["path"] == str(tmp_path / CACHE_FILE_NAME), (
+            "Environment directory ignored"
+        )
@@ -0,0 +1,77 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints template context" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: MIT
+
+"""Test the warm-up of a process."""
+
+import gc
+import os
+from typing import Final
+
+import pytest
+
+import whiteprints_template_context
+from tests.fixtures.processes import run_python
+from whiteprints_template_context import preload
+from whiteprints_template_context.context import spdx_symbols
+from whiteprints_template_context.licensing import parse_errors
+
+
+FORK_CODE: Final = """
+import os
+from whiteprints_template_context import warmup
+from whiteprints_template_context.context import spdx_symbols
+
+warmup(["MIT"])
+spdx_symbols._lock.acquire()
+pid = os.fork()
+if pid == 0:
+    os._exit(0 if spdx_symbols("MIT") == {"MIT"} else 1)
+
+print(os.waitstatus_to_exitcode(os.waitpid(pid, 0)[1]))
+"""
+"""Fork while a cache lock is held, then use the cache in the child."""
+
+
+class TestWarmup:
+    """Test suite for the warmup function."""
+
+    @staticmethod
+    def test_primes_caches() -> None:
+        """Test that the expressions are primed, invalid ones included."""
+        summary = preload.warmup(["Zlib", "MIT OR", "Zlib"], freeze=False)
+        assert (summary.expressions, summary.invalid) == (2, ("MIT OR",)), (
+            "Summary mismatch"
+        )
+        hits = spdx_symbols.cache_info().hits
+        spdx_symbols("(Zlib)")
+        assert spdx_symbols.cache_info().hits == hits + 1, "Cache not primed"
+        negative_hits = spdx_symbols.cache_info().negative_hits
+        with pytest.raises(parse_errors()):
+            spdx_symbols("MIT OR")
+
+        assert spdx_symbols.cache_info().negative_hits == negative_hits + 1, (
+            "Error not primed"
+        )
+
+    @staticmethod
+    def test_freeze() -> None:
+        """Test that the allocated objects are frozen."""
+        try:
+            preload.warmup((), freeze=True)
+            assert gc.get_freeze_count() > 0, "Objects not frozen"
+        finally:
+            gc.unfreeze()
+
+    @staticmethod
+    def test_lazy_export() -> None:
+        """Test that warmup is exported by the package."""
+        assert whiteprints_template_context.warmup is preload.warmup, (
+            "warmup not exported"
+        )
+
+    @staticmethod
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="Requires fork")
+    def test_fork_safe() -> None:
+        """Test that a child forked while a cache lock is held uses it."""
+        assert run_python(FORK_CODE) == "0", "Child failed"
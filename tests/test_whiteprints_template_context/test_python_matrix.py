@@ -0,0 +1,145 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints template context" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: MIT
+
+"""Test the derivation of the supported Python versions."""
+
+import json
+
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+from jinja2 import Environment
+
+from tests.fixtures.contexts import CONTEXT
+from whiteprints_template_context.context import (
+    ContextUpdater,
+    update_context,
+    update_contexts,
+)
+from whiteprints_template_context.python_matrix import (
+    LATEST_PYTHON,
+    LATEST_PYTHON_KEY,
+    LATEST_PYTHON_VARIABLE,
+    latest_python_minor,
+    python_matrix,
+    python_minor,
+)
+
+
+class TestPythonMinor:
+    """Test suite for the Python version parsing."""
+
+    @staticmethod
+    @given(st.integers(min_value=0, max_value=99))
+    def test_forms(minor: int) -> None:
+        """Test that both version forms give the minor version."""
+        assert python_minor(f"py3{minor}") == python_minor(f"3.{minor}"), (
+            "Version forms mismatch"
+        )
+
+    @staticmethod
+    def test_invalid() -> None:
+        """Test that a version other than Python 3 is rejected."""
+        with pytest.raises(ValueError, match="Invalid Python 3 version"):
+            python_minor("2.7")
+
+
+class TestLatestPythonMinor:
+    """Test suite for the latest supported Python version."""
+
+    @staticmethod
+    def test_default(monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that the latest version defaults to LATEST_PYTHON."""
+        monkeypatch.delenv(LATEST_PYTHON_VARIABLE, raising=False)
+        assert latest_python_minor() == LATEST_PYTHON, "Default mismatch"
+
+    @staticmethod
+    def test_environment(monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that the environment sets the latest version."""
+        monkeypatch.setenv(LATEST_PYTHON_VARIABLE, "3.14")
+        assert latest_python_minor() == python_minor("3.14"), (
+            "Environment ignored"
+        )
+        assert latest_python_minor("py315") == python_minor("3.15"), (
+            "Explicit version ignored"
+        )
+
+    @staticmethod
+    def test_resolved_on_instantiation(
+        monkeypatch: pytest.MonkeyPatch,
+        environment: Environment,
+    ) -> None:
+        """Test that a context updater keeps the version it started with."""
+        monkeypatch.delenv(LATEST_PYTHON_VARIABLE, raising=False)
+        updater = ContextUpdater(environment)
+        monkeypatch.setenv(LATEST_PYTHON_VARIABLE, "3.14")
+        assert updater.hook(dict(CONTEXT))["latest_python"] == (
+            LATEST_PYTHON
+        ), "Environment read while rendering"
+        assert ContextUpdater(environment).hook(dict(CONTEXT))[
+            "latest_python"
+        ] == python_minor("3.14"), "Environment ignored"
+
+    @staticmethod
+    def test_not_stale(monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that derived contexts are not reused across versions."""
+        monkeypatch.delenv(LATEST_PYTHON_VARIABLE, raising=False)
+        (updated_context,) = update_contexts([dict(CONTEXT)])
+        assert updated_context["latest_python"] == LATEST_PYTHON, (
+            "Default mismatch"
+        )
+        monkeypatch.setenv(LATEST_PYTHON_VARIABLE, "3.14")
+        (updated_context,) = update_contexts([dict(CONTEXT)])
+        assert updated_context["tox_python_list"].endswith(",314}"), (
+            "Stale derived context"
+        )
+
+
+class TestPythonMatrix:
+    """Test suite for the python_matrix function."""
+
+    @staticmethod
+    def test_forms() -> None:
+        """Test every derived form of the version range."""
+        matrix = python_matrix(python_minor("3.11"), python_minor("3.12"))
+        assert matrix.versions == ("3.11", "3.12"), "Versions mismatch"
+        assert matrix.tox_envlist == "py{311,312}", "tox envlist mismatch"
+        assert matrix.classifiers == (
+            "Programming Language :: Python :: 3.11",
+            "Programming Language :: Python :: 3.12",
+        ), "Classifiers mismatch"
+        assert json.loads(matrix.ci_matrix) == {
+            "python-version": ["3.11", "3.12"]
+        }, "CI matrix mismatch"
+        assert json.loads(matrix.nox_python_list) == ["3.11", "3.12"], (
+            "nox list mismatch"
+        )
+
+    @staticmethod
+    def test_is_cached() -> None:
+        """Test that matrices are memoized per version range."""
+        matrix = python_matrix(python_minor("3.9"), LATEST_PYTHON)
+        assert python_matrix(python_minor("3.9"), LATEST_PYTHON) is matrix, (
+            "Matrix not memoized"
+        )
+
+    @staticmethod
+    def test_context_value() -> None:
+        """Test that the context sets the latest version."""
+        updated_context = update_context({
+            "project_name": "Test Project",
+            "target_python_version": "py312",
+            "code_license_id": "MIT",
+            "resources_license_id": "MIT",
+            LATEST_PYTHON_KEY: "py314",
+        })
+        assert updated_context["latest_python"] == python_minor("3.14"), (
+            "Latest version ignored"
+        )
+        assert updated_context["tox_python_list"] == "py{312,313,314}", (
+            "tox list mismatch"
+        )
+        assert updated_context["python_classifiers"][-1] == (
+            "Programming Language :: Python :: 3.14"
+        ), "Classifiers mismatch"
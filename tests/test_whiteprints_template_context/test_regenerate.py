@@ -0,0 +1,170 @@
+# SPDX-FileCopyrightText: © 2024 The "Whiteprints template context" contributors <whiteprints@pm.me>
+#
+# SPDX-License-Identifier: MIT
+
+"""Test the regeneration of the derived values of answers files."""
+
+import json
+from pathlib import Path
+from typing import Final
+
+import pytest
+
+from whiteprints_template_context import cli
+from whiteprints_template_context.regenerate import (
+    Regeneration,
+    find_answers_files,
+    regenerate,
+    regenerate_file,
+)
+
+
+ANSWERS: Final = """\
+# Changes here will be overwritten by Copier; NEVER EDIT MANUALLY
+_commit: 1.0.0
+project_name: Test Project
+project_slug: stale-slug
+target_python_version: py311
+code_license_id: MIT OR Apache-2.0
+code_license_symbols:
+- MIT
+resources_license_id: CC-BY-4.0
+"""
+"""Answers storing stale derived values."""
+
+REGENERATED: Final = """\
+# Changes here will be overwritten by Copier; NEVER EDIT MANUALLY
+_commit: 1.0.0
+project_name: Test Project
+project_slug: test-project
+target_python_version: py311
+code_license_id: MIT OR Apache-2.0
+code_license_symbols:
+- Apache-2.0
+- MIT
+resources_license_id: CC-BY-4.0
+"""
+"""The answers, with their derived values regenerated."""
+
+
+@pytest.fixture(name="answers_file")
+def fixture_answers_file(tmp_path: Path) -> Path:
+    """Fixture writing an answers file with stale derived values.
+
+    Returns:
+        The answers file.
+    """
+    path = tmp_path / "project" / ".copier-answers.yml"
+    path.parent.mkdir()
+    path.write_text(ANSWERS, encoding="utf-8")
+    return path
+
+
+class TestRegenerateFile:
+    """Test suite for the regenerate_file function."""
+
+    @staticmethod
+    def test_rewrites_changed_values(answers_file: Path) -> None:
+        """Test that only the changed values are rewritten."""
+        assert regenerate_file(answers_file) == Regeneration(
+            str(answers_file), ("project_slug", "code_license_symbols")
+        ), "Changed keys mismatch"
+        assert answers_file.read_text(encoding="utf-8") == REGENERATED, (
+            "Answers file mismatch"
+        )
+        assert regenerate_file(answers_file).changed == (), "Not idempotent"
+
+    @staticmethod
+    def test_dry_run(answers_file: Path) -> None:
+        """Test that a dry run leaves the file untouched."""
+        assert regenerate_file(answers_file, dry_run=True).changed, (
+            "Changes not reported"
+        )
+        assert answers_file.read_text(encoding="utf-8") == ANSWERS, (
+            "File written"
+        )
+
+    @staticmethod
+    def test_add_missing(answers_file: Path) -> None:
+        """Test that missing derived values can be added."""
+        regenerate_file(answers_file, add_missing=True)
+        assert "package_name: test_project\n" in answers_file.read_text(
+            encoding="utf-8"
+        ), "Missing value not added"
+
+    @staticmethod
+    def test_error(tmp_path: Path) -> None:
+        """Test that an invalid file is reported, not raised."""
+        path = tmp_path / ".copier-answers.yml"
+        path.write_text("- not a mapping\n", encoding="utf-8")
+        assert regenerate_file(path).error == (
+            "TypeError: The answers are not a mapping."
+        ), "Error mismatch"
+
+
+class TestRegenerate:
+    """Test suite for the regenerate function."""
+
+    @staticmethod
+    def test_process_pool(tmp_path: Path) -> None:
+        """Test that a pool regenerates as the current process does."""
+        for index in range(3):
+            path = tmp_path / f"project-{index}" / ".copier-answers.yml"
+            path.parent.mkdir()
+            path.write_text(ANSWERS, encoding="utf-8")
+
+        paths = sorted(find_answers_files([tmp_path]))
+        serial = list(regenerate(paths, dry_run=True))
+        assert list(regenerate(paths, jobs=2, chunksize=1)) == serial, (
+            "Pool results mismatch"
+        )
+        assert len(serial) == len(paths), "Files missed"
+
+    @staticmethod
+    def test_writes(answers_file: Path) -> None:
+        """Test that the current process writes the changed values."""
+        assert [
+            regeneration.changed for regeneration in regenerate([answers_file])
+        ] == [("project_slug", "code_license_symbols")], "Changes mismatch"
+        assert answers_file.read_text(encoding="utf-8") == REGENERATED, (
+            "Answers file mismatch"
+        )
+
+
+class TestRegenerateCommand:
+    """Test suite for the regenerate command."""
+
+    @staticmethod
+    def test_lines(
+        answers_file: Path,
+        tmp_path: Path,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        """Test that the command writes one JSON line per file."""
+        missing = tmp_path / "missing.yml"
+        status = cli.main(["regenerate", str(answers_file), str(missing)])
+        regenerated, failed = map(
+            json.loads, capsys.readouterr().out.splitlines()
+        )
+        assert status == cli.EXIT_ERROR, "Status mismatch"
+        assert regenerated["changed"] == [
+            "project_slug",
+            "code_license_symbols",
+        ], "Changed keys mismatch"
+        assert failed["error"].startswith("FileNotFoundError"), (
+            "Error mismatch"
+        )
+
+    @staticmethod
+    def test_dry_run(
+        answers_file: Path,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        """Test that a dry run succeeds without writing the file."""
+        status = cli.main(["regenerate", "--dry-run", str(answers_file)])
+        (regenerated,) = map(json.loads, capsys.readouterr().out.splitlines())
+        assert status == cli.EXIT_SUCCESS, "Status mismatch"
+        assert regenerated["changed"], "Changes not reported"
+        assert answers_file.read_text(encoding="utf-8") == ANSWERS, (
+            "File written"
+        )